@@ -0,0 +1,159 @@
+import glob
+import pickle
+import re
+import warnings
+from pathlib import Path
+from typing import Dict, List, Sequence, Set, Tuple
+
+import pyarrow as pa
+from polars import DataFrame, LazyFrame, Schema
+
+from polars_pipeline.exception import CheckpointWarning
+from polars_pipeline.memory import map_ipc
+from polars_pipeline.transformer import Transformer
+from polars_pipeline.typing import FrameType, Source
+from polars_pipeline.utils import fingerprint
+from polars_pipeline.writer import atomic_path, atomic_write
+
+CHECKPOINT_DIR = "checkpoints"
+FRAME_FILE = "frame.arrow"
+STATE_FILE = "state.pkl"
+# A line of an unoptimized query plan that reads files or another external source
+SCAN_PATTERN = re.compile(r"^\s*[\w ]+ SCAN \[", re.MULTILINE)
+
+
+class Checkpoint(Transformer):
+    # Marks a point of a Pipeline where fit_transform saves the intermediate frame
+    # and the fitted stages before it. A later fit_transform of the same stages on
+    # the same input resumes from there. Without a directory, the checkpoints are
+    # kept under the log_dir of the outermost Pipeline.
+    def __init__(self, directory: Path | str | None = None):
+        self.directory = directory
+
+    def transform(self, X: FrameType) -> FrameType:
+        return X
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return schema
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+
+def source_files(source: Source) -> List[Path]:
+    path = Path(source)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file())
+    return sorted(Path(p) for p in glob.glob(str(source), recursive=True))
+
+
+def input_fingerprint(X: FrameType | Source, y: FrameType | Source | None) -> str:
+    # A path is identified by the name, size and modification time of every file
+    # it reads. A LazyFrame is identified by its query plan, which embeds in-memory
+    # data but not the contents of scanned files, so a scan cannot be identified.
+    def frame_fingerprint(frame: FrameType | Source) -> str:
+        if isinstance(frame, DataFrame):
+            return fingerprint(frame)
+        if isinstance(frame, LazyFrame):
+            if SCAN_PATTERN.search(frame.explain(optimized=False)):
+                raise TypeError(
+                    "Cannot fingerprint a LazyFrame that scans files; "
+                    "pass the path of the files instead"
+                )
+            return fingerprint(frame.serialize())
+
+        files = []
+        for path in source_files(frame):
+            stat = path.stat()
+            files.append((str(path.resolve()), stat.st_size, stat.st_mtime_ns))
+        return fingerprint(files)
+
+    return fingerprint(frame_fingerprint(X), y is not None and frame_fingerprint(y))
+
+
+def checkpoint_paths(
+    transformers: Sequence[Transformer],
+    X: FrameType | Source,
+    y: FrameType | Source | None,
+    default_dir: Path | None,
+) -> Dict[int, Path]:
+    # A checkpoint is keyed by the input and the stages before it as defined before
+    # the fit, so any pipeline that starts with the same stages finds it again. An
+    # input or stage that cannot be fingerprinted disables the checkpoints rather
+    # than risk resuming from another run.
+    directories = {
+        i: transformer.directory or default_dir
+        for i, transformer in enumerate(transformers)
+        if isinstance(transformer, Checkpoint)
+    }
+    directories = {i: d for i, d in directories.items() if d is not None}
+    if not directories:
+        return {}
+
+    try:
+        keys = [input_fingerprint(X, y)]
+        for transformer in transformers[: max(directories) + 1]:
+            keys.append(fingerprint(keys[-1], transformer))
+    except TypeError as e:
+        warnings.warn(f"Checkpoints are skipped: {e}", CheckpointWarning, stacklevel=4)
+        return {}
+
+    return {i: Path(directory) / keys[i + 1] for i, directory in directories.items()}
+
+
+def save_checkpoint(
+    path: Path, X: FrameType, transformers: List[Transformer]
+) -> DataFrame:
+    # The frame is written uncompressed so it can be memory-mapped, and the state
+    # is written last: a checkpoint is valid once its state file exists. The mapped
+    # frame replaces X, so the rest of the run reads it from the page cache rather
+    # than keeping a copy on the heap.
+    if isinstance(X, LazyFrame):
+        X = X.collect()
+
+    with atomic_path(path / FRAME_FILE) as tmp_path:
+        X.write_ipc(tmp_path, compression="uncompressed")
+    atomic_write(path / STATE_FILE, pickle.dumps(transformers))
+    return load_frame(path)
+
+
+def load_frame(path: Path) -> DataFrame:
+    return map_ipc(path / FRAME_FILE)
+
+
+def load_checkpoint(path: Path) -> Tuple[DataFrame, List[Transformer]] | None:
+    if not (path / STATE_FILE).exists():
+        return None
+
+    try:
+        with open(path / STATE_FILE, "rb") as f:
+            transformers = pickle.load(f)
+        return load_frame(path), transformers
+    except (
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        OSError,
+        pa.ArrowInvalid,
+    ):
+        # A damaged checkpoint, or one of stages that no longer exist, is
+        # recomputed rather than failing the run
+        return None
+
+
+def resume(
+    transformers: Sequence[Transformer], paths: Dict[int, Path]
+) -> Tuple[int, DataFrame | None]:
+    # Restores the fitted stages of the latest valid checkpoint in place and returns
+    # the index of the first stage left to run along with the saved frame
+    for i in sorted(paths, reverse=True):
+        if (loaded := load_checkpoint(paths[i])) is None:
+            continue
+        X, states = loaded
+        if len(states) != i + 1:
+            continue
+        for transformer, state in zip(transformers, states):
+            transformer.__dict__.update(state.__dict__)
+        return i + 1, X
+    return 0, None
@@ -0,0 +1,78 @@
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+import numpy as np
+import polars as pl
+from polars import DataFrame
+
+Batch = Dict[str, np.ndarray]
+CompiledFn = Callable[[Batch], Batch]
+Records = Mapping[str, Any] | Sequence[Mapping[str, Any]]
+
+
+def column_array(values: Any) -> np.ndarray:
+    array = np.atleast_1d(np.asarray(values))
+    if array.dtype == object and all(
+        v is None or (isinstance(v, (int, float)) and not isinstance(v, bool))
+        for v in array
+    ):
+        # Missing numbers become NaN so the column stays numeric
+        array = np.array([np.nan if v is None else v for v in array], dtype=np.float64)
+    return array
+
+
+def to_batch(records: Records) -> Batch:
+    if isinstance(records, Mapping):
+        return {name: column_array(values) for name, values in records.items()}
+
+    names = list(records[0]) if records else []
+    return {
+        name: column_array([record.get(name) for record in records]) for name in names
+    }
+
+
+def to_series(name: str, values: np.ndarray) -> pl.Series:
+    if values.dtype == object:
+        return pl.Series(name, values.tolist(), strict=False)
+    return pl.Series(name, values, nan_to_null=True)
+
+
+def to_array(series: pl.Series) -> np.ndarray:
+    # Integers with nulls become floats with NaN, which numpy stages can compute on
+    return series.to_numpy()
+
+
+def batch_to_frame(batch: Batch) -> DataFrame:
+    return DataFrame([to_series(name, values) for name, values in batch.items()])
+
+
+def frame_to_batch(frame: DataFrame) -> Batch:
+    return {series.name: to_array(series) for series in frame.iter_columns()}
+
+
+class CompiledPipeline:
+    def __init__(self, fns: List[CompiledFn]):
+        self.fns = fns
+
+    def __call__(self, records: Records) -> Batch:
+        batch = to_batch(records)
+        for fn in self.fns:
+            batch = fn(batch)
+        return batch
+
+    def benchmark(self, records: Records, *, n: int = 1000) -> Dict[str, float]:
+        self(records)
+
+        latencies = []
+        for _ in range(n):
+            start = time.perf_counter()
+            self(records)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        return {
+            "p50_ms": percentiles[49],
+            "p99_ms": percentiles[98],
+            "max_ms": max(latencies),
+        }
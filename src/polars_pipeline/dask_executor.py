@@ -0,0 +1,182 @@
+import glob
+import math
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, List, Sequence
+
+import dask
+import polars as pl
+from dask.delayed import Delayed, delayed
+from polars import DataFrame, LazyFrame
+
+from polars_pipeline.pipeline import Pipeline
+from polars_pipeline.transformer import Transformer
+from polars_pipeline.typing import FrameType, Source
+from polars_pipeline.utils import scan_source
+
+Partitions = List[Delayed]
+
+
+def collect_slice(X: LazyFrame, offset: int, length: int) -> DataFrame:
+    return X.slice(offset, length).collect()
+
+
+def read_file(path: str) -> DataFrame:
+    return scan_source(path).collect()
+
+
+def concat_partitions(frames: Sequence[DataFrame]) -> DataFrame:
+    return pl.concat(frames, how="vertical")
+
+
+def transform_partition(transformer: Transformer, X: DataFrame) -> DataFrame:
+    out = transformer.transform(X)
+    return out.collect() if isinstance(out, LazyFrame) else out
+
+
+def partial_state(template: Transformer, X: DataFrame) -> Transformer:
+    state = deepcopy(template)
+    state.partial_fit(X)  # type: ignore
+    return state
+
+
+def merge_states(a: Transformer, b: Transformer) -> Transformer:
+    return a.merge(b)  # type: ignore
+
+
+def tree_reduce(states: Partitions) -> Delayed:
+    while len(states) > 1:
+        states = [
+            delayed(merge_states)(*states[i : i + 2])
+            if i + 1 < len(states)
+            else states[i]
+            for i in range(0, len(states), 2)
+        ]
+    return states[0]
+
+
+def is_stateless(transformer: Transformer) -> bool:
+    cls = type(transformer)
+    return cls.fit is Transformer.fit and cls.fit_transform is Transformer.fit_transform
+
+
+def is_mergeable(transformer: Transformer) -> bool:
+    # Stages whose fitted state is the merge of per-partition partial states. Exact
+    # quantiles of a RobustScaler cannot be merged.
+    return all(
+        hasattr(transformer, m) for m in ("reset", "partial_fit", "merge")
+    ) and getattr(transformer, "approx", True)
+
+
+class DaskExecutor:
+    # Fits and runs a Pipeline on partitions of the input with Dask. Stateless stages
+    # map over the partitions, the scalers and LabelEncoder are fitted as tree
+    # reductions of per-partition partial states, and other stages, such as models,
+    # are fitted on the concatenated partitions. Transforms run the whole fitted
+    # pipeline on each partition in parallel. Pipeline logging is not applied.
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        *,
+        scheduler: Any = "threads",
+        partition_size: int = 100_000,
+    ):
+        if partition_size < 1:
+            raise ValueError(f"partition_size must be positive: {partition_size}")
+
+        self.pipeline = pipeline
+        self.scheduler = scheduler
+        self.partition_size = partition_size
+
+    def partitions(self, X: FrameType | Source) -> Partitions:
+        # Files matched by a glob pattern are partitions as they are
+        if isinstance(X, (str, Path)) and not Path(X).exists():
+            if not (files := sorted(glob.glob(str(X)))):
+                raise FileNotFoundError(X)
+            return [delayed(read_file)(file) for file in files]
+
+        X = scan_source(X)
+        if isinstance(X, DataFrame):
+            return self.split(X)
+
+        # Each partition reads its own rows, so a scan is never collected here
+        height = X.select(pl.len()).collect().item()
+        X_delayed = delayed(X)
+        return [
+            delayed(collect_slice)(X_delayed, offset, self.partition_size)
+            for offset in range(0, max(height, 1), self.partition_size)
+        ]
+
+    def split(self, X: DataFrame) -> Partitions:
+        n_partitions = max(math.ceil(X.height / self.partition_size), 1)
+        return [
+            delayed(X.slice(i * self.partition_size, self.partition_size))
+            for i in range(n_partitions)
+        ]
+
+    def fit_partitions(
+        self,
+        transformers: List[Transformer],
+        partitions: Partitions,
+        y: DataFrame | None,
+    ) -> Partitions:
+        for transformer in transformers:
+            if isinstance(transformer, Pipeline):
+                partitions = self.fit_partitions(
+                    transformer.transformers, partitions, y
+                )
+                continue
+
+            if is_mergeable(transformer):
+                # Partitions are read by both the fit and the transform of the stage,
+                # so they are kept by the scheduler instead of computed twice
+                partitions = list(dask.persist(*partitions, scheduler=self.scheduler))
+                template = deepcopy(transformer)
+                template.reset()  # type: ignore
+                states = [delayed(partial_state)(template, part) for part in partitions]
+                (state,) = dask.compute(tree_reduce(states), scheduler=self.scheduler)
+                transformer.reset()  # type: ignore
+                transformer.merge(state)  # type: ignore
+                if check_fitted := getattr(transformer, "check_fitted", None):
+                    check_fitted()
+            elif not is_stateless(transformer):
+                X = dask.compute(
+                    delayed(concat_partitions)(partitions), scheduler=self.scheduler
+                )[0]
+                X_out = transformer.fit_transform(X, y)
+                if isinstance(X_out, LazyFrame):
+                    X_out = X_out.collect()
+                partitions = self.split(X_out)
+                continue
+
+            transformer_delayed = delayed(transformer)
+            partitions = [
+                delayed(transform_partition)(transformer_delayed, part)
+                for part in partitions
+            ]
+
+        return partitions
+
+    def compute(self, partitions: Partitions) -> DataFrame:
+        (frames,) = dask.compute(partitions, scheduler=self.scheduler)
+        return concat_partitions(frames)
+
+    def fit(self, X: FrameType | Source, y: DataFrame | None = None):
+        self.fit_transform(X, y)
+
+    def fit_transform(
+        self, X: FrameType | Source, y: DataFrame | None = None
+    ) -> DataFrame:
+        partitions = self.fit_partitions(
+            self.pipeline.transformers, self.partitions(X), y
+        )
+        return self.compute(partitions)
+
+    def transform(self, X: FrameType | Source) -> DataFrame:
+        pipeline = delayed(self.pipeline)
+        return self.compute(
+            [
+                delayed(transform_partition)(pipeline, part)
+                for part in self.partitions(X)
+            ]
+        )
@@ -0,0 +1,153 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+import polars as pl
+from polars import DataFrame, Schema
+from polars._typing import PolarsDataType
+
+from polars_pipeline.typing import FrameType
+
+_model_float_dtype: ContextVar[PolarsDataType | None] = ContextVar(
+    "model_float_dtype", default=None
+)
+
+
+@contextmanager
+def model_dtype_scope(policy: "DtypePolicy | None") -> Iterator[None]:
+    # Models run within it build their input matrix in the float_dtype of the policy
+    if policy is None:
+        yield
+        return
+
+    token = _model_float_dtype.set(policy.float_dtype)
+    try:
+        yield
+    finally:
+        _model_float_dtype.reset(token)
+
+
+def model_float_dtype() -> PolarsDataType | None:
+    return _model_float_dtype.get()
+
+
+class DtypePolicy:
+    # Keeps numeric columns compact at every stage boundary of a Pipeline: floats
+    # are cast to float_dtype, and the integer columns named in int_bounds are cast
+    # to the smallest type that holds their declared (min, max). Integer types come
+    # from the declared domain, not from the values seen when fitting, so every
+    # frame gets the same schema and only a value outside the bounds fails the
+    # cast. Memory and precision effects are summed per stage.
+    def __init__(
+        self,
+        *,
+        float_dtype: PolarsDataType = pl.Float32,
+        int_bounds: Mapping[str, Tuple[int, int]] | None = None,
+        exclude: Iterable[str] = (),
+        measure_error: bool = True,
+    ):
+        if not float_dtype.is_float():
+            raise ValueError(f"float_dtype must be a float dtype: {float_dtype}")
+        for col, (low, high) in (int_bounds or {}).items():
+            if low > high:
+                raise ValueError(f"Invalid bounds for {col}: ({low}, {high})")
+
+        self.float_dtype = float_dtype
+        self.exclude = set(exclude)
+        self.measure_error = measure_error
+        self.int_dtypes: Dict[str, PolarsDataType] = {
+            col: pl.Series([low, high]).shrink_dtype().dtype
+            for col, (low, high) in (int_bounds or {}).items()
+            if col not in self.exclude
+        }
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def float_columns(self, schema: Schema) -> List[str]:
+        return [
+            col
+            for col, dtype in schema.items()
+            if dtype.is_float()
+            and dtype != self.float_dtype
+            and col not in self.exclude
+        ]
+
+    def int_casts(self, schema: Schema) -> Dict[str, PolarsDataType]:
+        return {
+            col: dtype
+            for col, dtype in self.int_dtypes.items()
+            if col in schema and schema[col].is_integer() and schema[col] != dtype
+        }
+
+    def output_schema(self, schema: Schema) -> Schema:
+        floats = set(self.float_columns(schema))
+        ints = self.int_casts(schema)
+        return Schema(
+            {
+                col: self.float_dtype if col in floats else ints.get(col, dtype)
+                for col, dtype in schema.items()
+            }
+        )
+
+    def apply(self, X: FrameType, stage: str = "input") -> FrameType:
+        schema = X.collect_schema()
+        floats = self.float_columns(schema)
+        ints = self.int_casts(schema)
+        casts = [
+            pl.col(floats).cast(self.float_dtype),
+            *(pl.col(col).cast(dtype) for col, dtype in ints.items()),
+        ]
+        if not isinstance(X, DataFrame):
+            return X.with_columns(casts) if floats or ints else X
+
+        out = X.with_columns(casts)
+
+        max_abs_error = 0.0
+        if self.measure_error and floats:
+            errors = X.select(
+                (pl.col(col) - out.get_column(col).cast(X.schema[col])).abs().max()
+                for col in floats
+            ).row(0)
+            max_abs_error = max((e for e in errors if e is not None), default=0.0)
+
+        bytes_before, bytes_after = X.estimated_size(), out.estimated_size()
+        with self.lock:
+            stats = self.stats.setdefault(
+                stage,
+                {"calls": 0, "bytes_before": 0, "bytes_after": 0, "max_abs_error": 0.0},
+            )
+            stats["calls"] += 1
+            stats["bytes_before"] += bytes_before
+            stats["bytes_after"] += bytes_after
+            stats["max_abs_error"] = max(stats["max_abs_error"], max_abs_error)
+        return out
+
+    def report(self) -> Dict[str, Any]:
+        with self.lock:
+            stages = {stage: dict(stats) for stage, stats in self.stats.items()}
+
+        bytes_before = sum(s["bytes_before"] for s in stages.values())
+        bytes_after = sum(s["bytes_after"] for s in stages.values())
+        return {
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_saved": bytes_before - bytes_after,
+            "max_abs_error": max(
+                (s["max_abs_error"] for s in stages.values()), default=0.0
+            ),
+            "stages": stages,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, List
 
 
 class NotFittedError(Exception):
@@ -29,3 +29,59 @@ class TargetRequiredError(Exception):
     def __init__(self, name: str):
         self.name = name
         super().__init__(f"{name} requires target to be set")
+
+
+class InvalidDtypeError(Exception):
+    def __init__(self, name: str, column: str, dtype: Any, expected: str):
+        self.name = name
+        self.column = column
+        self.dtype = dtype
+        self.expected = expected
+        super().__init__(
+            f"{name} expects {expected} for column {column!r}, got {dtype}"
+        )
+
+
+class SchemaNotResolvableError(Exception):
+    def __init__(self, name: str, reason: str):
+        self.name = name
+        self.reason = reason
+        super().__init__(f"Output schema of {name} cannot be resolved: {reason}")
+
+
+class SchemaValidationError(Exception):
+    def __init__(self, index: int, name: str, error: Exception):
+        self.index = index
+        self.name = name
+        self.error = error
+        super().__init__(
+            f"Schema validation failed at stage {index} ({name}): "
+            f"{type(error).__name__}: {error}"
+        )
+
+
+class TrialPrunedError(Exception):
+    def __init__(self, index: int, step: int):
+        self.index = index
+        self.step = step
+        super().__init__(f"Trial {index} pruned at step {step}")
+
+
+class MemoryBudgetExceededError(Exception):
+    def __init__(self, index: int, name: str, required: int, budget: int):
+        self.index = index
+        self.name = name
+        self.required = required
+        self.budget = budget
+        super().__init__(
+            f"Stage {index} ({name}) is estimated to need {required} bytes, "
+            f"over the memory budget of {budget} bytes"
+        )
+
+
+class MemoryBudgetWarning(UserWarning):
+    pass
+
+
+class CheckpointWarning(UserWarning):
+    pass
@@ -1,3 +1,4 @@
+from .branch import Branch
 from .transformer import (
     AllHorizontal,
     AnyHorizontal,
@@ -8,6 +9,7 @@ from .transformer import (
     Drop,
     DropNulls,
     Dummy,
+    Filter,
     MaxHorizontal,
     MeanHorizontal,
     MinHorizontal,
@@ -23,11 +25,13 @@ __all__ = [
     "AnyHorizontal",
     "ArgmaxHorizontal",
     "ArgminHorizontal",
+    "Branch",
     "Cast",
     "Display",
     "Drop",
     "DropNulls",
     "Dummy",
+    "Filter",
     "MaxHorizontal",
     "MeanHorizontal",
     "MinHorizontal",
@@ -0,0 +1,114 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Literal, Sequence
+
+import polars as pl
+from polars import LazyFrame, Schema
+
+from polars_pipeline.compiled import Batch, CompiledFn
+from polars_pipeline.transformer import Transformer, log_scope
+from polars_pipeline.typing import FrameType
+
+
+class Branch(Transformer):
+    def __init__(
+        self,
+        *transformers: Transformer,
+        how: Literal["horizontal", "join"] = "horizontal",
+        on: str | Sequence[str] | None = None,
+        n_jobs: int | None = None,
+    ):
+        if how == "join" and on is None:
+            raise ValueError("on must be set when how='join'")
+
+        self.transformers = list(transformers)
+        self.how = how
+        self.on = on
+        self.n_jobs = n_jobs
+
+    def branch_log_dirs(self) -> List[Path | None]:
+        if not (log_dir := self.log_dir):
+            return [None] * len(self.transformers)
+
+        zero_pad = len(str(len(self.transformers)))
+        return [
+            log_dir / f"{i:0>{zero_pad}}_{transformer.__class__.__name__}"
+            for i, transformer in enumerate(self.transformers)
+        ]
+
+    def run(self, fn: Callable[[Transformer], FrameType]) -> List[FrameType]:
+        def run_branch(transformer: Transformer, log_dir: Path | None) -> FrameType:
+            with log_scope(log_dir):
+                return fn(transformer)
+
+        # Worker threads start from a copy of the caller's context
+        contexts = [contextvars.copy_context() for _ in self.transformers]
+        with ThreadPoolExecutor(self.n_jobs) as executor:
+            return list(
+                executor.map(
+                    lambda context, transformer, log_dir: context.run(
+                        run_branch, transformer, log_dir
+                    ),
+                    contexts,
+                    self.transformers,
+                    self.branch_log_dirs(),
+                )
+            )
+
+    def combine(self, frames: List[FrameType]) -> FrameType:
+        # A branch that collected a lazy input makes the combined output eager
+        if not all(isinstance(frame, LazyFrame) for frame in frames):
+            frames = [
+                frame.collect() if isinstance(frame, LazyFrame) else frame
+                for frame in frames
+            ]
+
+        if self.how == "horizontal":
+            return pl.concat(frames, how="horizontal")
+
+        combined = frames[0]
+        for frame in frames[1:]:
+            combined = combined.join(frame, on=self.on, how="left", coalesce=True)
+        return combined
+
+    def fit(self, X: FrameType, y: FrameType | None = None):
+        if isinstance(X, LazyFrame):
+            X = X.cache()
+        self.run(lambda transformer: transformer.fit(X, y))
+
+    def transform(self, X: FrameType) -> FrameType:
+        # The shared input plan is computed once for all branches
+        if isinstance(X, LazyFrame):
+            X = X.cache()
+        return self.combine(self.run(lambda transformer: transformer.transform(X)))
+
+    def fit_transform(self, X: FrameType, y: FrameType | None = None) -> FrameType:
+        if isinstance(X, LazyFrame):
+            X = X.cache()
+        return self.combine(
+            self.run(lambda transformer: transformer.fit_transform(X, y))
+        )
+
+    def compile(self) -> CompiledFn:
+        if self.how != "horizontal":
+            return super().compile()
+
+        fns = [transformer.compile() for transformer in self.transformers]
+
+        def fn(batch: Batch) -> Batch:
+            combined: Batch = {}
+            for output in (f(batch) for f in fns):
+                if duplicated := combined.keys() & output.keys():
+                    raise pl.exceptions.DuplicateError(", ".join(sorted(duplicated)))
+                combined.update(output)
+            return combined
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        schemas = [
+            transformer.output_schema(schema, y_schema)
+            for transformer in self.transformers
+        ]
+        return self.combine([LazyFrame(schema=s) for s in schemas]).collect_schema()
@@ -1,15 +1,44 @@
-from typing import Collection, Iterable, Literal, Mapping, Sequence
+from copy import copy
+from typing import Callable, Collection, Iterable, Literal, Mapping, Sequence, Set
 
-from polars import LazyFrame
+import numpy as np
+import polars as pl
+from polars import DataFrame, LazyFrame, Schema
 from polars._typing import ColumnNameOrSelector, IntoExpr, PolarsDataType
 
-from polars_pipeline.exception import LazyFrameNotSupportedError, NotFittedError
-from polars_pipeline.transformer import Transformer
+from polars_pipeline.compiled import Batch, CompiledFn
+from polars_pipeline.exception import (
+    LazyFrameNotSupportedError,
+    NotFittedError,
+    SchemaNotResolvableError,
+)
+from polars_pipeline.transformer import Transformer, lazy_output_schema
 from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import expr_columns, iter_exprs, select_columns
 
 from .horizontal import Horizontal
 
 
+def compile_horizontal(
+    columns: Iterable[str],
+    name: str,
+    agg_fn: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    *,
+    divisor: int | None = None,
+) -> CompiledFn:
+    columns = list(columns)
+
+    def fn(batch: Batch) -> Batch:
+        result = batch[columns[0]]
+        for col in columns[1:]:
+            result = agg_fn(result, batch[col])
+        if divisor is not None:
+            result = result / divisor
+        return {**batch, name: result}
+
+    return fn
+
+
 class Select(Transformer):
     def __init__(self, *exprs: IntoExpr | Iterable[IntoExpr], **named_exprs: IntoExpr):
         self.exprs = exprs
@@ -18,6 +47,40 @@ class Select(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return X.select(*self.exprs, **self.named_exprs)
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        required: Set[str] = set()
+        for expr in iter_exprs(self.exprs, self.named_exprs):
+            outputs, inputs = expr_columns(schema, expr)
+            if columns.isdisjoint(outputs):
+                continue
+            if inputs is None:
+                return None
+            required |= inputs
+        return required
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        return Select(
+            [
+                expr
+                for expr in iter_exprs(self.exprs, self.named_exprs)
+                if not columns.isdisjoint(expr_columns(schema, expr)[0])
+            ]
+        )
+
+    def compile(self) -> CompiledFn:
+        if self.named_exprs or not all(isinstance(e, str) for e in self.exprs):
+            return super().compile()
+
+        columns = list(self.exprs)
+
+        def fn(batch: Batch) -> Batch:
+            return {col: batch[col] for col in columns}
+
+        return fn
+
 
 class WithColumns(Transformer):
     def __init__(self, *exprs: IntoExpr | Iterable[IntoExpr], **named_exprs: IntoExpr):
@@ -27,6 +90,33 @@ class WithColumns(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return X.with_columns(*self.exprs, **self.named_exprs)
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        # Expressions read the input frame, so an overwritten column is only needed
+        # when an expression reads it
+        written: Set[str] = set()
+        reads: Set[str] = set()
+        for expr in iter_exprs(self.exprs, self.named_exprs):
+            outputs, inputs = expr_columns(schema, expr)
+            written |= set(outputs)
+            if columns.isdisjoint(outputs):
+                continue
+            if inputs is None:
+                return None
+            reads |= inputs
+        return (set(columns) - written) | reads
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        return WithColumns(
+            [
+                expr
+                for expr in iter_exprs(self.exprs, self.named_exprs)
+                if not columns.isdisjoint(expr_columns(schema, expr)[0])
+            ]
+        )
+
 
 class Drop(Transformer):
     def __init__(
@@ -40,6 +130,31 @@ class Drop(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return X.drop(*self.columns, strict=self.strict)
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        if not self.strict:
+            return set(columns)
+        # A strict drop fails on a missing column, so the dropped ones are read too
+        if not all(isinstance(col, str) for col in self.columns):
+            return None
+        return set(columns) | set(self.columns)  # type: ignore
+
+    def compile(self) -> CompiledFn:
+        if not all(isinstance(col, str) for col in self.columns):
+            return super().compile()
+
+        columns = set(self.columns)
+        strict = self.strict
+
+        def fn(batch: Batch) -> Batch:
+            if strict and (missing := columns - batch.keys()):
+                raise pl.exceptions.ColumnNotFoundError(", ".join(sorted(missing)))
+            return {col: values for col, values in batch.items() if col not in columns}
+
+        return fn
+
 
 class SortColumns(Transformer):
     def __init__(
@@ -59,6 +174,17 @@ class SortColumns(Transformer):
         )
         return X.select([col["name"] for col in sorted_columns])
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        sorted_columns = sorted(
+            [{"name": k, "dtype": str(v)} for k, v in schema.items()],
+            key=lambda x: x[self.by],
+            reverse=self.descending,
+        )
+        return Schema({col["name"]: schema[col["name"]] for col in sorted_columns})
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
 
 class Display(Transformer):
     def transform(self, X: FrameType) -> FrameType:
@@ -70,8 +196,34 @@ class Display(Transformer):
         display(X)
         return X
 
+    def compile(self) -> CompiledFn:
+        return lambda batch: batch
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return schema
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+
+class HorizontalTransformer(Transformer):
+    columns: Iterable[str]
+    name: str
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
 
-class MeanHorizontal(Transformer):
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        if self.name not in columns:
+            return set(columns)
+        return (columns - {self.name}) | set(self.columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        # Nothing downstream reads the aggregate, so it is not computed
+        return self if self.name in columns else WithColumns()
+
+
+class MeanHorizontal(HorizontalTransformer):
     def __init__(self, columns: Sequence[str], *, name: str = "mean") -> None:
         self.columns = columns
         self.name = name
@@ -79,8 +231,13 @@ class MeanHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).mean(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        return compile_horizontal(
+            self.columns, self.name, np.add, divisor=len(self.columns)
+        )
+
 
-class SumHorizontal(Transformer):
+class SumHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "sum") -> None:
         self.columns = columns
         self.name = name
@@ -88,8 +245,11 @@ class SumHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).sum(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        return compile_horizontal(self.columns, self.name, np.add)
+
 
-class ProdHorizontal(Transformer):
+class ProdHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "prod") -> None:
         self.columns = columns
         self.name = name
@@ -97,8 +257,11 @@ class ProdHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).prod(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        return compile_horizontal(self.columns, self.name, np.multiply)
 
-class AllHorizontal(Transformer):
+
+class AllHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "all") -> None:
         self.columns = columns
         self.name = name
@@ -106,8 +269,11 @@ class AllHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).all(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        return compile_horizontal(self.columns, self.name, np.logical_and)
+
 
-class AnyHorizontal(Transformer):
+class AnyHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "any") -> None:
         self.columns = columns
         self.name = name
@@ -115,8 +281,11 @@ class AnyHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).any(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        return compile_horizontal(self.columns, self.name, np.logical_or)
 
-class MaxHorizontal(Transformer):
+
+class MaxHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "max") -> None:
         self.columns = columns
         self.name = name
@@ -124,8 +293,15 @@ class MaxHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).max(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        # Same rule as the transform: a null on the left yields the right value
+        # and a null on the right yields null, with NaN standing for null
+        return compile_horizontal(
+            self.columns, self.name, lambda a, b: np.where(a > b, a, b)
+        )
+
 
-class MinHorizontal(Transformer):
+class MinHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "min") -> None:
         self.columns = columns
         self.name = name
@@ -133,8 +309,13 @@ class MinHorizontal(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return Horizontal(X).min(self.columns, name=self.name)
 
+    def compile(self) -> CompiledFn:
+        return compile_horizontal(
+            self.columns, self.name, lambda a, b: np.where(a < b, a, b)
+        )
 
-class ArgmaxHorizontal(Transformer):
+
+class ArgmaxHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "argmax") -> None:
         self.columns = columns
         self.name = name
@@ -143,7 +324,7 @@ class ArgmaxHorizontal(Transformer):
         return Horizontal(X).argmax(self.columns, name=self.name)
 
 
-class ArgminHorizontal(Transformer):
+class ArgminHorizontal(HorizontalTransformer):
     def __init__(self, columns: Iterable[str], *, name: str = "argmin") -> None:
         self.columns = columns
         self.name = name
@@ -174,6 +355,22 @@ class Dummy(Transformer):
             self.columns, separator=self.separator, drop_first=self.drop_first
         )
 
+    def estimate_memory(self, X: DataFrame) -> int:
+        # Every distinct value of a dummied column becomes a UInt8 column
+        if self.columns is None:
+            columns = X.columns
+        elif isinstance(self.columns, Sequence) and not isinstance(self.columns, str):
+            columns = select_columns(X, *self.columns)
+        else:
+            columns = select_columns(X, self.columns)
+        n_values = sum(X.select(pl.col(columns).n_unique()).row(0)) if columns else 0
+        return X.estimated_size() + X.height * n_values
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        raise SchemaNotResolvableError(
+            self.__class__.__name__, "dummy columns depend on the data"
+        )
+
 
 class DropNulls(Transformer):
     def __init__(
@@ -185,6 +382,40 @@ class DropNulls(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         return X.drop_nulls(subset=self.subset)
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        # Rows are dropped on the subset columns, so they are needed as well
+        subset = [self.subset] if isinstance(self.subset, str) else self.subset
+        if subset is None or not all(isinstance(col, str) for col in subset):
+            return None
+        return set(columns) | set(subset)
+
+
+class Filter(Transformer):
+    def __init__(
+        self, *predicates: IntoExpr | Iterable[IntoExpr], **constraints: object
+    ):
+        self.predicates = predicates
+        self.constraints = constraints
+
+    def transform(self, X: FrameType) -> FrameType:
+        # On a scan, the predicates are pushed down into the reader
+        return X.filter(*self.predicates, **self.constraints)
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        required = set(columns) | set(self.constraints)
+        for expr in iter_exprs(self.predicates, {}):
+            _, inputs = expr_columns(schema, expr)
+            if inputs is None:
+                return None
+            required |= inputs
+        return required
+
 
 class Cast(Transformer):
     def __init__(
@@ -201,3 +432,21 @@ class Cast(Transformer):
 
     def transform(self, X: FrameType) -> FrameType:
         return X.cast(self.dtypes, strict=self.strict)
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        if not isinstance(self.dtypes, Mapping):
+            return self
+
+        pruned = copy(self)
+        pruned.dtypes = {
+            key: dtype
+            for key, dtype in self.dtypes.items()
+            if not isinstance(key, str) or key in columns
+        }
+        return pruned
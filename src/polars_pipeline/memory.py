@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+import uuid
+import warnings
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+import pyarrow as pa
+from polars import DataFrame
+
+from polars_pipeline.exception import MemoryBudgetExceededError, MemoryBudgetWarning
+from polars_pipeline.transformer import Transformer
+from polars_pipeline.typing import FrameType
+
+MemoryAction = Literal["raise", "warn", "spill"]
+
+
+def frame_size(X: FrameType) -> int | None:
+    # A LazyFrame holds no data until it is executed
+    return X.estimated_size() if isinstance(X, DataFrame) else None
+
+
+def current_rss() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def map_ipc(path: Path) -> DataFrame:
+    # An uncompressed IPC file is memory-mapped and imported without a copy, so the
+    # pages of the frame are backed by the file instead of the heap
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return pl.from_arrow(table, rechunk=False)  # type: ignore
+
+
+class MemoryBudget:
+    # Checked before each stage of a Pipeline: when the resident memory plus the
+    # stage's estimate_memory exceeds limit, the stage fails fast, warns, or runs
+    # on its input spilled to a memory-mapped file. Lazy inputs are not checked.
+    def __init__(
+        self,
+        limit: int,
+        *,
+        action: MemoryAction = "raise",
+        spill_dir: Path | str | None = None,
+    ):
+        if action not in ("raise", "warn", "spill"):
+            raise ValueError(f"Unknown action: {action}")
+
+        self.limit = limit
+        self.action = action
+        self.spill_dir = spill_dir
+
+    def check(self, index: int, transformer: Transformer, X: FrameType) -> FrameType:
+        if not isinstance(X, DataFrame):
+            return X
+
+        required = (current_rss() or 0) + transformer.estimate_memory(X)
+        if required <= self.limit:
+            return X
+
+        error = MemoryBudgetExceededError(
+            index, transformer.__class__.__name__, required, self.limit
+        )
+        if self.action == "raise":
+            raise error
+        if self.action == "warn":
+            warnings.warn(str(error), MemoryBudgetWarning, stacklevel=3)
+            return X
+        return self.spill(X)
+
+    def spill(self, X: DataFrame) -> DataFrame:
+        # The caller drops its in-memory frame by replacing it with the result
+        spill_dir = Path(self.spill_dir or tempfile.gettempdir())
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        path = spill_dir / f"spill_{uuid.uuid4()}.arrow"
+        X.write_ipc(path, compression="uncompressed")
+        X = map_ipc(path)
+        try:
+            # The mapping outlives the unlinked file on POSIX systems
+            path.unlink()
+        except OSError:
+            pass
+        return X
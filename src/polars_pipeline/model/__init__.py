@@ -1,6 +1,26 @@
-from .lightgbm_model import LightGBM
-from .null_predictor import NullPredictor
-from .predictor import Predictor
-from .stacker import Stacker
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .lightgbm_model import LightGBM
+    from .null_predictor import NullPredictor
+    from .predictor import Predictor
+    from .stacker import Stacker
+
+# LightGBM and scikit-learn are only imported once a stage that needs them is
+# accessed.
+_modules = {
+    "LightGBM": ".lightgbm_model",
+    "NullPredictor": ".null_predictor",
+    "Predictor": ".predictor",
+    "Stacker": ".stacker",
+}
 
 __all__ = ["LightGBM", "NullPredictor", "Predictor", "Stacker"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(_modules[name], __name__), name)
@@ -1,10 +1,13 @@
-from typing import Any, Callable, Dict, List
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
 
 import lightgbm as lgb
 import numpy as np
 import polars as pl
-from polars import LazyFrame
+from polars import DataFrame, LazyFrame, Schema
 
+from polars_pipeline.compiled import Batch, CompiledFn
+from polars_pipeline.dtype_policy import model_float_dtype
 from polars_pipeline.exception import (
     ColumnsMismatchError,
     LazyFrameNotSupportedError,
@@ -13,6 +16,24 @@ from polars_pipeline.exception import (
 )
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import check_numeric_columns, fingerprint
+from polars_pipeline.writer import atomic_path
+
+# Aliases LightGBM reads to stop training once the validation metric stops improving
+EARLY_STOPPING_PARAMS = (
+    "early_stopping_round",
+    "early_stopping_rounds",
+    "early_stopping",
+    "n_iter_no_change",
+)
+# Dataset construction drops features that cannot satisfy min_data_in_leaf, so a
+# cached Dataset also depends on it
+PRE_FILTER_PARAMS = (
+    "min_data_in_leaf",
+    "min_child_samples",
+    "min_data",
+    "min_data_per_leaf",
+)
 
 
 class LightGBM(Transformer):
@@ -20,23 +41,31 @@ class LightGBM(Transformer):
         self,
         params: Dict[str, Any],
         *,
-        train_fn: Callable[[lgb.Dataset], lgb.Booster] | None = None,
+        train_fn: Callable[..., lgb.Booster] | None = None,
         predict_fn: Callable[[lgb.Booster, np.ndarray], np.ndarray] | None = None,
+        dataset_cache_dir: Path | str | None = None,
     ):
-        def default_train_fn(data: lgb.Dataset) -> lgb.Booster:
-            return lgb.train(self.params, data)  # type: ignore
-
-        def default_predict_fn(booster: lgb.Booster, X: np.ndarray) -> np.ndarray:
-            return booster.predict(X)  # type: ignore
-
         self.params = params
-        self.train_fn = train_fn or default_train_fn
-        self.predict_fn = predict_fn or default_predict_fn
+        self.dataset_cache_dir = dataset_cache_dir
+        # Bound methods rather than closures, so a fitted model can be pickled
+        self.train_fn = train_fn or self.default_train_fn
+        self.predict_fn = predict_fn or self.default_predict_fn
         self.booster: lgb.Booster | None = None
         self.X_columns: List[str] | None = None
         self.y_column: str | None = None
+        self.best_iteration: int | None = None
 
-    def fit(self, X: FrameType, y: FrameType | None = None):
+    def default_train_fn(
+        self, data: lgb.Dataset, valid_sets: List[lgb.Dataset] | None = None
+    ) -> lgb.Booster:
+        return lgb.train(self.params, data, valid_sets=valid_sets)
+
+    def default_predict_fn(self, booster: lgb.Booster, X: np.ndarray) -> np.ndarray:
+        return booster.predict(X)  # type: ignore
+
+    def build_dataset(self, X: FrameType, y: FrameType | None) -> lgb.Dataset:
+        # Bins the features once; fit_dataset trains on row subsets of the result,
+        # which share its bin boundaries
         if isinstance(X, LazyFrame) or isinstance(y, LazyFrame):
             raise LazyFrameNotSupportedError(self.__class__.__name__, self.fit.__name__)
 
@@ -46,16 +75,57 @@ class LightGBM(Transformer):
         if len(y.columns) > 1:
             raise ValueError("y should have only one column")
 
-        self.X_columns = X.columns
-        self.y_column = y.columns[0]
+        data = lgb.Dataset(
+            self.to_numpy(X),
+            label=y.to_numpy().squeeze(axis=1),
+            feature_name=X.columns,
+            params=self.params,
+        )
+        if self.dataset_cache_dir is None:
+            return data.construct()
+
+        path = Path(self.dataset_cache_dir) / f"{self.dataset_key(X, y, data)}.bin"
+        if not path.exists():
+            data.construct()
+            with atomic_path(path) as tmp_path:
+                data.save_binary(tmp_path)
+            return data
+        return lgb.Dataset(path, params=self.params).construct()
+
+    def dataset_key(self, X: DataFrame, y: DataFrame, data: lgb.Dataset) -> str:
+        params = {k: v for k, v in self.params.items() if k in PRE_FILTER_PARAMS}
+        return fingerprint(X, y, data.get_params(), params, lgb.__version__)
+
+    def fit_dataset(
+        self,
+        data: lgb.Dataset,
+        X_columns: Sequence[str],
+        y_column: str,
+        *,
+        index: np.ndarray | None = None,
+        valid_index: np.ndarray | None = None,
+    ):
+        # With early stopping in params, the valid_index rows are the validation
+        # set, and predictions use the best iteration found on them
+        self.X_columns = list(X_columns)
+        self.y_column = y_column
+        train = data if index is None else data.subset(np.sort(index).tolist())
+        if valid_index is not None and self.early_stopping:
+            valid = data.subset(np.sort(valid_index).tolist())
+            self.booster = self.train_fn(train, valid_sets=[valid])
+        else:
+            self.booster = self.train_fn(train)
+        self.best_iteration = self.booster.best_iteration or None
 
-        X_np = X.to_numpy().squeeze()
-        y_np = y.to_numpy().squeeze()
+    @property
+    def early_stopping(self) -> bool:
+        return any(self.params.get(k) for k in EARLY_STOPPING_PARAMS)
 
-        data = lgb.Dataset(X_np, label=y_np)
-        self.booster = self.train_fn(data)
+    def fit(self, X: FrameType, y: FrameType | None = None):
+        data = self.build_dataset(X, y)
+        self.fit_dataset(data, X.columns, y.columns[0])  # type: ignore
 
-    def transform(self, X: FrameType) -> FrameType:
+    def to_matrix(self, X: FrameType) -> np.ndarray:
         if isinstance(X, LazyFrame):
             raise LazyFrameNotSupportedError(
                 self.__class__.__name__, self.transform.__name__
@@ -69,7 +139,20 @@ class LightGBM(Transformer):
                 self.__class__.__name__, X.columns, self.X_columns
             )
 
-        X_np = X.to_numpy().squeeze()
+        # Features are passed in their training order
+        return self.to_numpy(X.select(self.X_columns))
+
+    def to_numpy(self, X: DataFrame) -> np.ndarray:
+        # Within a Pipeline with a dtype policy, the matrix is built in its float
+        # dtype whatever the mix of input dtypes
+        if (dtype := model_float_dtype()) is None:
+            return X.to_numpy()
+        return X.select(pl.all().cast(dtype)).to_numpy()
+
+    def predict_matrix(self, X_np: np.ndarray) -> DataFrame:
+        if self.booster is None or self.y_column is None:
+            raise NotFittedError(self.__class__.__name__)
+
         pred = self.predict_fn(self.booster, X_np)
         assert isinstance(pred, np.ndarray)
 
@@ -79,3 +162,61 @@ class LightGBM(Transformer):
             )
         else:
             return pl.from_numpy(pred, schema=[self.y_column])
+
+    def transform(self, X: FrameType) -> FrameType:
+        return self.predict_matrix(self.to_matrix(X))
+
+    def compile(self) -> CompiledFn:
+        if self.booster is None or self.X_columns is None or self.y_column is None:
+            raise NotFittedError(self.__class__.__name__)
+
+        booster = self.booster
+        predict_fn = self.predict_fn
+        X_columns = self.X_columns
+        y_column = self.y_column
+        # The same matrix dtype as to_numpy
+        dtype = model_float_dtype()
+        np_dtype = (
+            np.float64 if dtype is None else pl.Series(dtype=dtype).to_numpy().dtype
+        )
+
+        def fn(batch: Batch) -> Batch:
+            if set(X_columns) != batch.keys():
+                raise ColumnsMismatchError(
+                    self.__class__.__name__, list(batch), X_columns
+                )
+
+            X_np = np.column_stack(
+                [np.asarray(batch[col], dtype=np_dtype) for col in X_columns]
+            )
+            pred = predict_fn(booster, X_np)
+            if pred.ndim == 2:
+                return {f"{y_column}_{i}": pred[:, i] for i in range(pred.shape[1])}
+            return {y_column: pred}
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        if self.X_columns is not None and self.y_column is not None:
+            if set(self.X_columns) != set(schema.names()):
+                raise ColumnsMismatchError(
+                    self.__class__.__name__, schema.names(), self.X_columns
+                )
+            y_column = self.y_column
+        else:
+            if y_schema is None:
+                raise TargetRequiredError(self.__class__.__name__)
+            if len(y_schema) > 1:
+                raise ValueError("y should have only one column")
+            y_column = y_schema.names()[0]
+
+        check_numeric_columns(
+            self.__class__.__name__, schema, schema.names(), allow_boolean=True
+        )
+
+        if self.params.get("objective") == "multiclass":
+            return Schema(
+                {f"{y_column}_{i}": pl.Float64 for i in range(self.params["num_class"])}
+            )
+        else:
+            return Schema({y_column: pl.Float64})
@@ -2,7 +2,9 @@ import uuid
 from typing import Iterable
 
 import polars as pl
+from polars import DataFrame, LazyFrame, Schema
 
+from polars_pipeline.exception import InvalidDtypeError
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
 
@@ -16,18 +18,12 @@ class NullPredictor(Transformer):
         self.exclude = exclude or []
 
     def fit(self, X: FrameType, y: FrameType | None = None):
-        if log_dir := self.log_dir:
-            self.model.log_dir = log_dir
-
         X_fill = X.filter(pl.col(self.target).is_not_null())
         y = X_fill.select(pl.col(self.target))
         X = X_fill.drop(self.target, *self.exclude)
         self.model.fit(X, y)
 
     def transform(self, X: FrameType) -> FrameType:
-        if log_dir := self.log_dir:
-            self.model.log_dir = log_dir
-
         # Add index to restore the order later
         index_name = str(uuid.uuid4())
         X = X.with_row_index(index_name)
@@ -45,3 +41,24 @@ class NullPredictor(Transformer):
             .drop(index_name)
         )
         return X_filled
+
+    def estimate_memory(self, X: DataFrame) -> int:
+        # The null and filled rows are split, concatenated and sorted back
+        return 3 * X.estimated_size()
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        X = LazyFrame(schema=schema)
+        y_schema = X.select(self.target).collect_schema()
+        X_schema = X.drop(self.target, *self.exclude).collect_schema()
+        pred_schema = self.model.output_schema(X_schema, y_schema)
+
+        if self.target not in pred_schema:
+            raise pl.exceptions.ColumnNotFoundError(self.target)
+        if pred_schema[self.target] != schema[self.target]:
+            raise InvalidDtypeError(
+                self.__class__.__name__,
+                self.target,
+                pred_schema[self.target],
+                f"predictions of dtype {schema[self.target]}",
+            )
+        return schema
@@ -1,5 +1,8 @@
 from typing import Iterable
 
+from polars import LazyFrame, Schema
+
+from polars_pipeline.compiled import Batch, CompiledFn
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
 
@@ -10,23 +13,30 @@ class Predictor(Transformer):
         self.target = target
 
     def fit(self, X: FrameType, y: FrameType | None = None):
-        if log_dir := self.log_dir:
-            self.model.log_dir = log_dir
-
         y = X.select(self.target)
         X = X.drop(self.target)
         self.model.fit(X, y)
 
     def transform(self, X: FrameType) -> FrameType:
-        if log_dir := self.log_dir:
-            self.model.log_dir = log_dir
-
         return self.model.transform(X.drop(self.target))
 
     def fit_transform(self, X: FrameType, y: FrameType | None = None) -> FrameType:
-        if log_dir := self.log_dir:
-            self.model.log_dir = log_dir
-
         y = X.select(self.target)
         X = X.drop(self.target)
         return self.model.fit_transform(X, y)
+
+    def compile(self) -> CompiledFn:
+        target = {self.target} if isinstance(self.target, str) else set(self.target)
+        model_fn = self.model.compile()
+
+        def fn(batch: Batch) -> Batch:
+            # The target is usually absent at inference time, so it is dropped
+            return model_fn({k: v for k, v in batch.items() if k not in target})
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        X = LazyFrame(schema=schema)
+        y_schema = X.select(self.target).collect_schema()
+        X_schema = X.drop(self.target).collect_schema()
+        return self.model.output_schema(X_schema, y_schema)
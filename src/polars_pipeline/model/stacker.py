@@ -1,22 +1,40 @@
-import json
+import contextvars
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import deepcopy
-from typing import Any, Callable, Dict, Iterable, List, Literal
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Tuple,
+)
 
 import numpy as np
 import polars as pl
-from polars import DataFrame, LazyFrame
+from polars import DataFrame, LazyFrame, Schema
 from polars._typing import IntoExpr
-from sklearn.model_selection import BaseCrossValidator
 
+from polars_pipeline.compiled import Batch, CompiledFn
 from polars_pipeline.exception import (
     LazyFrameNotSupportedError,
     NotFittedError,
+    SchemaNotResolvableError,
+    SchemaValidationError,
     TargetRequiredError,
 )
-from polars_pipeline.transformer import Transformer
+from polars_pipeline.transformer import Transformer, log_scope
 from polars_pipeline.typing import FrameType
-from polars_pipeline.utils import list_of_dict_to_dict_of_list
+from polars_pipeline.utils import list_of_dict_to_dict_of_list, take_rows
+from polars_pipeline.writer import get_writer
+
+if TYPE_CHECKING:
+    from sklearn.model_selection import BaseCrossValidator
 
 
 class Stacker(Transformer):
@@ -24,10 +42,12 @@ class Stacker(Transformer):
         self,
         model: Transformer,
         *,
-        fold: BaseCrossValidator,
+        fold: "BaseCrossValidator",
         aggs: Iterable[IntoExpr] | Literal["mean"] = "mean",
         groups: str | None = None,
         metrics_fn: Callable[[DataFrame, DataFrame], Dict[str, Any]] | None = None,
+        fold_callback: Callable[[int, Dict[str, Any]], None] | None = None,
+        n_jobs: int = 1,
     ):
         if aggs == "mean":
             aggs = [pl.all().mean()]
@@ -37,10 +57,23 @@ class Stacker(Transformer):
         self.groups = groups
         self.aggs = aggs
         self.metrics_fn = metrics_fn
+        self.fold_callback = fold_callback
+        self.n_jobs = n_jobs
         self.models: List[Transformer] = []
         self.valid_indexes: List[np.ndarray] = []
+        self.metrics: Dict[str, List[Any]] = {}
+
+    def fold_log_dir(self, fold: int) -> Path | None:
+        if log_dir := self.log_dir:
+            return log_dir / f"fold_{fold}"
+        return None
 
     def fit(self, X: FrameType, y: FrameType | None = None):
+        self.fit_folds(X, y, keep_preds=False)
+
+    def fit_folds(
+        self, X: FrameType, y: FrameType | None, *, keep_preds: bool
+    ) -> List[DataFrame]:
         if isinstance(X, LazyFrame) or isinstance(y, LazyFrame):
             raise LazyFrameNotSupportedError(self.__class__.__name__, self.fit.__name__)
 
@@ -49,30 +82,88 @@ class Stacker(Transformer):
 
         self.models.clear()
         self.valid_indexes.clear()
+        self.metrics.clear()
         metrics_list = []
+        preds = []
+        # Models that build their training data once, such as LightGBM with its
+        # binned Dataset, are fitted on row subsets of it and also get the fold's
+        # validation rows
+        data = None
+        if build_dataset := getattr(self.model, "build_dataset", None):
+            data = build_dataset(X, y)
         for i, (train_idx, valid_idx) in enumerate(
             self.fold.split(X, y, groups=self.groups)
         ):
-            X_train = X.select(pl.all().gather(train_idx))
-            y_train = y.select(pl.all().gather(train_idx))
-            X_valid = X.select(pl.all().gather(valid_idx))
-            y_valid = y.select(pl.all().gather(valid_idx))
             model = deepcopy(self.model)
-            if log_dir := self.log_dir:
-                model.log_dir = log_dir / f"fold_{i}"
-
-            model.fit(X_train, y_train)
+            with log_scope(self.fold_log_dir(i)):
+                if data is not None:
+                    model.fit_dataset(  # type: ignore
+                        data,
+                        X.columns,
+                        y.columns[0],
+                        index=train_idx,
+                        valid_index=valid_idx,
+                    )
+                else:
+                    model.fit(take_rows(X, train_idx), take_rows(y, train_idx))
             self.models.append(model)
             self.valid_indexes.append(valid_idx)
 
-            if self.metrics_fn and self.log_dir:
-                metrics = self.metrics_fn(y_valid, model.transform(X_valid))
+            # Out-of-fold predictions are made once, for both the metrics and
+            # fit_transform
+            with_metrics = self.metrics_fn and (self.log_dir or self.fold_callback)
+            if not (keep_preds or with_metrics):
+                continue
+
+            with log_scope(self.fold_log_dir(i)):
+                y_pred = model.transform(take_rows(X, valid_idx))
+            if keep_preds:
+                preds.append(y_pred)
+            if with_metrics:
+                metrics = self.metrics_fn(take_rows(y, valid_idx), y_pred)  # type: ignore
                 metrics_list.append(metrics)
+                if self.fold_callback:
+                    self.fold_callback(i, metrics)
 
+        self.metrics = list_of_dict_to_dict_of_list(metrics_list)
         if len(metrics_list) > 0 and self.log_dir:
-            self.log_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.log_dir / f"{'_'.join(y.columns)}.json", "w") as f:
-                json.dump(list_of_dict_to_dict_of_list(metrics_list), f, indent=4)
+            get_writer().write_json(
+                self.log_dir / f"{'_'.join(y.columns)}.json", self.metrics
+            )
+        return preds
+
+    @property
+    def best_iterations(self) -> List[int | None]:
+        return [getattr(model, "best_iteration", None) for model in self.models]
+
+    def is_mean(self) -> bool:
+        return [str(agg) for agg in self.aggs] == [str(pl.all().mean())]
+
+    def predict_folds(self, X: DataFrame) -> Iterator[Tuple[int, DataFrame]]:
+        # Models with a matrix form, such as LightGBM, share one read-only
+        # conversion of X. With n_jobs above 1, the folds are scored in threads,
+        # since prediction releases the GIL, and yielded as they complete. Models
+        # that already predict with several threads, as LightGBM does by default,
+        # oversubscribe the cores when run in parallel.
+        X_in: Any = X
+        if to_matrix := getattr(self.models[0], "to_matrix", None):
+            X_in = to_matrix(X)
+            X_in.flags.writeable = False
+
+        def predict(i: int, model: Transformer, X_in: Any) -> DataFrame:
+            with log_scope(self.fold_log_dir(i)):
+                if to_matrix is not None:
+                    return model.predict_matrix(X_in)  # type: ignore
+                return model.transform(X_in)  # type: ignore
+
+        contexts = [contextvars.copy_context() for _ in self.models]
+        with ThreadPoolExecutor(self.n_jobs) as executor:
+            futures = {
+                executor.submit(context.run, predict, i, model, X_in): i
+                for i, (context, model) in enumerate(zip(contexts, self.models))
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
 
     def transform(self, X: FrameType) -> FrameType:
         if isinstance(X, LazyFrame):
@@ -83,12 +174,26 @@ class Stacker(Transformer):
         if not self.models:
             raise NotFittedError(self.__class__.__name__)
 
-        if log_dir := self.log_dir:
-            for i, model in enumerate(self.models):
-                model.log_dir = log_dir / f"fold_{i}"
+        # The mean is summed as the folds complete instead of grouping the
+        # concatenated predictions by row. Folds are added in index order, holding
+        # back those that complete early, so the result does not depend on the
+        # completion order and matches compile().
+        if self.is_mean():
+            total: DataFrame | None = None
+            pending: Dict[int, DataFrame] = {}
+            n_added = 0
+            for i, fold_pred in self.predict_folds(X):
+                pending[i] = fold_pred
+                while n_added in pending:
+                    fold_pred = pending.pop(n_added)
+                    total = fold_pred if total is None else total + fold_pred
+                    n_added += 1
+            return total / len(self.models)  # type: ignore
 
+        preds: List[DataFrame] = [DataFrame()] * len(self.models)
+        for i, fold_pred in self.predict_folds(X):
+            preds[i] = fold_pred
         index_name = str(uuid.uuid4())
-        preds = [model.transform(X) for model in self.models]
         pred_catted: DataFrame = pl.concat(
             [pred.with_row_index(index_name) for pred in preds],
             how="vertical",
@@ -102,17 +207,13 @@ class Stacker(Transformer):
         return pred  # type: ignore
 
     def fit_transform(self, X: FrameType, y: FrameType | None = None) -> FrameType:
-        self.fit(X, y)
+        preds = self.fit_folds(X, y, keep_preds=True)
         valid_index = np.concatenate(self.valid_indexes)
-        preds = [
-            model.transform(X.select(pl.all().gather(valid_idx)))
-            for model, valid_idx in zip(self.models, self.valid_indexes)
-        ]
         index_name = str(uuid.uuid4())
         pred = (
             pl.concat(
                 [
-                    pl.concat(preds, how="vertical"),  # type: ignore
+                    pl.concat(preds, how="vertical"),
                     pl.from_numpy(valid_index, schema=[index_name]),
                 ],
                 how="horizontal",
@@ -121,3 +222,54 @@ class Stacker(Transformer):
             .drop(index_name)
         )
         return pred
+
+    def estimate_memory(self, X: DataFrame) -> int:
+        # A fold holds at most one copy of X for its splits, and every fold model
+        # predicts all rows before the predictions are aggregated
+        try:
+            n_outputs = len(self.output_schema(X.schema))
+        except (
+            TargetRequiredError,
+            SchemaNotResolvableError,
+            SchemaValidationError,
+        ):
+            # Before the fit, the outputs depend on the target or the data
+            n_outputs = 1
+        n_preds = self.fold.get_n_splits() * X.height * n_outputs
+        return X.estimated_size() + n_preds * 8
+
+    def compile(self) -> CompiledFn:
+        if not self.models:
+            raise NotFittedError(self.__class__.__name__)
+
+        if not self.is_mean():
+            return super().compile()
+
+        fns = [model.compile() for model in self.models]
+
+        def fn(batch: Batch) -> Batch:
+            # Summed in fold order, as transform does
+            preds = [f(batch) for f in fns]
+            out = {}
+            for name in preds[0]:
+                total = preds[0][name]
+                for pred in preds[1:]:
+                    total = total + pred[name]
+                out[name] = total / len(preds)
+            return out
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        model = self.models[0] if self.models else self.model
+        pred_schema = model.output_schema(schema, y_schema)
+
+        index_name = str(uuid.uuid4())
+        return (
+            LazyFrame(schema=pred_schema)
+            .with_row_index(index_name)
+            .group_by(index_name)
+            .agg(*self.aggs)
+            .drop(index_name)
+            .collect_schema()
+        )
@@ -1,51 +1,75 @@
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Literal
 
-if TYPE_CHECKING:
-    from polars_pipeline import Pipeline
-
-
-import lightgbm as lgb
-import numpy as np
 from polars import DataFrame
 from polars._typing import IntoExpr
-from sklearn.model_selection import BaseCrossValidator
 
-from polars_pipeline.model import LightGBM, NullPredictor, Predictor, Stacker
 from polars_pipeline.transformer import Transformer
 
+if TYPE_CHECKING:
+    import lightgbm as lgb
+    import numpy as np
+    from sklearn.model_selection import BaseCrossValidator
+
+    from polars_pipeline import Pipeline
+
 
 class ModelNameSpace:
     def __init__(self, pipeline: "Pipeline"):
         self.pipeline = pipeline
 
     def predict(self, model: Transformer, *, target: str | Iterable[str]) -> "Pipeline":
+        from polars_pipeline.model import Predictor
+
         return self.pipeline.pipe(Predictor(model, target=target))
 
     def predict_null(
         self, model: Transformer, *, target: str, exclude: Iterable[str] | None = None
     ) -> "Pipeline":
+        from polars_pipeline.model import NullPredictor
+
         return self.pipeline.pipe(NullPredictor(model, target=target, exclude=exclude))
 
     def lightgbm(
         self,
         params: Dict[str, Any],
         *,
-        train_fn: Callable[[lgb.Dataset], lgb.Booster] | None = None,
-        predict_fn: Callable[[lgb.Booster, np.ndarray], np.ndarray] | None = None,
+        train_fn: Callable[..., "lgb.Booster"] | None = None,
+        predict_fn: Callable[["lgb.Booster", "np.ndarray"], "np.ndarray"] | None = None,
+        dataset_cache_dir: Path | str | None = None,
     ) -> "Pipeline":
+        from polars_pipeline.model import LightGBM
+
         return self.pipeline.pipe(
-            LightGBM(params, train_fn=train_fn, predict_fn=predict_fn)
+            LightGBM(
+                params,
+                train_fn=train_fn,
+                predict_fn=predict_fn,
+                dataset_cache_dir=dataset_cache_dir,
+            )
         )
 
     def stack(
         self,
         model: Transformer,
         *,
-        fold: BaseCrossValidator,
+        fold: "BaseCrossValidator",
         aggs: Iterable[IntoExpr] | Literal["mean"] = "mean",
         groups: str | None = None,
         metrics_fn: Callable[[DataFrame, DataFrame], Dict[str, Any]] | None = None,
+        fold_callback: Callable[[int, Dict[str, Any]], None] | None = None,
+        n_jobs: int = 1,
     ) -> "Pipeline":
+        from polars_pipeline.model import Stacker
+
         return self.pipeline.pipe(
-            Stacker(model, fold=fold, aggs=aggs, groups=groups, metrics_fn=metrics_fn)
+            Stacker(
+                model,
+                fold=fold,
+                aggs=aggs,
+                groups=groups,
+                metrics_fn=metrics_fn,
+                fold_callback=fold_callback,
+                n_jobs=n_jobs,
+            )
         )
@@ -1,52 +1,438 @@
 import datetime
+import random
+import time
 import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from copy import copy
 from pathlib import Path
-from typing import Collection, Iterable, List, Literal, Mapping, Self, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Self,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import polars as pl
+from polars import DataFrame, LazyFrame, Schema
 from polars._typing import ColumnNameOrSelector, IntoExpr, PolarsDataType
 
 from polars_pipeline import functional as F
-from polars_pipeline.transformer import Transformer
-from polars_pipeline.typing import FrameType
+from polars_pipeline.checkpoint import (
+    CHECKPOINT_DIR,
+    Checkpoint,
+    checkpoint_paths,
+    resume,
+    save_checkpoint,
+)
+from polars_pipeline.compiled import CompiledPipeline
+from polars_pipeline.dtype_policy import DtypePolicy, model_dtype_scope
+from polars_pipeline.exception import (
+    LazyFrameNotSupportedError,
+    SchemaValidationError,
+)
+from polars_pipeline.memory import MemoryBudget
+from polars_pipeline.telemetry import TelemetryRecorder
+from polars_pipeline.transformer import (
+    Transformer,
+    current_log_dir,
+    log_scope,
+    schema_only,
+)
+from polars_pipeline.typing import FrameType, Source
+from polars_pipeline.utils import file_format, frame_schema, scan_source
+from polars_pipeline.writer import get_writer, write_scope
 
 from .model import ModelNameSpace
 from .plot import PlotNameSpace
 from .preprocessing import PreprocessingNameSpace
 
+if TYPE_CHECKING:
+    from .search import MedianPruner, Trial
+
+
+LogMode = Literal["always", "fit", "sampled", "off"]
+# Input columns to read, and the input schema and the needed output columns of
+# each stage, None when all of them are needed
+ColumnPlan = Tuple[List[str], List[Tuple[Schema, Set[str] | None]]]
+Plan = Tuple[List[str], List[Transformer]]
+
+PLAN_CACHE_SIZE = 32
+
+_in_run: ContextVar[bool] = ContextVar("in_pipeline_run", default=False)
+
+
+@contextmanager
+def run_scope() -> Iterator[None]:
+    # Marks the stages of a pipeline call, so pipelines nested in them know they
+    # are not the outermost call whether or not it logs
+    token = _in_run.set(True)
+    try:
+        yield
+    finally:
+        _in_run.reset(token)
+
+
+def new_run_id() -> str:
+    return datetime.datetime.now().strftime(f"%Y-%m-%d_%H-%M-%S_{uuid.uuid4()}")
+
+
+def path_result(X: FrameType | Source, out: FrameType) -> FrameType:
+    if isinstance(X, (DataFrame, LazyFrame)):
+        return out
+    return out.lazy()
+
 
 class Pipeline(Transformer):
-    def __init__(self, *, log_dir: Path | str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        log_dir: Path | str | None = None,
+        log_mode: LogMode = "always",
+        log_sample_rate: float = 0.01,
+        telemetry: bool = True,
+        prune_columns: bool = True,
+        dtype_policy: DtypePolicy | None = None,
+        memory_budget: MemoryBudget | None = None,
+    ) -> None:
+        if log_mode not in ("always", "fit", "sampled", "off"):
+            raise ValueError(f"Unknown log_mode: {log_mode}")
+
         self.transformers: List[Transformer] = []
+        self.log_mode = log_mode
+        self.log_sample_rate = log_sample_rate
+        self.telemetry = telemetry
+        self.prune_columns = prune_columns
+        self.dtype_policy = dtype_policy
+        self.memory_budget = memory_budget
+        self.plans: Dict[Tuple[Any, ...], ColumnPlan | None] = {}
 
         if log_dir:
             self.log_dir = Path(log_dir)
 
-    def set_log_dir(self):
-        if log_dir := self.log_dir:
-            log_dir = Path(log_dir) / datetime.datetime.now().strftime(
-                f"%Y-%m-%d_%H-%M-%S_{uuid.uuid4()}"
-            )
-            zero_pad = len(str(len(self.transformers)))
-            for i, transformer in enumerate(self.transformers):
-                name = f"{i:0>{zero_pad}}_{transformer.__class__.__name__}"
-                transformer.log_dir = log_dir / name
-
-    def fit(self, X: FrameType, y: FrameType | None = None):
-        self.fit_transform(X, y)
-
-    def transform(self, X: FrameType) -> FrameType:
-        self.set_log_dir()
-        for transformer in self.transformers:
-            X = transformer.transform(X)
-        return X
+    def should_log(self, fit: bool, log: bool | None = None) -> bool:
+        if log is not None:
+            return log
+        # A pipeline nested in a logging call follows its parent unless it is off
+        if current_log_dir() is not None:
+            return self.log_mode != "off"
+        if self.log_mode == "sampled":
+            return fit or random.random() < self.log_sample_rate
+        return self.log_mode == "always" or (self.log_mode == "fit" and fit)
 
-    def fit_transform(self, X: FrameType, y: FrameType | None = None) -> FrameType:
-        self.set_log_dir()
-        for transformer in self.transformers:
-            X = transformer.fit_transform(X, y)
+    def run_log_dir(self, log: bool) -> Path | None:
+        if not log or not (log_dir := self.log_dir):
+            return None
+
+        # Only the outermost pipeline opens a run directory
+        log_dir = Path(log_dir)
+        if current_log_dir() is None:
+            log_dir /= new_run_id()
+        return log_dir
+
+    def stage_log_dirs(self, run_dir: Path | None) -> List[Path | None]:
+        if run_dir is None:
+            return [None] * len(self.transformers)
+
+        zero_pad = len(str(len(self.transformers)))
+        return [
+            run_dir / f"{i:0>{zero_pad}}_{transformer.__class__.__name__}"
+            for i, transformer in enumerate(self.transformers)
+        ]
+
+    def run_stage(
+        self,
+        transformer: Transformer,
+        X: FrameType,
+        y: FrameType | None,
+        phase: Literal["fit_transform", "transform"],
+    ) -> FrameType:
+        if phase == "fit_transform":
+            return transformer.fit_transform(X, y)
+        return transformer.transform(X)
+
+    def run(
+        self,
+        X: FrameType | Source,
+        y: FrameType | Source | None,
+        *,
+        phase: Literal["fit_transform", "transform"],
+        log: bool | None,
+    ) -> FrameType:
+        sources = (X, y)
+        X = scan_source(X)
+        y = scan_source(y) if y is not None else None
+        transformers = self.transformers
+        schema = frame_schema(X) if self.prune_columns else None
+        if (
+            phase == "transform"
+            and schema is not None
+            and (plan := self.cached_plan(schema))
+        ):
+            # Only the needed input columns are read, which a scan pushes down
+            columns, transformers = plan
+            X = X.select(columns)
+        if self.dtype_policy:
+            X = self.dtype_policy.apply(X)
+
+        nested = current_log_dir() is not None
+        outermost = not _in_run.get()
+        checkpoints: Dict[int, Path] = {}
+        start_index = 0
+        if phase == "fit_transform" and outermost:
+            default_dir = Path(self.log_dir) / CHECKPOINT_DIR if self.log_dir else None
+            checkpoints = checkpoint_paths(transformers, *sources, default_dir)
+            start_index, X_resumed = resume(transformers, checkpoints)
+            if X_resumed is not None:
+                X = X_resumed
+
+        run_dir = self.run_log_dir(self.should_log(phase == "fit_transform", log))
+        # A nested pipeline that does not log keeps its stages out of the parent's
+        # directory
+        log_off = nested and run_dir is None
+        # Telemetry is part of the outermost call's logs, so a call that does not
+        # log costs nothing extra
+        telemetry = None
+        if self.telemetry and outermost and self.log_dir and run_dir is not None:
+            telemetry = TelemetryRecorder(run_dir.name, phase)
+
+        with write_scope() if outermost else nullcontext():
+            for i, (transformer, log_dir) in enumerate(
+                zip(transformers, self.stage_log_dirs(run_dir))
+            ):
+                if i < start_index:
+                    continue
+                if self.memory_budget:
+                    X = self.memory_budget.check(i, transformer, X)
+
+                started_at = datetime.datetime.now()
+                start = time.perf_counter()
+                with (
+                    log_scope(log_dir, off=log_off),
+                    run_scope(),
+                    model_dtype_scope(self.dtype_policy),
+                ):
+                    try:
+                        X_out = self.run_stage(transformer, X, y, phase)
+                    except LazyFrameNotSupportedError:
+                        if not isinstance(X, LazyFrame) and not isinstance(
+                            y, LazyFrame
+                        ):
+                            raise
+                        # The query so far, including the filters and selections pushed
+                        # into a scan, is executed once and the rest runs in memory
+                        X = X.collect() if isinstance(X, LazyFrame) else X
+                        y = y.collect() if isinstance(y, LazyFrame) else y
+                        X_out = self.run_stage(transformer, X, y, phase)
+                if self.dtype_policy:
+                    X_out = self.dtype_policy.apply(
+                        X_out, f"{i}_{transformer.__class__.__name__}"
+                    )
+                if telemetry:
+                    duration = time.perf_counter() - start
+                    telemetry.record(i, transformer, started_at, duration, X, X_out)
+                if i in checkpoints:
+                    X_out = save_checkpoint(
+                        checkpoints[i], X_out, transformers[: i + 1]
+                    )
+                X = X_out
+
+            # Artifacts and telemetry of the call are on disk once the outermost
+            # pipeline returns. Writes of concurrent calls are left to those calls.
+            if telemetry:
+                telemetry.write(Path(self.log_dir))  # type: ignore
+            if outermost:
+                get_writer().flush()
+        if phase == "fit_transform" and schema is not None:
+            self.plans = {tuple(schema.items()): self.column_plan(schema)}
         return X
 
+    def column_plan(
+        self, schema: Schema, columns: Set[str] | None = None
+    ) -> ColumnPlan | None:
+        # Works backwards from the needed output columns to the input columns each
+        # stage reads. A stage without its own output_schema stops the pruning, as
+        # resolving its schema would run its transform.
+        try:
+            with schema_only():
+                schemas = [schema]
+                for transformer in self.transformers:
+                    schemas.append(transformer.output_schema(schemas[-1]))
+        except Exception:
+            return None
+
+        needed = set(schemas[-1].names()) if columns is None else set(columns)
+        stages: List[Tuple[Schema, Set[str] | None]] = []
+        for transformer, input_schema, output_schema in zip(
+            reversed(self.transformers), reversed(schemas[:-1]), reversed(schemas[1:])
+        ):
+            full = needed.issuperset(output_schema.names())
+            stages.insert(0, (input_schema, None if full else needed))
+            required = transformer.required_columns(input_schema, needed)
+            names = input_schema.names()
+            needed = set(names) if required is None else required & set(names)
+            # A frame without columns has no rows, so at least one is kept
+            if not needed and names:
+                needed = {names[0]}
+
+        return [col for col in schema.names() if col in needed], stages
+
+    def prune_stages(self, column_plan: ColumnPlan | None) -> Plan | None:
+        if column_plan is None:
+            return None
+
+        # Stages whose outputs are all needed run as they are, without a copy
+        columns, stages = column_plan
+        return columns, [
+            transformer if needed is None else transformer.prune(input_schema, needed)
+            for transformer, (input_schema, needed) in zip(self.transformers, stages)
+        ]
+
+    def plan(self, schema: Schema, columns: Set[str] | None = None) -> Plan | None:
+        return self.prune_stages(self.column_plan(schema, columns))
+
+    def cached_plan(self, schema: Schema) -> Plan | None:
+        # Only the columns are cached, per schema, so the stages are pruned in
+        # their current state. The cache is replaced rather than updated, so
+        # concurrent transforms never see it half written.
+        key = tuple(schema.items())
+        plans = self.plans
+        if key in plans:
+            return self.prune_stages(plans[key])
+
+        column_plan = self.column_plan(schema)
+        plans = {} if len(plans) >= PLAN_CACHE_SIZE else dict(plans)
+        plans[key] = column_plan
+        self.plans = plans
+        return self.prune_stages(column_plan)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        column_plan = self.column_plan(schema, columns)
+        return set(column_plan[0]) if column_plan else None
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        if (plan := self.plan(schema, columns)) is None:
+            return self
+
+        pruned = copy(self)
+        pruned.transformers = plan[1]
+        pruned.plans = {}
+        return pruned
+
+    def fit(
+        self,
+        X: FrameType | Source,
+        y: FrameType | Source | None = None,
+        *,
+        log: bool | None = None,
+    ):
+        self.fit_transform(X, y, log=log)
+
+    def transform(self, X: FrameType | Source, *, log: bool | None = None) -> FrameType:
+        # A path is scanned, and its result is always a LazyFrame whether or not a
+        # stage had to collect the scan
+        return path_result(X, self.run(X, None, phase="transform", log=log))
+
+    def fit_transform(
+        self,
+        X: FrameType | Source,
+        y: FrameType | Source | None = None,
+        *,
+        log: bool | None = None,
+    ) -> FrameType:
+        return path_result(X, self.run(X, y, phase="fit_transform", log=log))
+
+    def sink(
+        self,
+        X: FrameType | Source,
+        path: Source,
+        *,
+        partition_by: str | Sequence[str] | None = None,
+        max_rows_per_file: int | None = None,
+        output_format: Literal["parquet", "ipc", "csv"] | None = None,
+        log: bool | None = None,
+    ):
+        # Transformed rows are streamed to disk instead of collected in memory. With
+        # partition_by or max_rows_per_file, path is a directory of part files.
+        partitioned = partition_by is not None or max_rows_per_file is not None
+        if output_format is None:
+            output_format = "parquet" if partitioned else file_format(path)
+        target = (
+            pl.PartitionBy(path, key=partition_by, max_rows_per_file=max_rows_per_file)
+            if partitioned
+            else path
+        )
+
+        out = self.transform(X, log=log).lazy()
+        if output_format == "parquet":
+            out.sink_parquet(target, mkdir=True)
+        elif output_format == "ipc":
+            out.sink_ipc(target, mkdir=True)
+        elif output_format == "csv":
+            out.sink_csv(target, mkdir=True)
+        else:
+            raise ValueError(f"Unknown format: {output_format}")
+
+    def compile(self) -> CompiledPipeline:
+        # Models compiled within the scope build their matrix as transform does
+        with model_dtype_scope(self.dtype_policy):
+            return CompiledPipeline(
+                [transformer.compile() for transformer in self.transformers]
+            )
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        if self.dtype_policy:
+            schema = self.dtype_policy.output_schema(schema)
+        for i, transformer in enumerate(self.transformers):
+            try:
+                schema = transformer.output_schema(schema, y_schema)
+            except Exception as e:
+                raise SchemaValidationError(i, transformer.__class__.__name__, e) from e
+            if self.dtype_policy:
+                schema = self.dtype_policy.output_schema(schema)
+        return schema
+
+    def validate(
+        self, X: FrameType | Schema, y: FrameType | Schema | None = None
+    ) -> Schema:
+        return self.output_schema(
+            frame_schema(X), frame_schema(y) if y is not None else None
+        )
+
+    @staticmethod
+    def search(
+        candidates: Sequence["Pipeline"],
+        X: FrameType,
+        y: FrameType | None = None,
+        *,
+        metric: str,
+        direction: Literal["minimize", "maximize"] = "minimize",
+        n_jobs: int | None = None,
+        pruner: "MedianPruner | None" = None,
+    ) -> List["Trial"]:
+        from .search import search
+
+        return search(
+            candidates,
+            X,
+            y,
+            metric=metric,
+            direction=direction,
+            n_jobs=n_jobs,
+            pruner=pruner,
+        )
+
     def pipe(self, transformer: Transformer) -> Self:
+        self.plans = {}
         self.transformers.append(transformer)
         return self
 
@@ -118,6 +504,15 @@ class Pipeline(Transformer):
     ) -> Self:
         return self.pipe(F.ArgminHorizontal(columns, name=name))
 
+    def branch(
+        self,
+        *transformers: Transformer,
+        how: Literal["horizontal", "join"] = "horizontal",
+        on: str | Sequence[str] | None = None,
+        n_jobs: int | None = None,
+    ) -> Self:
+        return self.pipe(F.Branch(*transformers, how=how, on=on, n_jobs=n_jobs))
+
     def dummy(
         self,
         columns: ColumnNameOrSelector | Sequence[ColumnNameOrSelector] | None = None,
@@ -133,6 +528,14 @@ class Pipeline(Transformer):
     ) -> Self:
         return self.pipe(F.DropNulls(columns))
 
+    def filter(
+        self, *predicates: IntoExpr | Iterable[IntoExpr], **constraints: object
+    ) -> Self:
+        return self.pipe(F.Filter(*predicates, **constraints))
+
+    def checkpoint(self, directory: Path | str | None = None) -> Self:
+        return self.pipe(Checkpoint(directory))
+
     def cast(
         self,
         dtypes: (
@@ -1,23 +1,13 @@
-from typing import TYPE_CHECKING, Iterable, Literal, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Literal, Tuple
 
-from matplotlib.colors import Colormap
-from matplotlib.typing import ColorType
+from polars_pipeline.transformer import Transformer
 
 if TYPE_CHECKING:
-    from polars_pipeline import Pipeline
+    from matplotlib.colors import Colormap
+    from matplotlib.typing import ColorType
 
-from polars_pipeline.plot import (
-    BoxPlot,
-    CorrelationHeatmap,
-    CountHeatmap,
-    HistPlot,
-    KDE2dPlot,
-    KDEPlot,
-    ScatterPlot,
-    UMAPPlot,
-    ViolinPlot,
-)
-from polars_pipeline.transformer import Transformer
+    from polars_pipeline import Pipeline
 
 
 class PlotNameSpace:
@@ -32,6 +22,8 @@ class PlotNameSpace:
         hue: str | None = None,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import BoxPlot
+
         return self.pipeline.pipe(
             BoxPlot(num_set=num_set, cat_set=cat_set, hue=hue, figsize=figsize)
         )
@@ -44,6 +36,8 @@ class PlotNameSpace:
         hue: str | None = None,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import ViolinPlot
+
         return self.pipeline.pipe(
             ViolinPlot(num_set=num_set, cat_set=cat_set, hue=hue, figsize=figsize)
         )
@@ -64,6 +58,8 @@ class PlotNameSpace:
         kde: bool = False,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import HistPlot
+
         return self.pipeline.pipe(
             HistPlot(
                 num_set=num_set,
@@ -90,6 +86,8 @@ class PlotNameSpace:
         fill: bool = True,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import KDEPlot
+
         return self.pipeline.pipe(
             KDEPlot(
                 num_set=num_set,
@@ -106,10 +104,12 @@ class PlotNameSpace:
     def corr_heatmap(
         self,
         *,
-        cmap: str | list[ColorType] | Colormap = "coolwarm",
+        cmap: "str | list[ColorType] | Colormap" = "coolwarm",
         annot: bool = False,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import CorrelationHeatmap
+
         return self.pipeline.pipe(
             CorrelationHeatmap(cmap=cmap, annot=annot, figsize=figsize)
         )
@@ -120,9 +120,11 @@ class PlotNameSpace:
         cat_set: Iterable[str] | None = None,
         sort_by_index: bool = True,
         sort_columns: bool = True,
-        cmap: str | list[ColorType] | Colormap = "viridis",
+        cmap: "str | list[ColorType] | Colormap" = "viridis",
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import CountHeatmap
+
         return self.pipeline.pipe(
             CountHeatmap(
                 cat_set=cat_set,
@@ -142,6 +144,8 @@ class PlotNameSpace:
         style: str | None = None,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import ScatterPlot
+
         return self.pipeline.pipe(
             ScatterPlot(
                 num_set=num_set,
@@ -160,9 +164,33 @@ class PlotNameSpace:
         fill: bool = True,
         figsize: Tuple[int, int] = (10, 8),
     ) -> "Pipeline":
+        from polars_pipeline.plot import KDE2dPlot
+
         return self.pipeline.pipe(
             KDE2dPlot(num_set=num_set, hue=hue, fill=fill, figsize=figsize)
         )
 
-    def umap(self, preprocess: Transformer | None = None) -> "Pipeline":
-        return self.pipeline.pipe(UMAPPlot(preprocess=preprocess))
+    def umap(
+        self,
+        preprocess: Transformer | None = None,
+        *,
+        sample_size: int | None = None,
+        stratify: str | None = None,
+        batch_size: int = 10000,
+        cache_dir: Path | str | None = None,
+        seed: int = 42,
+        umap_kwargs: Dict[str, Any] | None = None,
+    ) -> "Pipeline":
+        from polars_pipeline.plot import UMAPPlot
+
+        return self.pipeline.pipe(
+            UMAPPlot(
+                preprocess=preprocess,
+                sample_size=sample_size,
+                stratify=stratify,
+                batch_size=batch_size,
+                cache_dir=cache_dir,
+                seed=seed,
+                umap_kwargs=umap_kwargs,
+            )
+        )
@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Sequence, Tuple
 
+from polars._typing import ColumnNameOrSelector
+
 if TYPE_CHECKING:
     from polars_pipeline import Pipeline
 
@@ -17,13 +19,16 @@ class PreprocessingNameSpace:
         self.pipeline = pipeline
 
     def binarize(
-        self, columns: str | Sequence[str] | None = None, *, threshold: float = 0.5
+        self,
+        columns: ColumnNameOrSelector | Sequence[ColumnNameOrSelector] | None = None,
+        *,
+        threshold: float = 0.5,
     ) -> "Pipeline":
         return self.pipeline.pipe(Binarizer(columns, threshold=threshold))
 
     def label_encode(
         self,
-        columns: str | Sequence[str] | None = None,
+        columns: ColumnNameOrSelector | Sequence[ColumnNameOrSelector] | None = None,
         *,
         maintain_order: bool = False,
     ) -> "Pipeline":
@@ -37,8 +42,19 @@ class PreprocessingNameSpace:
         columns: str | Sequence[str],
         *,
         quantile_range: Tuple[float, float] = (0.25, 0.75),
+        approx: bool = False,
+        rank_error: float = 0.01,
+        n_jobs: int | None = None,
     ) -> "Pipeline":
-        return self.pipeline.pipe(RobustScaler(columns, quantile_range=quantile_range))
+        return self.pipeline.pipe(
+            RobustScaler(
+                columns,
+                quantile_range=quantile_range,
+                approx=approx,
+                rank_error=rank_error,
+                n_jobs=n_jobs,
+            )
+        )
 
     def standard_scale(self, columns: str | Sequence[str]) -> "Pipeline":
         return self.pipeline.pipe(StandardScaler(columns))
@@ -0,0 +1,190 @@
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import Any, Dict, Hashable, Iterator, List, Literal, Sequence
+
+from polars import LazyFrame
+
+from polars_pipeline.exception import TrialPrunedError
+from polars_pipeline.model.stacker import Stacker
+from polars_pipeline.transformer import Transformer
+from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import fingerprint
+
+from .pipeline import Pipeline
+
+
+class Trial:
+    def __init__(self, index: int, pipeline: Pipeline, prefix_length: int = 0):
+        self.index = index
+        self.pipeline = pipeline
+        self.prefix_length = prefix_length
+        self.state: Literal["running", "complete", "pruned", "failed"] = "running"
+        self.fold_scores: List[float] = []
+        self.score: float | None = None
+        self.error: BaseException | None = None
+
+    def __repr__(self) -> str:
+        return f"Trial(index={self.index}, state={self.state!r}, score={self.score})"
+
+
+class MedianPruner:
+    def __init__(self, n_startup_trials: int = 5):
+        self.n_startup_trials = n_startup_trials
+        self.direction: Literal["minimize", "maximize"] = "minimize"
+        self.history: Dict[Hashable, Dict[int, float]] = {}
+        self.lock = threading.Lock()
+
+    def report(self, index: int, step: Hashable, value: float) -> bool:
+        with self.lock:
+            values = self.history.setdefault(step, {})
+            others = [v for i, v in values.items() if i != index]
+            values[index] = value
+
+        # A trial is pruned once it is worse than the median of the other trials that
+        # reached the same fold
+        if len(others) < self.n_startup_trials:
+            return False
+
+        median = statistics.median(others)
+        if self.direction == "minimize":
+            return value > median
+        return value < median
+
+
+def iter_stackers(transformer: Transformer) -> Iterator[Stacker]:
+    if isinstance(transformer, Stacker):
+        yield transformer
+    if isinstance(model := getattr(transformer, "model", None), Transformer):
+        yield from iter_stackers(model)
+    for child in getattr(transformer, "transformers", []):
+        yield from iter_stackers(child)
+
+
+def stage_fingerprints(pipeline: Pipeline) -> List[str]:
+    # Sharing stops at the first stage that cannot be fingerprinted
+    fingerprints = []
+    for transformer in pipeline.transformers:
+        try:
+            fingerprints.append(fingerprint(transformer))
+        except TypeError:
+            break
+    return fingerprints
+
+
+def common_prefix_length(candidates: Sequence[Pipeline]) -> int:
+    fingerprints = [stage_fingerprints(candidate) for candidate in candidates]
+    length = 0
+    for stages in zip(*fingerprints):
+        if len(set(stages)) > 1:
+            break
+        length += 1
+    return length
+
+
+def ignore_fold(fold: int, metrics: Dict[str, Any]):
+    pass
+
+
+def run_trial(
+    trial: Trial,
+    X: FrameType,
+    y: FrameType | None,
+    metric: str,
+    pruner: MedianPruner | None,
+):
+    # The folds of Stackers in the shared prefix were scored once for all trials
+    prefix = trial.pipeline.transformers[: trial.prefix_length]
+    for stacker in (s for t in prefix for s in iter_stackers(t)):
+        trial.fold_scores.extend(float(v) for v in stacker.metrics.get(metric, []))
+
+    suffix = trial.pipeline.transformers[trial.prefix_length :]
+    stackers = [s for t in suffix for s in iter_stackers(t) if s.metrics_fn]
+    for stacker_index, stacker in enumerate(stackers):
+
+        def callback(fold: int, metrics: Dict[str, Any], stacker_index=stacker_index):
+            score = float(metrics[metric])
+            trial.fold_scores.append(score)
+            if pruner and pruner.report(trial.index, (stacker_index, fold), score):
+                raise TrialPrunedError(trial.index, fold)
+
+        stacker.fold_callback = callback
+
+    try:
+        for transformer in suffix:
+            X = transformer.fit_transform(X, y)
+    except TrialPrunedError:
+        trial.state = "pruned"
+        return
+    except Exception as e:
+        trial.state = "failed"
+        trial.error = e
+        return
+    finally:
+        for stacker in stackers:
+            stacker.fold_callback = None
+
+    stackers = [s for t in trial.pipeline.transformers for s in iter_stackers(t)]
+    scores = [s.metrics[metric] for s in stackers if metric in s.metrics]
+    if not scores:
+        trial.state = "failed"
+        trial.error = ValueError(f"No Stacker reported metric {metric!r}")
+        return
+
+    trial.score = statistics.mean(scores[-1])
+    trial.state = "complete"
+
+
+def search(
+    candidates: Sequence[Pipeline],
+    X: FrameType,
+    y: FrameType | None = None,
+    *,
+    metric: str,
+    direction: Literal["minimize", "maximize"] = "minimize",
+    n_jobs: int | None = None,
+    pruner: MedianPruner | None = None,
+) -> List[Trial]:
+    if not candidates:
+        raise ValueError("candidates must not be empty")
+
+    for i, candidate in enumerate(candidates):
+        stackers = [s for t in candidate.transformers for s in iter_stackers(t)]
+        if not any(stacker.metrics_fn for stacker in stackers):
+            raise ValueError(f"Candidate {i} has no Stacker with metrics_fn")
+
+    if pruner:
+        pruner.direction = direction
+
+    # Stages that are identical in every candidate are fitted once, and each trial
+    # only fits its own suffix on the shared output.
+    prefix_length = common_prefix_length(candidates)
+    prefix = deepcopy(candidates[0].transformers[:prefix_length])
+    # A Stacker only computes its fold metrics for a callback or a log_dir
+    prefix_stackers = [
+        s for t in prefix for s in iter_stackers(t) if not s.fold_callback
+    ]
+    for stacker in prefix_stackers:
+        stacker.fold_callback = ignore_fold
+    try:
+        for transformer in prefix:
+            X = transformer.fit_transform(X, y)
+    finally:
+        for stacker in prefix_stackers:
+            stacker.fold_callback = None
+    if isinstance(X, LazyFrame):
+        X = X.collect()
+
+    trials = []
+    for i, candidate in enumerate(candidates):
+        pipeline = Pipeline()
+        pipeline.transformers = prefix + deepcopy(
+            candidate.transformers[prefix_length:]
+        )
+        trials.append(Trial(i, pipeline, prefix_length))
+
+    with ThreadPoolExecutor(n_jobs) as executor:
+        list(executor.map(lambda trial: run_trial(trial, X, y, metric, pruner), trials))
+
+    return trials
@@ -1,7 +1,25 @@
-from .categorical import BoxPlot, ViolinPlot
-from .distributions import HistPlot, KDEPlot
-from .matrix import CorrelationHeatmap, CountHeatmap
-from .rational import KDE2dPlot, ScatterPlot, UMAPPlot
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .categorical import BoxPlot, ViolinPlot
+    from .distributions import HistPlot, KDEPlot
+    from .matrix import CorrelationHeatmap, CountHeatmap
+    from .rational import KDE2dPlot, ScatterPlot, UMAPPlot
+
+# Plotting pulls in seaborn, matplotlib and umap, so submodules are only imported
+# once one of their stages is accessed.
+_modules = {
+    "BoxPlot": ".categorical",
+    "ViolinPlot": ".categorical",
+    "HistPlot": ".distributions",
+    "KDEPlot": ".distributions",
+    "CorrelationHeatmap": ".matrix",
+    "CountHeatmap": ".matrix",
+    "KDE2dPlot": ".rational",
+    "ScatterPlot": ".rational",
+    "UMAPPlot": ".rational",
+}
 
 __all__ = [
     "BoxPlot",
@@ -14,3 +32,10 @@ __all__ = [
     "ScatterPlot",
     "UMAPPlot",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(_modules[name], __name__), name)
@@ -3,7 +3,7 @@ from typing import Iterable, Tuple
 import polars as pl
 import seaborn as sns
 from matplotlib import pyplot as plt
-from polars import LazyFrame
+from polars import LazyFrame, Schema
 from tqdm import tqdm
 
 from polars_pipeline.exception import LazyFrameNotSupportedError
@@ -11,7 +11,7 @@ from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
 from polars_pipeline.utils import categorical_columns, numerical_columns
 
-from .utils import log_figure
+from .utils import check_columns, log_figure
 
 
 class BoxPlot(Transformer):
@@ -58,8 +58,6 @@ class BoxPlot(Transformer):
                 ax.set_title(title)
 
                 log_figure(fig, title, log_dir)
-                fig.clear()
-                plt.close(fig)
 
                 pbar.update()
 
@@ -69,6 +67,10 @@ class BoxPlot(Transformer):
         self.log_figures(X)
         return X
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.num_set, self.cat_set, self.hue)
+        return schema
+
 
 class ViolinPlot(Transformer):
     def __init__(
@@ -114,8 +116,6 @@ class ViolinPlot(Transformer):
                 ax.set_title(title)
 
                 log_figure(fig, title, log_dir)
-                fig.clear()
-                plt.close(fig)
 
                 pbar.update()
 
@@ -124,3 +124,7 @@ class ViolinPlot(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         self.log_figures(X)
         return X
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.num_set, self.cat_set, self.hue)
+        return schema
@@ -3,7 +3,7 @@ from typing import Iterable, Literal, Tuple
 import polars as pl
 import seaborn as sns
 from matplotlib import pyplot as plt
-from polars import LazyFrame
+from polars import LazyFrame, Schema
 from tqdm import tqdm
 
 from polars_pipeline.exception import LazyFrameNotSupportedError
@@ -11,7 +11,7 @@ from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
 from polars_pipeline.utils import numerical_columns
 
-from .utils import log_figure
+from .utils import check_columns, log_figure
 
 
 class HistPlot(Transformer):
@@ -78,13 +78,15 @@ class HistPlot(Transformer):
             ax.set_title(title)
 
             log_figure(fig, title, log_dir)
-            fig.clear()
-            plt.close(fig)
 
     def transform(self, X: FrameType) -> FrameType:
         self.log_figures(X)
         return X
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.num_set, self.hue)
+        return schema
+
 
 class KDEPlot(Transformer):
     def __init__(
@@ -142,9 +144,11 @@ class KDEPlot(Transformer):
             ax.set_title(title)
 
             log_figure(fig, title, log_dir)
-            fig.clear()
-            plt.close(fig)
 
     def transform(self, X: FrameType) -> FrameType:
         self.log_figures(X)
         return X
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.num_set, self.hue)
+        return schema
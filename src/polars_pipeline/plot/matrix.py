@@ -6,7 +6,7 @@ import seaborn as sns
 from matplotlib import pyplot as plt
 from matplotlib.colors import Colormap
 from matplotlib.typing import ColorType
-from polars import LazyFrame
+from polars import LazyFrame, Schema
 from tqdm import tqdm
 
 from polars_pipeline.exception import LazyFrameNotSupportedError
@@ -14,7 +14,7 @@ from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
 from polars_pipeline.utils import categorical_columns, numerical_columns
 
-from .utils import log_figure
+from .utils import check_columns, log_figure
 
 
 class CorrelationHeatmap(Transformer):
@@ -62,13 +62,14 @@ class CorrelationHeatmap(Transformer):
         ax.set_title(title)
 
         log_figure(fig, title, log_dir)
-        fig.clear()
-        plt.close(fig)
 
     def transform(self, X: FrameType) -> FrameType:
         self.log_figures(X)
         return X
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return schema
+
 
 class CountHeatmap(Transformer):
     def __init__(
@@ -144,8 +145,6 @@ class CountHeatmap(Transformer):
                 ax.set_xlabel(cat2)
 
                 log_figure(fig, title, log_dir)
-                fig.clear()
-                plt.close(fig)
 
                 pbar.update()
 
@@ -154,3 +153,7 @@ class CountHeatmap(Transformer):
     def transform(self, X: FrameType) -> FrameType:
         self.log_figures(X)
         return X
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.cat_set)
+        return schema
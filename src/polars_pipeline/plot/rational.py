@@ -1,19 +1,26 @@
-from typing import Iterable, Tuple
-
+import os
+import pickle
+import uuid
+from copy import deepcopy
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Tuple
+
+import numpy as np
 import polars as pl
 import seaborn as sns
-import umap
-import umap.plot
 from matplotlib import pyplot as plt
-from polars import LazyFrame
+from polars import DataFrame, LazyFrame, Schema
 from tqdm import tqdm
 
 from polars_pipeline.exception import LazyFrameNotSupportedError
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
-from polars_pipeline.utils import categorical_columns, numerical_columns
+from polars_pipeline.utils import categorical_columns, fingerprint, numerical_columns
+
+from .utils import check_columns, log_figure
 
-from .utils import log_figure
+if TYPE_CHECKING:
+    import umap
 
 
 class ScatterPlot(Transformer):
@@ -73,8 +80,6 @@ class ScatterPlot(Transformer):
                 ax.set_title(title)
 
                 log_figure(fig, title, log_dir)
-                fig.clear()
-                plt.close(fig)
 
                 pbar.update()
 
@@ -84,6 +89,10 @@ class ScatterPlot(Transformer):
         self.log_figures(X)
         return X
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.num_set, self.hue, self.size, self.style)
+        return schema
+
 
 class KDE2dPlot(Transformer):
     def __init__(
@@ -128,8 +137,6 @@ class KDE2dPlot(Transformer):
                 ax.set_title(title)
 
                 log_figure(fig, title, log_dir)
-                fig.clear()
-                plt.close(fig)
 
                 pbar.update()
 
@@ -139,17 +146,108 @@ class KDE2dPlot(Transformer):
         self.log_figures(X)
         return X
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.num_set, self.hue)
+        return schema
+
 
 class UMAPPlot(Transformer):
     def __init__(
         self,
         preprocess: Transformer | None = None,
         *,
+        sample_size: int | None = None,
+        stratify: str | None = None,
+        batch_size: int = 10000,
+        cache_dir: Path | str | None = None,
+        seed: int = 42,
+        umap_kwargs: Dict[str, Any] | None = None,
         figsize: Tuple[int, int] = (10, 10),
     ):
         self.preprocess = preprocess
+        self.sample_size = sample_size
+        self.stratify = stratify
+        self.batch_size = batch_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.seed = seed
+        self.umap_kwargs = umap_kwargs or {}
         self.figsize = figsize
 
+        # Taken before any fitting so that fitted state never leaks into the key.
+        # Parameters that cannot be fingerprinted disable the cache.
+        try:
+            self.params_fingerprint: str | None = fingerprint(
+                preprocess, sample_size, stratify, seed, self.umap_kwargs
+            )
+        except TypeError:
+            self.params_fingerprint = None
+
+    def sample_indices(self, X: DataFrame) -> np.ndarray:
+        n_rows = len(X)
+        if self.sample_size is None or self.sample_size >= n_rows:
+            return np.arange(n_rows)
+
+        rng = np.random.default_rng(self.seed)
+        if self.stratify is None:
+            return np.sort(rng.choice(n_rows, self.sample_size, replace=False))
+
+        fraction = self.sample_size / n_rows
+        index_name = str(uuid.uuid4())
+        groups = (
+            X.select(self.stratify)
+            .with_row_index(index_name)
+            .group_by(self.stratify, maintain_order=True)
+            .agg(pl.col(index_name))
+            .get_column(index_name)
+        )
+        indices = [
+            rng.choice(group, max(1, round(len(group) * fraction)), replace=False)
+            for group in groups.to_list()
+        ]
+        return np.sort(np.concatenate(indices))
+
+    def embed(self, X: DataFrame) -> Tuple["umap.UMAP", np.ndarray]:
+        import umap
+
+        cache_path = None
+        if self.cache_dir and self.params_fingerprint:
+            key = fingerprint(X, self.params_fingerprint)
+            cache_path = self.cache_dir / f"umap_{key}.pkl"
+            if cache_path.exists():
+                with open(cache_path, "rb") as f:
+                    return pickle.load(f)
+
+        sample_idx = self.sample_indices(X)
+        X_sample = X[sample_idx]
+        if self.preprocess:
+            # Fitted per call on a copy, so concurrent callers do not share its state
+            preprocess = deepcopy(self.preprocess)
+            preprocess.fit(X_sample)
+            X_pre = preprocess.transform(X).to_numpy()
+        else:
+            X_pre = X.to_numpy()
+
+        reducer = umap.UMAP(verbose=True, **self.umap_kwargs)
+        reducer.fit(X_pre[sample_idx])
+
+        embedding = np.empty((len(X), reducer.embedding_.shape[1]))
+        embedding[sample_idx] = reducer.embedding_
+        rest_mask = np.ones(len(X), dtype=bool)
+        rest_mask[sample_idx] = False
+        rest_idx = np.flatnonzero(rest_mask)
+        for start in range(0, len(rest_idx), self.batch_size):
+            batch_idx = rest_idx[start : start + self.batch_size]
+            embedding[batch_idx] = reducer.transform(X_pre[batch_idx])
+
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{uuid.uuid4()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((reducer, embedding), f)
+            os.replace(tmp_path, cache_path)
+
+        return reducer, embedding
+
     def log_figures(self, X: FrameType, y: FrameType | None = None):
         log_dir = self.log_dir
         if log_dir is None:
@@ -163,33 +261,38 @@ class UMAPPlot(Transformer):
                 self.__class__.__name__, self.log_figures.__name__
             )
 
-        X_pre = self.preprocess.fit_transform(X) if self.preprocess else X
+        import umap.plot
 
-        reducer = umap.UMAP(verbose=True)
-        reducer.fit(X_pre)
+        reducer, embedding = self.embed(X)
 
         ax = umap.plot.connectivity(
             reducer, show_points=True, edge_cmap="viridis", theme="viridis"
         )
         if ax.figure:
             log_figure(ax.figure, "connectivity", log_dir)
-            ax.figure.clear()
-            plt.close(ax.figure)
 
         cat_set = set(categorical_columns(X))
 
         zero_pad = len(str(len(X.columns)))
         for i, col in enumerate(tqdm(X.columns, desc="UMAP Plot")):
             if col in cat_set:
-                ax = umap.plot.points(reducer, labels=X[col], theme="viridis")
+                ax = umap.plot.points(
+                    reducer, points=embedding, labels=X[col], theme="viridis"
+                )
             else:
-                ax = umap.plot.points(reducer, values=X[col], theme="viridis")
+                ax = umap.plot.points(
+                    reducer, points=embedding, values=X[col], theme="viridis"
+                )
 
             if ax.figure:
                 log_figure(ax.figure, f"{i:0>{zero_pad}}_{col}", log_dir)
-                ax.figure.clear()
-                plt.close(ax.figure)
 
     def transform(self, X: FrameType) -> FrameType:
         self.log_figures(X)
         return X
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_columns(schema, self.stratify)
+        if self.preprocess:
+            self.preprocess.output_schema(schema)
+        return schema
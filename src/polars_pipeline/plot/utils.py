@@ -1,9 +1,27 @@
 from pathlib import Path
+from typing import Iterable
 
+import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
+from polars import Schema
+
+from polars_pipeline.utils import select_columns
+from polars_pipeline.writer import get_writer
 
 
 def log_figure(fig: Figure, caption: str, log_dir: Path):
-    log_dir.mkdir(parents=True, exist_ok=True)
+    # The figure is handed over to the writer: it is detached from pyplot here and
+    # encoded, written and cleared on a writer thread
+    plt.close(fig)
     fig_path = log_dir / f"{caption.replace(" ", "_")}.png"
-    fig.savefig(fig_path)
+    get_writer().write_figure(fig, fig_path)
+
+
+def check_columns(schema: Schema, *columns: str | Iterable[str] | None):
+    names = []
+    for col in columns:
+        if isinstance(col, str):
+            names.append(col)
+        elif col is not None:
+            names.extend(col)
+    select_columns(schema, *names)
@@ -1,20 +1,74 @@
-from typing import Sequence
+from copy import copy
+from typing import Sequence, Set
 
+import numpy as np
 import polars as pl
+from polars import Expr, Schema
+from polars._typing import ColumnNameOrSelector
 
-from polars_pipeline.transformer import Transformer
+from polars_pipeline.compiled import Batch, CompiledFn
+from polars_pipeline.functional import WithColumns
+from polars_pipeline.transformer import Transformer, lazy_output_schema
 from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import select_columns
 
 
 class Binarizer(Transformer):
     def __init__(
-        self, columns: str | Sequence[str] | None = None, *, threshold: float = 0.5
+        self,
+        columns: ColumnNameOrSelector | Sequence[ColumnNameOrSelector] | None = None,
+        *,
+        threshold: float = 0.5,
     ):
-        self.columns = [columns] if isinstance(columns, str) else columns
+        self.columns = [columns] if isinstance(columns, (str, Expr)) else columns
         self.threshold = threshold
 
     def transform(self, X: FrameType) -> FrameType:
-        columns = self.columns or X.columns
+        columns = (
+            select_columns(X, *self.columns)
+            if self.columns
+            else X.collect_schema().names()
+        )
         return X.with_columns(
             [pl.col(col).gt(self.threshold).cast(pl.Int32) for col in columns]
         )
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        if not self.columns:
+            return self
+
+        kept = [
+            col for col in self.columns if not isinstance(col, str) or col in columns
+        ]
+        # An empty column list would mean every column
+        if not kept:
+            return WithColumns()
+
+        pruned = copy(self)
+        pruned.columns = kept
+        return pruned
+
+    def compile(self) -> CompiledFn:
+        if self.columns and not all(isinstance(col, str) for col in self.columns):
+            return super().compile()
+
+        threshold = self.threshold
+        columns = self.columns
+
+        def fn(batch: Batch) -> Batch:
+            batch = dict(batch)
+            for col in columns or list(batch):
+                values = batch[col]
+                binary = (values > threshold).astype(np.int32)
+                if values.dtype.kind == "f" and np.isnan(values).any():
+                    binary = np.where(np.isnan(values), np.nan, binary)
+                batch[col] = binary
+            return batch
+
+        return fn
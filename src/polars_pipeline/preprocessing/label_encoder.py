@@ -1,22 +1,27 @@
-from typing import Dict, Sequence
+import uuid
+from copy import copy
+from typing import Dict, Self, Sequence, Set
 
+import numpy as np
 import polars as pl
-from polars import DataFrame, LazyFrame
+from polars import DataFrame, Expr, LazyFrame, Schema, Series
+from polars._typing import ColumnNameOrSelector
 
+from polars_pipeline.compiled import Batch, CompiledFn
 from polars_pipeline.exception import LazyFrameNotSupportedError
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
-from polars_pipeline.utils import categorical_columns
+from polars_pipeline.utils import categorical_columns, select_columns
 
 
 class LabelEncoder(Transformer):
     def __init__(
         self,
-        columns: str | Sequence[str] | None = None,
+        columns: ColumnNameOrSelector | Sequence[ColumnNameOrSelector] | None = None,
         *,
         maintain_order: bool = False,
     ):
-        self.columns = [columns] if isinstance(columns, str) else columns
+        self.columns = [columns] if isinstance(columns, (str, Expr)) else columns
         self.maintain_order = maintain_order
 
         self.mappings: Dict[str, DataFrame] = {}
@@ -25,14 +30,52 @@ class LabelEncoder(Transformer):
         if isinstance(X, LazyFrame):
             raise LazyFrameNotSupportedError(self.__class__.__name__, self.fit.__name__)
 
+        self.reset()
+        self.partial_fit(X)
+
+    def reset(self):
         self.mappings.clear()
-        x = X.select(self.columns or categorical_columns(X))
-        for col in x.columns:
-            mapping = x.select(col).unique(maintain_order=self.maintain_order)
-            mapping = mapping.with_columns(
-                pl.arange(0, len(mapping), dtype=pl.Int32).alias("label")
+
+    def partial_fit(self, X: FrameType, y: FrameType | None = None):
+        if isinstance(X, LazyFrame):
+            raise LazyFrameNotSupportedError(
+                self.__class__.__name__, self.partial_fit.__name__
+            )
+
+        columns = (
+            select_columns(X, *self.columns) if self.columns else categorical_columns(X)
+        )
+        for col in columns:
+            values = X.get_column(col).unique(maintain_order=self.maintain_order)
+            self.update(col, values)
+
+    def merge(self, other: "LabelEncoder") -> Self:
+        for col, mapping in other.mappings.items():
+            self.update(col, mapping.get_column(col))
+        return self
+
+    def update(self, col: str, values: Series):
+        # Known categories keep their labels; unseen ones are appended in order
+        new = values.to_frame(col)
+        offset = 0
+        if (mapping := self.mappings.get(col)) is not None:
+            index_name = str(uuid.uuid4())
+            new = (
+                new.with_row_index(index_name)
+                .join(mapping.select(col), on=col, how="anti")
+                .sort(index_name)
+                .drop(index_name)
             )
-            self.mappings[col] = mapping
+            if mapping.get_column(col).null_count() > 0:
+                new = new.drop_nulls()
+            offset = len(mapping)
+
+        new = new.with_columns(
+            pl.arange(offset, offset + len(new), dtype=pl.Int32).alias("label")
+        )
+        if col in self.mappings:
+            new = pl.concat([self.mappings[col], new], how="vertical")
+        self.mappings[col] = new
 
     def transform(self, X: FrameType) -> FrameType:
         for col, mapping in self.mappings.items():
@@ -43,3 +86,55 @@ class LabelEncoder(Transformer):
             X = X.drop(col).rename({"label": col})
 
         return X
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        pruned = copy(self)
+        pruned.mappings = {
+            col: mapping for col, mapping in self.mappings.items() if col in columns
+        }
+        return pruned
+
+    def compile(self) -> CompiledFn:
+        lookups = {
+            col: dict(zip(mapping.get_column(col), mapping.get_column("label")))
+            for col, mapping in self.mappings.items()
+        }
+
+        def fn(batch: Batch) -> Batch:
+            batch = dict(batch)
+            for col, lookup in lookups.items():
+                values = batch.pop(col).tolist()
+                values = [None if v != v else v for v in values]
+                # Unknown categories become NaN, the null of a float batch column, so
+                # the numpy stages downstream can still run on them
+                labels = [lookup.get(v) for v in values]
+                if None in labels:
+                    batch[col] = np.array(
+                        [np.nan if label is None else label for label in labels],
+                        dtype=np.float64,
+                    )
+                else:
+                    batch[col] = np.array(labels, dtype=np.int32)
+            return batch
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        if self.mappings:
+            columns = list(self.mappings)
+        elif self.columns:
+            columns = select_columns(schema, *self.columns)
+        else:
+            columns = categorical_columns(schema)
+
+        output = Schema(schema)
+        for col in columns:
+            if col not in output:
+                raise pl.exceptions.ColumnNotFoundError(col)
+            # The encoded column is appended after the join, so it moves to the end
+            del output[col]
+            output[col] = pl.Int32
+        return output
@@ -1,12 +1,15 @@
 import math
-from typing import Dict, Sequence
+from copy import copy
+from typing import Dict, Self, Sequence, Set
 
 import polars as pl
-from polars import LazyFrame
+from polars import LazyFrame, Schema
 
+from polars_pipeline.compiled import Batch, CompiledFn
 from polars_pipeline.exception import LazyFrameNotSupportedError
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import check_numeric_columns
 
 
 class MinMaxScaler(Transformer):
@@ -21,18 +24,43 @@ class MinMaxScaler(Transformer):
         if isinstance(X, LazyFrame):
             raise LazyFrameNotSupportedError(self.__class__.__name__, self.fit.__name__)
 
+        self.reset()
+        self.partial_fit(X)
+        self.check_fitted()
+
+    def reset(self):
         self.max_values.clear()
         self.min_values.clear()
         self.diff_values.clear()
 
+    def check_fitted(self):
         for col in self.columns:
-            self.max_values[col] = float(X.select(col).max().row(0)[0])
-            self.min_values[col] = float(X.select(col).min().row(0)[0])
-            self.diff_values[col] = self.max_values[col] - self.min_values[col]
-
             if math.isclose(self.diff_values[col], 0.0):
                 raise ZeroDivisionError(f"Columns have zero diff: {col}")
 
+    def partial_fit(self, X: FrameType, y: FrameType | None = None):
+        if isinstance(X, LazyFrame):
+            raise LazyFrameNotSupportedError(
+                self.__class__.__name__, self.partial_fit.__name__
+            )
+
+        for col in self.columns:
+            max_value, min_value = X.select(
+                pl.col(col).max().alias("max"), pl.col(col).min().alias("min")
+            ).row(0)
+            if max_value is not None:
+                self.update(col, float(max_value), float(min_value))
+
+    def merge(self, other: "MinMaxScaler") -> Self:
+        for col, max_value in other.max_values.items():
+            self.update(col, max_value, other.min_values[col])
+        return self
+
+    def update(self, col: str, max_value: float, min_value: float):
+        self.max_values[col] = max(self.max_values.get(col, max_value), max_value)
+        self.min_values[col] = min(self.min_values.get(col, min_value), min_value)
+        self.diff_values[col] = self.max_values[col] - self.min_values[col]
+
     def transform(self, X: FrameType) -> FrameType:
         for col in self.columns:
             X = X.with_columns(
@@ -40,3 +68,32 @@ class MinMaxScaler(Transformer):
             )
 
         return X
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        pruned = copy(self)
+        pruned.columns = [col for col in self.columns if col in columns]
+        return pruned
+
+    def compile(self) -> CompiledFn:
+        params = [
+            (col, self.min_values[col], self.diff_values[col]) for col in self.columns
+        ]
+
+        def fn(batch: Batch) -> Batch:
+            batch = dict(batch)
+            for col, center, scale in params:
+                batch[col] = (batch[col] - center) / scale
+            return batch
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_numeric_columns(self.__class__.__name__, schema, self.columns)
+        return (
+            LazyFrame(schema=schema)
+            .with_columns((pl.col(col) - 0.0) / 1.0 for col in self.columns)
+            .collect_schema()
+        )
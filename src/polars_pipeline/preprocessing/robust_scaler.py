@@ -1,12 +1,17 @@
 import math
-from typing import Dict, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from typing import Dict, Self, Sequence, Set, Tuple
 
 import polars as pl
-from polars import LazyFrame
+from polars import LazyFrame, Schema
 
+from polars_pipeline.compiled import Batch, CompiledFn
 from polars_pipeline.exception import LazyFrameNotSupportedError
+from polars_pipeline.sketch import QuantileSketch
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import check_numeric_columns, iter_batches
 
 
 class RobustScaler(Transformer):
@@ -15,38 +20,102 @@ class RobustScaler(Transformer):
         columns: str | Sequence[str],
         *,
         quantile_range: Tuple[float, float] = (0.25, 0.75),
+        approx: bool = False,
+        rank_error: float = 0.01,
+        batch_size: int = 1_000_000,
+        n_jobs: int | None = None,
     ):
         q1, q3 = quantile_range
         if q1 >= q3:
             raise ValueError(
                 f"quantile_range must be in increasing order: {quantile_range}"
             )
+        if not 0.0 < rank_error < 1.0:
+            raise ValueError(f"rank_error must be in (0, 1): {rank_error}")
 
         self.columns = [columns] if isinstance(columns, str) else columns
         self.q1 = q1
         self.q3 = q3
+        self.approx = approx
+        self.rank_error = rank_error
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+
+        # The KLL rank error is about 1.65 / k
+        self.sketch_size = max(math.ceil(1.65 / rank_error), 2)
 
         self.median_values: Dict[str, float] = {}
         self.iqr_values: Dict[str, float] = {}
+        self.sketches: Dict[str, QuantileSketch] = {}
 
     def fit(self, X: FrameType, y: FrameType | None = None):
-        if isinstance(X, LazyFrame):
+        if isinstance(X, LazyFrame) and not self.approx:
             raise LazyFrameNotSupportedError(self.__class__.__name__, self.fit.__name__)
 
+        self.reset()
+        if self.approx:
+            self.partial_fit(X)
+        else:
+            for col in self.columns:
+                self.median_values[col] = float(X.select(col).median().row(0)[0])
+                self.iqr_values[col] = float(
+                    X.select(
+                        pl.col(col).quantile(self.q3) - pl.col(col).quantile(self.q1)
+                    ).row(0)[0]
+                )
+
+        self.check_fitted()
+
+    def reset(self):
         self.median_values.clear()
         self.iqr_values.clear()
+        self.sketches.clear()
 
+    def check_fitted(self):
         for col in self.columns:
-            self.median_values[col] = float(X.select(col).median().row(0)[0])
-            self.iqr_values[col] = float(
-                X.select(
-                    pl.col(col).quantile(self.q3) - pl.col(col).quantile(self.q1)
-                ).row(0)[0]
-            )
-
             if math.isclose(self.iqr_values[col], 0.0):
                 raise ZeroDivisionError(f"Columns have zero iqr: {col}")
 
+    def partial_fit(self, X: FrameType, y: FrameType | None = None):
+        if self.median_values and not self.sketches:
+            raise ValueError(
+                "RobustScaler fitted with exact quantiles cannot be updated with "
+                "partial_fit; fit it with partial_fit from the start"
+            )
+
+        # Columns are sketched independently; the sorts inside the sketch and the
+        # Polars scans both release the GIL.
+        with ThreadPoolExecutor(self.n_jobs) as executor:
+            sketches = list(
+                executor.map(lambda col: self.sketch_column(X, col), self.columns)
+            )
+
+        for col, sketch in zip(self.columns, sketches):
+            self.sketches.setdefault(col, QuantileSketch(self.sketch_size)).merge(
+                sketch
+            )
+            self.update(col)
+
+    def sketch_column(self, X: FrameType, col: str) -> QuantileSketch:
+        sketch = QuantileSketch(self.sketch_size)
+        column = X.select(pl.col(col).drop_nulls().cast(pl.Float64))
+        for batch in iter_batches(column, self.batch_size):
+            sketch.update(batch.to_series().to_numpy())
+        return sketch
+
+    def merge(self, other: "RobustScaler") -> Self:
+        for col, sketch in other.sketches.items():
+            self.sketches.setdefault(col, QuantileSketch(self.sketch_size)).merge(
+                sketch
+            )
+            self.update(col)
+        return self
+
+    def update(self, col: str):
+        q1, median, q3 = self.sketches[col].quantiles([self.q1, 0.5, self.q3])
+        self.median_values[col] = median
+        self.iqr_values[col] = q3 - q1
+
     def transform(self, X: FrameType) -> FrameType:
         for col in self.columns:
             X = X.with_columns(
@@ -54,3 +123,32 @@ class RobustScaler(Transformer):
             )
 
         return X
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        pruned = copy(self)
+        pruned.columns = [col for col in self.columns if col in columns]
+        return pruned
+
+    def compile(self) -> CompiledFn:
+        params = [
+            (col, self.median_values[col], self.iqr_values[col]) for col in self.columns
+        ]
+
+        def fn(batch: Batch) -> Batch:
+            batch = dict(batch)
+            for col, center, scale in params:
+                batch[col] = (batch[col] - center) / scale
+            return batch
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_numeric_columns(self.__class__.__name__, schema, self.columns)
+        return (
+            LazyFrame(schema=schema)
+            .with_columns((pl.col(col) - 0.0) / 1.0 for col in self.columns)
+            .collect_schema()
+        )
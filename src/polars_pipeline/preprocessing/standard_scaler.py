@@ -1,35 +1,81 @@
 import math
-from typing import Dict, Sequence
+from copy import copy
+from typing import Dict, Self, Sequence, Set
 
 import polars as pl
-from polars import LazyFrame
+from polars import LazyFrame, Schema
 
+from polars_pipeline.compiled import Batch, CompiledFn
 from polars_pipeline.exception import LazyFrameNotSupportedError
 from polars_pipeline.transformer import Transformer
 from polars_pipeline.typing import FrameType
+from polars_pipeline.utils import check_numeric_columns
 
 
 class StandardScaler(Transformer):
     def __init__(self, columns: str | Sequence[str]):
         self.columns = [columns] if isinstance(columns, str) else columns
 
+        self.counts: Dict[str, int] = {}
         self.mean_values: Dict[str, float] = {}
+        self.m2_values: Dict[str, float] = {}
         self.std_values: Dict[str, float] = {}
 
     def fit(self, X: FrameType, y: FrameType | None = None):
         if isinstance(X, LazyFrame):
             raise LazyFrameNotSupportedError(self.__class__.__name__, self.fit.__name__)
 
+        self.reset()
+        self.partial_fit(X)
+        self.check_fitted()
+
+    def reset(self):
+        self.counts.clear()
         self.mean_values.clear()
+        self.m2_values.clear()
         self.std_values.clear()
 
+    def check_fitted(self):
         for col in self.columns:
-            self.mean_values[col] = float(X.select(col).mean().row(0)[0])
-            self.std_values[col] = float(X.select(col).std().row(0)[0])
-
             if math.isclose(self.std_values[col], 0.0):
                 raise ZeroDivisionError(f"Columns have zero diff: {col}")
 
+    def partial_fit(self, X: FrameType, y: FrameType | None = None):
+        if isinstance(X, LazyFrame):
+            raise LazyFrameNotSupportedError(
+                self.__class__.__name__, self.partial_fit.__name__
+            )
+
+        for col in self.columns:
+            count, mean, var = X.select(
+                pl.col(col).count().alias("count"),
+                pl.col(col).mean().alias("mean"),
+                pl.col(col).var().alias("var"),
+            ).row(0)
+            self.update(col, count, mean or 0.0, (var or 0.0) * max(count - 1, 0))
+
+    def merge(self, other: "StandardScaler") -> Self:
+        for col, count in other.counts.items():
+            self.update(col, count, other.mean_values[col], other.m2_values[col])
+        return self
+
+    def update(self, col: str, count: int, mean: float, m2: float):
+        # Chan et al. pairwise update of the mean and the sum of squared deviations
+        prev_count = self.counts.get(col, 0)
+        if prev_count == 0:
+            total, new_mean, new_m2 = count, mean, m2
+        else:
+            prev_mean = self.mean_values[col]
+            total = prev_count + count
+            delta = mean - prev_mean
+            new_mean = prev_mean + delta * count / total
+            new_m2 = self.m2_values[col] + m2 + delta**2 * prev_count * count / total
+
+        self.counts[col] = total
+        self.mean_values[col] = new_mean
+        self.m2_values[col] = new_m2
+        self.std_values[col] = math.sqrt(new_m2 / (total - 1)) if total > 1 else 0.0
+
     def transform(self, X: FrameType) -> FrameType:
         for col in self.columns:
             X = X.with_columns(
@@ -37,3 +83,32 @@ class StandardScaler(Transformer):
             )
 
         return X
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        return set(columns)
+
+    def prune(self, schema: Schema, columns: Set[str]) -> Transformer:
+        pruned = copy(self)
+        pruned.columns = [col for col in self.columns if col in columns]
+        return pruned
+
+    def compile(self) -> CompiledFn:
+        params = [
+            (col, self.mean_values[col], self.std_values[col]) for col in self.columns
+        ]
+
+        def fn(batch: Batch) -> Batch:
+            batch = dict(batch)
+            for col, center, scale in params:
+                batch[col] = (batch[col] - center) / scale
+            return batch
+
+        return fn
+
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        check_numeric_columns(self.__class__.__name__, schema, self.columns)
+        return (
+            LazyFrame(schema=schema)
+            .with_columns((pl.col(col) - 0.0) / 1.0 for col in self.columns)
+            .collect_schema()
+        )
@@ -0,0 +1,182 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Deque, Dict, List, Tuple
+
+import polars as pl
+from polars import DataFrame
+
+from polars_pipeline.transformer import Transformer
+
+Request = Tuple[DataFrame, "asyncio.Future[DataFrame]", float]
+
+
+class ScorerMetrics:
+    def __init__(self, window: int = 1000):
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes: Deque[int] = deque(maxlen=window)
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.transform_times: Deque[float] = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        def percentile(values: Deque[float], q: int) -> float:
+            if len(values) < 2:
+                return values[0] if values else 0.0
+            return statistics.quantiles(values, n=100)[q - 1]
+
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": (
+                statistics.mean(self.batch_sizes) if self.batch_sizes else 0.0
+            ),
+            "latency_p50_ms": percentile(self.latencies, 50),
+            "latency_p99_ms": percentile(self.latencies, 99),
+            "transform_p50_ms": percentile(self.transform_times, 50),
+        }
+
+
+class AsyncScorer:
+    def __init__(
+        self,
+        pipeline: Transformer,
+        *,
+        max_batch_size: int = 256,
+        max_wait: float = 0.005,
+        max_queue_size: int = 1024,
+        executor: Executor | None = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive: {max_batch_size}")
+
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue_size = max_queue_size
+        self.executor = executor
+        self.metrics = ScorerMetrics()
+        self.queue: asyncio.Queue[Request] | None = None
+        self.worker: asyncio.Task | None = None
+        self.batch: List[Request] = []
+
+    async def start(self):
+        if self.worker is None:
+            self.queue = asyncio.Queue(self.max_queue_size)
+            self.worker = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+
+        # Requests in the interrupted batch or still queued will never be served
+        while self.queue is not None and not self.queue.empty():
+            self.batch.append(self.queue.get_nowait())
+        for _, future, _ in self.batch:
+            if not future.done():
+                future.set_exception(RuntimeError("AsyncScorer is closed"))
+        self.batch = []
+
+    async def __aenter__(self) -> "AsyncScorer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def score(self, X: DataFrame) -> DataFrame:
+        if self.queue is None or self.worker is None:
+            raise RuntimeError("AsyncScorer is not started")
+
+        future: asyncio.Future[DataFrame] = asyncio.get_running_loop().create_future()
+        # Blocks the caller while the queue is full, so load is pushed back upstream
+        await self.queue.put((X, future, time.perf_counter()))
+        return await future
+
+    def queue_size(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.metrics.snapshot(), "queue_size": self.queue_size()}
+
+    async def next_batch(self) -> List[Request]:
+        assert self.queue is not None
+
+        batch = self.batch = [await self.queue.get()]
+        rows = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_size:
+            if self.queue.empty():
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self.queue.get(), timeout)
+                except TimeoutError:
+                    break
+            else:
+                request = self.queue.get_nowait()
+
+            batch.append(request)
+            rows += len(request[0])
+
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self.next_batch()
+            # Requests are concatenated per schema, so a request that does not match
+            # the others is scored, and fails, on its own
+            groups: Dict[Tuple[Any, ...], List[Request]] = {}
+            for request in batch:
+                groups.setdefault(tuple(request[0].schema.items()), []).append(request)
+            for group in groups.values():
+                await self.score_batch(group)
+
+    async def score_batch(self, batch: List[Request]):
+        loop = asyncio.get_running_loop()
+        frames = [X for X, _, _ in batch]
+        heights = [len(X) for X in frames]
+
+        start = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(
+                self.executor,
+                self.pipeline.transform,
+                pl.concat(frames, how="vertical"),
+            )
+            if len(result) != sum(heights):
+                raise ValueError(
+                    f"transform returned {len(result)} rows for {sum(heights)}"
+                )
+        except Exception as e:
+            self.metrics.errors += len(batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        end = time.perf_counter()
+        self.metrics.batches += 1
+        self.metrics.requests += len(batch)
+        self.metrics.rows += sum(heights)
+        self.metrics.batch_sizes.append(sum(heights))
+        self.metrics.transform_times.append((end - start) * 1000)
+
+        offset = 0
+        for (_, future, enqueued), height in zip(batch, heights):
+            if not future.done():
+                future.set_result(result.slice(offset, height))
+            self.metrics.latencies.append((end - enqueued) * 1000)
+            offset += height
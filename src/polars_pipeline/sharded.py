@@ -0,0 +1,165 @@
+import glob
+import io
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Deque, Iterator, List, Tuple
+
+import polars as pl
+from polars import DataFrame, LazyFrame
+
+from polars_pipeline.transformer import Transformer
+from polars_pipeline.typing import FrameType, Source
+from polars_pipeline.utils import iter_batches, scan_source
+
+# A shard is either a frame in a shared memory block or a file a worker reads itself
+Block = Tuple[str, int]
+Shard = Block | str
+
+_worker_pipeline: Transformer | None = None
+
+
+def write_block(frame: DataFrame) -> Block:
+    buffer = io.BytesIO()
+    frame.write_ipc(buffer, compression="uncompressed")
+    size = buffer.tell()
+
+    shm = SharedMemory(create=True, size=size)
+    shm.buf[:size] = buffer.getbuffer()[:size]
+    shm.close()
+    return shm.name, size
+
+
+def read_block(block: Block) -> DataFrame:
+    name, size = block
+    # Workers share the resource tracker of the parent, so attaching does not make a
+    # block owned by the attaching process
+    shm = SharedMemory(name)
+    try:
+        with shm.buf[:size] as view:
+            return pl.read_ipc(io.BytesIO(view))
+    finally:
+        shm.close()
+
+
+def unlink_block(block: Block):
+    shm = SharedMemory(block[0])
+    shm.close()
+    shm.unlink()
+
+
+def init_worker(pipeline: Transformer):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def transform_shard(shard: Shard) -> Block:
+    assert _worker_pipeline is not None
+
+    X = read_block(shard) if isinstance(shard, tuple) else scan_source(shard)
+    out = _worker_pipeline.transform(X)
+    if isinstance(out, LazyFrame):
+        out = out.collect()
+    return write_block(out)
+
+
+class ShardedExecutor:
+    # Runs a fitted pipeline on shards of the input in a pool of worker processes,
+    # each of which unpickles the pipeline once. Frames are passed through shared
+    # memory as Arrow IPC, and results are yielded in input order.
+    def __init__(
+        self,
+        pipeline: Transformer,
+        *,
+        n_workers: int | None = None,
+        shard_size: int = 100_000,
+        max_pending: int | None = None,
+    ):
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be positive: {shard_size}")
+
+        self.pipeline = pipeline
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.shard_size = shard_size
+        self.max_pending = max_pending or 2 * self.n_workers
+        self.executor: ProcessPoolExecutor | None = None
+
+    def start(self):
+        if self.executor is None:
+            # Forking a process that runs polars threads can deadlock
+            self.executor = ProcessPoolExecutor(
+                self.n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(self.pipeline,),
+            )
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> "ShardedExecutor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def shards(self, X: FrameType | Source) -> Iterator[Shard]:
+        # Files matched by a glob pattern are shards as they are, anything else is
+        # split into row ranges
+        if isinstance(X, (str, Path)) and not Path(X).exists():
+            files = sorted(glob.glob(str(X)))
+            if not files:
+                raise FileNotFoundError(X)
+            yield from files
+            return
+
+        for batch in iter_batches(scan_source(X), self.shard_size, maintain_order=True):
+            yield write_block(batch)
+
+    def iter_transform(self, X: FrameType | Source) -> Iterator[DataFrame]:
+        self.start()
+        assert self.executor is not None
+
+        pending: Deque[Tuple[Shard, Future]] = deque()
+        try:
+            for shard in self.shards(X):
+                pending.append((shard, self.executor.submit(transform_shard, shard)))
+                if len(pending) >= self.max_pending:
+                    yield self.result(*pending.popleft())
+            while pending:
+                yield self.result(*pending.popleft())
+        finally:
+            for _, future in pending:
+                future.cancel()
+            wait([future for _, future in pending])
+            for shard, future in pending:
+                self.release(shard, future)
+
+    def transform(self, X: FrameType | Source) -> DataFrame:
+        frames: List[DataFrame] = list(self.iter_transform(X))
+        if not frames:
+            return DataFrame()
+        return pl.concat(frames, how="vertical")
+
+    def result(self, shard: Shard, future: Future) -> DataFrame:
+        try:
+            block = future.result()
+        finally:
+            if isinstance(shard, tuple):
+                unlink_block(shard)
+
+        try:
+            return read_block(block)
+        finally:
+            unlink_block(block)
+
+    def release(self, shard: Shard, future: Future):
+        if isinstance(shard, tuple):
+            unlink_block(shard)
+        if not future.cancelled() and future.exception() is None:
+            unlink_block(future.result())
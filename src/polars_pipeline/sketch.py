@@ -0,0 +1,114 @@
+import math
+from typing import List, Self, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class QuantileSketch:
+    # KLL-style sketch: level h holds items of weight 2**h, and a full level is
+    # sorted and every other item is promoted to the next level. Sketches built
+    # on disjoint data can be merged level by level.
+    def __init__(self, k: int = 200, *, seed: int | None = 0):
+        if k < 2:
+            raise ValueError(f"k must be at least 2: {k}")
+
+        self.k = k
+        self.count = 0
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(math.ceil(self.k * (2 / 3) ** depth), 2)
+
+    def update(self, values: ArrayLike):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+
+        # A large batch is sorted once and a strided sample goes straight to the
+        # level it would reach by repeated compaction, instead of being re-sorted
+        # at every level on the way up.
+        level = 0
+        while len(values) >> (level + 1) > self.k:
+            level += 1
+        if level > 0:
+            values = np.sort(values)
+            step = 2**level
+            n_full = len(values) - len(values) % step
+            offset = int(self.rng.integers(step))
+            while len(self.compactors) <= level:
+                self.compactors.append(np.empty(0))
+            self.compactors[level] = np.concatenate(
+                [self.compactors[level], values[:n_full][offset::step]]
+            )
+            values = values[n_full:]
+
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self.compress()
+
+    def merge(self, other: "QuantileSketch") -> Self:
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+
+        self.count += other.count
+        self.compress()
+        return self
+
+    def compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self.capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+
+                items = np.sort(items)
+                # An odd item stays behind so that the total weight is preserved
+                n_even = len(items) - len(items) % 2
+                offset = int(self.rng.integers(2))
+                self.compactors[level + 1] = np.concatenate(
+                    [self.compactors[level + 1], items[:n_even][offset::2]]
+                )
+                self.compactors[level] = items[n_even:]
+
+            level += 1
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        if self.count == 0:
+            return [math.nan for _ in qs]
+
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate(
+            [
+                np.full(len(items), 2**level)
+                for level, items in enumerate(self.compactors)
+            ]
+        )
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        cum_weights = np.cumsum(weights[order])
+
+        # Linear interpolation between ranks, as if every item were repeated by its
+        # weight; this is exact while nothing has been compacted.
+        results = []
+        for q in qs:
+            if not 0.0 <= q <= 1.0:
+                raise ValueError(f"quantile must be in [0, 1]: {q}")
+
+            rank = q * (cum_weights[-1] - 1)
+            lower = values[np.searchsorted(cum_weights, math.floor(rank) + 1)]
+            upper = values[np.searchsorted(cum_weights, math.ceil(rank) + 1)]
+            results.append(float(lower + (upper - lower) * (rank - math.floor(rank))))
+
+        return results
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
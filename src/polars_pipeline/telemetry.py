@@ -0,0 +1,101 @@
+import datetime
+import io
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List
+
+import polars as pl
+from polars import DataFrame, LazyFrame
+
+from polars_pipeline.memory import frame_size, peak_rss
+from polars_pipeline.transformer import Transformer
+from polars_pipeline.typing import FrameType
+from polars_pipeline.writer import get_writer
+
+TELEMETRY_DIR = "telemetry"
+
+TELEMETRY_SCHEMA = pl.Schema(
+    {
+        "run_id": pl.String,
+        "stage_index": pl.Int32,
+        "stage_name": pl.String,
+        "phase": pl.String,
+        "started_at": pl.Datetime("us"),
+        "duration_s": pl.Float64,
+        "rows_in": pl.Int64,
+        "rows_out": pl.Int64,
+        "columns_out": pl.Int64,
+        "bytes_in": pl.Int64,
+        "bytes_out": pl.Int64,
+        "peak_rss": pl.Int64,
+        "metrics": pl.List(pl.Struct({"name": pl.String, "value": pl.Float64})),
+    }
+)
+
+
+def frame_height(X: FrameType) -> int | None:
+    # A LazyFrame would have to be executed to know its height
+    return X.height if isinstance(X, DataFrame) else None
+
+
+def stage_metrics(transformer: Transformer) -> List[Dict[str, Any]]:
+    # Fold metrics of a Stacker, also when it is wrapped by a Predictor
+    while transformer is not None:
+        if isinstance(metrics := getattr(transformer, "metrics", None), dict):
+            return [
+                {"name": name, "value": statistics.mean(values)}
+                for name, values in metrics.items()
+                if values and all(isinstance(v, (int, float)) for v in values)
+            ]
+        transformer = getattr(transformer, "model", None)
+    return []
+
+
+class TelemetryRecorder:
+    def __init__(self, run_id: str, phase: str):
+        self.run_id = run_id
+        self.phase = phase
+        self.records: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        index: int,
+        transformer: Transformer,
+        started_at: datetime.datetime,
+        duration: float,
+        X_in: FrameType,
+        X_out: FrameType,
+    ):
+        metrics = stage_metrics(transformer) if self.phase == "fit_transform" else []
+        self.records.append(
+            {
+                "run_id": self.run_id,
+                "stage_index": index,
+                "stage_name": transformer.__class__.__name__,
+                "phase": self.phase,
+                "started_at": started_at,
+                "duration_s": duration,
+                "rows_in": frame_height(X_in),
+                "rows_out": frame_height(X_out),
+                "columns_out": len(X_out.collect_schema()),
+                "bytes_in": frame_size(X_in),
+                "bytes_out": frame_size(X_out),
+                "peak_rss": peak_rss(),
+                "metrics": metrics,
+            }
+        )
+
+    def write(self, log_dir: Path):
+        buffer = io.BytesIO()
+        DataFrame(self.records, schema=TELEMETRY_SCHEMA).write_parquet(buffer)
+        path = log_dir / TELEMETRY_DIR / f"{self.run_id}.parquet"
+        get_writer().write_bytes(path, buffer.getvalue())
+
+
+def load_telemetry(log_dir: Path | str) -> LazyFrame:
+    # Files written before a column was added read it as null
+    return pl.scan_parquet(
+        Path(log_dir) / TELEMETRY_DIR / "*.parquet",
+        schema=TELEMETRY_SCHEMA,
+        missing_columns="insert",
+    )
@@ -1,8 +1,56 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Iterator, Set
 
+from polars import DataFrame, LazyFrame, Schema
+
+from .compiled import CompiledFn, batch_to_frame, frame_to_batch
+from .exception import SchemaNotResolvableError
 from .typing import FrameType
 
+_log_scope: ContextVar[Path | None] = ContextVar("log_scope", default=None)
+_log_off: ContextVar[bool] = ContextVar("log_off", default=False)
+_schema_only: ContextVar[bool] = ContextVar("schema_only", default=False)
+
+
+@contextmanager
+def log_scope(log_dir: Path | None, *, off: bool = False) -> Iterator[None]:
+    # The log directory of a call lives in the context rather than on the stages,
+    # so a fitted pipeline can be shared by concurrent callers. An off scope stops
+    # logging even inside the scope of a logging parent.
+    if log_dir is None and not off:
+        yield
+        return
+
+    scope_token = _log_scope.set(log_dir)
+    off_token = _log_off.set(off)
+    try:
+        yield
+    finally:
+        _log_off.reset(off_token)
+        _log_scope.reset(scope_token)
+
+
+def current_log_dir() -> Path | None:
+    return _log_scope.get()
+
+
+@contextmanager
+def schema_only() -> Iterator[None]:
+    # Within it, the output schema of a stage is only resolved from its own
+    # output_schema, never by running a user transform on an empty frame
+    token = _schema_only.set(True)
+    try:
+        yield
+    finally:
+        _schema_only.reset(token)
+
+
+def lazy_output_schema(transformer: "Transformer", schema: Schema) -> Schema:
+    return transformer.transform(LazyFrame(schema=schema)).collect_schema()
+
 
 class Transformer(ABC):
     @abstractmethod
@@ -15,8 +63,39 @@ class Transformer(ABC):
         self.fit(X, y)
         return self.transform(X)
 
+    def output_schema(self, schema: Schema, y_schema: Schema | None = None) -> Schema:
+        if _schema_only.get():
+            raise SchemaNotResolvableError(
+                self.__class__.__name__, "the stage does not define output_schema"
+            )
+        return lazy_output_schema(self, schema)
+
+    def required_columns(self, schema: Schema, columns: Set[str]) -> Set[str] | None:
+        # Input columns needed to produce the given output columns; None means all
+        return None
+
+    def prune(self, schema: Schema, columns: Set[str]) -> "Transformer":
+        # A stage that only produces the given output columns
+        return self
+
+    def estimate_memory(self, X: DataFrame) -> int:
+        # Bytes the stage allocates when run on X; by default a copy of its input
+        return X.estimated_size()
+
+    def compile(self) -> CompiledFn:
+        # Stages without an array fast path go through a DataFrame round trip
+        def fn(batch):
+            return frame_to_batch(self.transform(batch_to_frame(batch)))
+
+        return fn
+
     @property
     def log_dir(self) -> Path | None:
+        if (log_dir := current_log_dir()) is not None:
+            return log_dir
+        if _log_off.get():
+            return None
+
         try:
             return self._log_dir
         except AttributeError:
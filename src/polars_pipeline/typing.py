@@ -1,5 +1,7 @@
+from pathlib import Path
 from typing import TypeVar
 
 from polars import DataFrame, LazyFrame
 
 FrameType = TypeVar("FrameType", DataFrame, LazyFrame)
+Source = str | Path
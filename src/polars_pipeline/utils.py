@@ -1,16 +1,183 @@
-from typing import Any, Dict, List
+import functools
+import hashlib
+import sysconfig
+from pathlib import Path
+from types import CodeType, FunctionType, MethodType, ModuleType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Set,
+    Tuple,
+)
 
+import numpy as np
 import polars as pl
+from polars import DataFrame, Expr, LazyFrame, Schema, Series
+from polars._typing import ColumnNameOrSelector, IntoExpr
+from polars.exceptions import ColumnNotFoundError
 
-from .typing import FrameType
+from .exception import InvalidDtypeError
+from .typing import FrameType, Source
 
+_COLUMNS_CACHE_SIZE = 1024
+# Functions of the standard library and installed packages are identified by name
+_LIBRARY_PATHS = tuple(
+    {
+        sysconfig.get_paths()[key]
+        for key in ("stdlib", "platstdlib", "purelib", "platlib")
+    }
+)
+_MAX_SLICE_RUNS = 16
+_columns_cache: Dict[Tuple[Any, ...], List[str]] = {}
 
-def numerical_columns(frame: FrameType) -> List[str]:
-    return frame.head(1).select(pl.col(pl.Float32, pl.Float64, pl.Decimal)).columns
+FILE_FORMATS: Dict[str, Literal["parquet", "ipc", "csv"]] = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".ipc": "ipc",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".csv": "csv",
+}
+SCANNERS: Dict[str, Callable[..., LazyFrame]] = {
+    "parquet": pl.scan_parquet,
+    "ipc": pl.scan_ipc,
+    "csv": pl.scan_csv,
+}
 
 
-def categorical_columns(frame: FrameType) -> List[str]:
-    return frame.head(1).select(pl.col(pl.Categorical, pl.Enum, pl.Boolean)).columns
+def frame_schema(frame: FrameType | Schema) -> Schema:
+    if isinstance(frame, (DataFrame, LazyFrame)):
+        return frame.collect_schema()
+    return frame
+
+
+def file_format(path: Source) -> Literal["parquet", "ipc", "csv"]:
+    try:
+        return FILE_FORMATS[Path(path).suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported file format: {path}") from None
+
+
+def scan_source(source: FrameType | Source) -> FrameType:
+    # Paths and glob patterns are scanned lazily, so filters and selections of the
+    # pipeline are pushed down into the reader. A directory is read as a (hive
+    # partitioned) parquet dataset.
+    if isinstance(source, (DataFrame, LazyFrame)):
+        return source
+    if Path(source).is_dir():
+        return pl.scan_parquet(source)
+    return SCANNERS[file_format(source)](source)
+
+
+def select_columns(
+    frame: FrameType | Schema, *columns: ColumnNameOrSelector | Expr
+) -> List[str]:
+    # Resolves names from the schema alone: a LazyFrame is never executed, and
+    # the result is memoized per (schema, columns) pair.
+    schema = frame_schema(frame)
+    key = (tuple(schema.items()), tuple(str(col) for col in columns))
+    try:
+        return list(_columns_cache[key])
+    except KeyError:
+        pass
+
+    names = LazyFrame(schema=schema).select(*columns).collect_schema().names()
+    if len(_columns_cache) >= _COLUMNS_CACHE_SIZE:
+        _columns_cache.clear()
+    _columns_cache[key] = names
+    return list(names)
+
+
+def numerical_columns(frame: FrameType | Schema) -> List[str]:
+    return select_columns(frame, pl.col(pl.Float32, pl.Float64, pl.Decimal))
+
+
+def categorical_columns(frame: FrameType | Schema) -> List[str]:
+    return select_columns(frame, pl.col(pl.Categorical, pl.Enum, pl.Boolean))
+
+
+def iter_exprs(
+    exprs: Iterable[IntoExpr | Iterable[IntoExpr]], named_exprs: Mapping[str, IntoExpr]
+) -> Iterator[Expr]:
+    # Same parsing as select/with_columns: strings are column names
+    def parse(expr: IntoExpr) -> Expr:
+        if isinstance(expr, str):
+            return pl.col(expr)
+        return expr if isinstance(expr, Expr) else pl.lit(expr)
+
+    for expr in exprs:
+        if isinstance(expr, Iterable) and not isinstance(expr, str):
+            yield from (parse(e) for e in expr)
+        else:
+            yield parse(expr)
+    for name, expr in named_exprs.items():
+        yield parse(expr).alias(name)
+
+
+def expr_columns(schema: Schema, expr: Expr) -> Tuple[List[str], Set[str] | None]:
+    # Output names of expr and the input columns it reads. The inputs are None when
+    # they cannot be told apart, as for a computation over a multi-column selector.
+    if not expr.meta.has_multiple_outputs():
+        inputs = set(expr.meta.root_names())
+        # Resolving against the columns it reads is much cheaper on wide schemas
+        needed = Schema({col: schema[col] for col in inputs if col in schema})
+        outputs = LazyFrame(schema=needed).select(expr).collect_schema().names()
+        return outputs, inputs
+
+    outputs = select_columns(schema, expr)
+    if expr.meta.is_column_selection():
+        return outputs, set(outputs)
+    return outputs, None
+
+
+def iter_batches(
+    frame: FrameType, batch_size: int, *, maintain_order: bool = False
+) -> Iterator[DataFrame]:
+    if isinstance(frame, DataFrame):
+        yield from frame.iter_slices(batch_size)
+    elif hasattr(frame, "collect_batches"):
+        yield from frame.collect_batches(
+            chunk_size=batch_size, maintain_order=maintain_order
+        )
+    else:
+        yield from frame.collect().iter_slices(batch_size)
+
+
+def take_rows(frame: DataFrame, index: np.ndarray) -> DataFrame:
+    # Runs of consecutive indices, as in unshuffled folds, become slices that share
+    # the buffers of frame instead of gathering a copy of the rows
+    if len(index) == 0:
+        return frame.clear()
+
+    breaks = np.flatnonzero(np.diff(index) != 1) + 1
+    if len(breaks) >= _MAX_SLICE_RUNS:
+        return frame.select(pl.all().gather(index))
+
+    starts = index[np.concatenate([[0], breaks])]
+    lengths = np.diff(np.concatenate([[0], breaks, [len(index)]]))
+    return pl.concat(
+        [frame.slice(start, length) for start, length in zip(starts, lengths)],
+        how="vertical",
+        rechunk=False,
+    )
+
+
+def check_numeric_columns(
+    name: str, schema: Schema, columns: Iterable[str], *, allow_boolean: bool = False
+):
+    for col in columns:
+        if col not in schema:
+            raise ColumnNotFoundError(col)
+
+        dtype = schema[col]
+        if not (dtype.is_numeric() or (allow_boolean and dtype == pl.Boolean)):
+            raise InvalidDtypeError(name, col, dtype, "a numeric dtype")
 
 
 def list_of_dict_to_dict_of_list(data: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
@@ -23,3 +190,127 @@ def list_of_dict_to_dict_of_list(data: List[Dict[str, Any]]) -> Dict[str, List[A
         for key, value in d.items():
             result[key].append(value)
     return result
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def code_repr(code: CodeType, seen: Set[int]) -> str:
+    consts = [
+        code_repr(c, seen) if isinstance(c, CodeType) else stable_repr(c, seen)
+        for c in code.co_consts
+    ]
+    return f"code({code.co_code.hex()}, {consts}, {code.co_names}, {code.co_varnames})"
+
+
+def global_names(code: CodeType) -> Set[str]:
+    names = set(code.co_names)
+    for c in code.co_consts:
+        if isinstance(c, CodeType):
+            names |= global_names(c)
+    return names
+
+
+def function_repr(fn: FunctionType, seen: Set[int]) -> str:
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    if fn.__code__.co_filename.startswith(_LIBRARY_PATHS):
+        return name
+
+    # A function is its code and every value it closes over or reads from its
+    # module, so two lambdas that differ only in a captured value differ here
+    closure = [cell.cell_contents for cell in fn.__closure__ or ()]
+    globals_ = {
+        key: fn.__globals__[key]
+        for key in global_names(fn.__code__)
+        if key in fn.__globals__
+    }
+    parts = [fn.__defaults__, fn.__kwdefaults__, closure, globals_]
+    return (
+        f"{name}({code_repr(fn.__code__, seen)}, "
+        + ", ".join(stable_repr(part, seen) for part in parts)
+        + ")"
+    )
+
+
+def stable_repr(obj: Any, _seen: Set[int] | None = None) -> str:
+    # Unlike repr, this never embeds object ids, so it can be used as a cache key
+    # that is stable across processes. Objects it cannot describe by value raise
+    # TypeError instead of sharing a key with every other object of their type.
+    if obj is None or isinstance(obj, (str, int, float, complex, bool, bytes, Path)):
+        return repr(obj)
+    if isinstance(obj, type):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    if isinstance(obj, ModuleType):
+        return f"module({obj.__name__})"
+    if isinstance(obj, np.generic):
+        return f"{type(obj).__name__}({obj.item()!r})"
+    if isinstance(obj, Expr):
+        try:
+            return f"Expr({content_hash(obj.meta.serialize(format='binary'))})"
+        except Exception:
+            return str(obj)
+
+    # Only objects on the current path count as cycles, so shared references
+    # are described in full each time
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return f"<cycle {type(obj).__qualname__}>"
+    seen = seen | {id(obj)}
+
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return f"ndarray({obj.shape}, {stable_repr(obj.tolist(), seen)})"
+        data = np.ascontiguousarray(obj).tobytes()
+        return f"ndarray({obj.dtype}, {obj.shape}, {content_hash(data)})"
+    if isinstance(obj, DataFrame):
+        return f"DataFrame({fingerprint(obj)})"
+    if isinstance(obj, Series):
+        return f"Series({fingerprint(obj.to_frame())})"
+    if isinstance(obj, LazyFrame):
+        return f"LazyFrame({content_hash(obj.serialize())})"
+    if isinstance(obj, Schema):
+        return f"Schema({list(obj.items())})"
+    if isinstance(obj, Mapping):
+        items = sorted(
+            (stable_repr(k, seen), stable_repr(v, seen)) for k, v in obj.items()
+        )
+        return "{" + ", ".join(f"{k}: {v}" for k, v in items) + "}"
+    if isinstance(obj, (list, tuple)):
+        return "[" + ", ".join(stable_repr(v, seen) for v in obj) + "]"
+    if isinstance(obj, (set, frozenset)):
+        return "{" + ", ".join(sorted(stable_repr(v, seen) for v in obj)) + "}"
+    if isinstance(obj, FunctionType):
+        return function_repr(obj, seen)
+    if isinstance(obj, MethodType):
+        func, owner = obj.__func__, obj.__self__
+        return f"{stable_repr(func, seen)} of {stable_repr(owner, seen)}"
+    if isinstance(obj, functools.partial):
+        parts = [obj.func, obj.args, obj.keywords]
+        return f"partial({', '.join(stable_repr(part, seen) for part in parts)})"
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        # Builtins and other compiled callables
+        return f"{getattr(obj, '__module__', '')}.{obj.__qualname__}"
+    if hasattr(obj, "__dict__"):
+        return f"{type(obj).__qualname__}({stable_repr(vars(obj), seen)})"
+
+    try:
+        reduced = obj.__reduce_ex__(4)
+    except Exception as e:
+        raise TypeError(f"Cannot fingerprint {type(obj).__qualname__}") from e
+    if isinstance(reduced, str):
+        return reduced
+    return f"{type(obj).__qualname__}({stable_repr(list(reduced[1:]), seen)})"
+
+
+def fingerprint(*objects: Any) -> str:
+    h = hashlib.sha256()
+    for obj in objects:
+        if isinstance(obj, DataFrame):
+            h.update(str(obj.schema).encode())
+            h.update(str(obj.shape).encode())
+            if obj.width > 0:
+                h.update(obj.hash_rows(seed=0).to_numpy().tobytes())
+        else:
+            h.update(stable_repr(obj).encode())
+    return h.hexdigest()
@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Set
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+Task = Callable[[], None]
+
+
+class WriteScope:
+    # The writes submitted within one call, so that a flush waits only for them
+    # and raises only their failures
+    def __init__(self):
+        self.pending: Set[Future] = set()
+        self.errors: List[BaseException] = []
+
+
+_scope: ContextVar[WriteScope | None] = ContextVar("write_scope", default=None)
+
+
+@contextmanager
+def write_scope() -> Iterator[WriteScope]:
+    scope = WriteScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    # Yields a temporary path that replaces path once the block completes, so
+    # readers see either the previous file or the complete new one, never a prefix
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4()}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path: Path, data: bytes):
+    with atomic_path(path) as tmp_path, open(tmp_path, "wb") as f:
+        f.write(data)
+
+
+class ArtifactWriter:
+    # Encodes and writes artifacts on a thread pool so logging never blocks the
+    # caller. At most max_pending artifacts are in flight; submitting more waits.
+    # flush waits for the pending writes of the current write_scope, or of those
+    # submitted outside any scope, and re-raises the first failure among them.
+    def __init__(self, *, n_workers: int = 2, max_pending: int = 64):
+        self.n_workers = n_workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(
+            n_workers, thread_name_prefix="ArtifactWriter"
+        )
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.scope = WriteScope()
+        self.lock = threading.Lock()
+
+    def current_scope(self) -> WriteScope:
+        return _scope.get() or self.scope
+
+    def submit(self, task: Task):
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(task)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        scope = self.current_scope()
+        with self.lock:
+            scope.pending.add(future)
+        future.add_done_callback(lambda future: self.done(scope, future))
+
+    def done(self, scope: WriteScope, future: Future):
+        with self.lock:
+            scope.pending.discard(future)
+            if (error := future.exception()) is not None:
+                scope.errors.append(error)
+        self.slots.release()
+
+    def write_bytes(self, path: Path, data: bytes):
+        self.submit(lambda: atomic_write(path, data))
+
+    def write_json(self, path: Path, obj: Any):
+        # Serialized now, so later changes to obj do not leak into the file
+        self.write_bytes(path, json.dumps(obj, indent=4).encode())
+
+    def write_figure(self, fig: "Figure", path: Path):
+        def task():
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=path.suffix.lstrip(".") or "png")
+            fig.clear()
+            atomic_write(path, buffer.getvalue())
+
+        self.submit(task)
+
+    def flush(self):
+        scope = self.current_scope()
+        with self.lock:
+            pending = list(scope.pending)
+        wait(pending)
+
+        with self.lock:
+            errors, scope.errors = scope.errors, []
+        if errors:
+            raise errors[0]
+
+
+_writer: ArtifactWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> ArtifactWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ArtifactWriter()
+        return _writer
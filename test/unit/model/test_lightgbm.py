@@ -137,3 +137,32 @@ def test_regression_swiss_roll():
     X, y = make_swiss_roll(n_samples=1000, noise=0.1, random_state=42)
     mse = regression_valid_mse(X, y)
     assert mse < 0.01, f"MSE for swiss_roll is too high: {mse}"
+
+
+def test_dataset_cache(tmp_path):
+    X_np, y_np = make_friedman1(n_samples=500, noise=0.1, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"feature_{i}" for i in range(X_np.shape[1])])
+    y = pl.from_numpy(y_np, schema=["target"])
+    params = {"objective": "regression", "verbosity": -1, "deterministic": True}
+
+    model = LightGBM(params, dataset_cache_dir=tmp_path)
+    model.fit(X, y)
+    (path,) = tmp_path.iterdir()
+    assert path.suffix == ".bin"
+
+    # A second fit loads the binned Dataset and trains the same model
+    cached = LightGBM(params, dataset_cache_dir=tmp_path)
+    cached.fit(X, y)
+    assert list(tmp_path.iterdir()) == [path]
+    assert cached.transform(X).equals(model.transform(X))
+
+    LightGBM({**params, "max_bin": 15}, dataset_cache_dir=tmp_path).fit(X, y)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_single_feature():
+    X = pl.DataFrame({"x": np.linspace(0, 1, 200)})
+    y = pl.DataFrame({"target": np.linspace(0, 1, 200) ** 2})
+    model = LightGBM({"objective": "regression", "verbosity": -1})
+    model.fit(X, y)
+    assert model.transform(X.head(1)).shape == (1, 1)
@@ -1,5 +1,7 @@
 import numpy as np
 import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
 from polars_pipeline.model import LightGBM, Stacker
 from sklearn.datasets import (
     make_circles,
@@ -84,6 +86,124 @@ def regression_valid_mse(X_np: np.ndarray, y_np: np.ndarray) -> float:
     return float(mse)
 
 
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_fit_transform_out_of_fold(shuffle):
+    X_np, y_np = make_friedman1(n_samples=500, noise=0.1, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"feature_{i}" for i in range(X_np.shape[1])])
+    y = pl.from_numpy(y_np, schema=["target"])
+
+    fold_metrics = []
+    model = Stacker(
+        LightGBM({"objective": "regression", "verbosity": -1}),
+        fold=KFold(n_splits=4, shuffle=shuffle, random_state=0 if shuffle else None),
+        metrics_fn=lambda y_true, y_pred: {"n": y_pred.height},
+        fold_callback=lambda i, metrics: fold_metrics.append(metrics["n"]),
+    )
+    pred = model.fit_transform(X, y)
+
+    # Each row is predicted by the model of the fold that held it out
+    assert fold_metrics == [125] * 4
+    for fold_model, valid_idx in zip(model.models, model.valid_indexes):
+        assert_frame_equal(
+            pred[valid_idx], fold_model.transform(X[valid_idx]), check_exact=False
+        )
+
+
+def test_shared_dataset(tmp_path):
+    X_np, y_np = make_friedman1(n_samples=500, noise=0.1, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"feature_{i}" for i in range(X_np.shape[1])])
+    y = pl.from_numpy(y_np, schema=["target"])
+
+    # The folds train on subsets of one Dataset, which is binned and cached once
+    model = Stacker(
+        LightGBM(
+            {"objective": "regression", "verbosity": -1}, dataset_cache_dir=tmp_path
+        ),
+        fold=KFold(n_splits=5, shuffle=True, random_state=0),
+    )
+    pred = model.fit_transform(X, y)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert [m.booster.num_trees() for m in model.models] == [100] * 5
+    assert mean_squared_error(y, pred) < 2.0
+
+
+def test_early_stopping():
+    X_np, y_np = make_friedman1(n_samples=500, noise=0.1, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"feature_{i}" for i in range(X_np.shape[1])])
+    y = pl.from_numpy(y_np, schema=["target"])
+
+    params = {
+        "objective": "regression",
+        "learning_rate": 0.3,
+        "num_iterations": 1000,
+        "early_stopping_round": 10,
+        "verbosity": -1,
+    }
+    model = Stacker(LightGBM(params), fold=KFold(n_splits=3))
+    pred = model.fit_transform(X, y)
+
+    for fold_model, best_iteration in zip(model.models, model.best_iterations):
+        assert best_iteration is not None and best_iteration < 1000
+        assert fold_model.booster.num_trees() <= best_iteration + 10
+        # Predictions stop at the best iteration
+        expected = fold_model.booster.predict(X_np, num_iteration=best_iteration)
+        np.testing.assert_allclose(fold_model.transform(X)["target"], expected)
+    assert mean_squared_error(y, pred) < 2.0
+
+
+class CountingLightGBM(LightGBM):
+    conversions = 0
+
+    def to_matrix(self, X):
+        CountingLightGBM.conversions += 1
+        return super().to_matrix(X)
+
+
+def test_transform_converts_once():
+    X_np, y_np = make_friedman1(n_samples=500, noise=0.1, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"feature_{i}" for i in range(X_np.shape[1])])
+    y = pl.from_numpy(y_np, schema=["target"])
+    params = {"objective": "regression", "verbosity": -1}
+
+    model = Stacker(CountingLightGBM(params), fold=KFold(n_splits=4), n_jobs=4)
+    model.fit(X, y)
+    CountingLightGBM.conversions = 0
+    pred = model.transform(X.select(reversed(X.columns)))
+    assert CountingLightGBM.conversions == 1
+
+    fold_preds = np.column_stack(
+        [m.booster.predict(X_np) for m in model.models]  # type: ignore
+    )
+    np.testing.assert_allclose(pred["target"], fold_preds.mean(axis=1))
+
+    model.aggs = [pl.all().max()]
+    np.testing.assert_allclose(model.transform(X)["target"], fold_preds.max(axis=1))
+
+
+class ReversedStacker(Stacker):
+    def predict_folds(self, X):
+        return reversed(list(super().predict_folds(X)))
+
+
+def test_mean_is_reproducible():
+    X_np, y_np = make_friedman1(n_samples=500, noise=0.1, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"feature_{i}" for i in range(X_np.shape[1])])
+    y = pl.from_numpy(y_np, schema=["target"])
+    params = {"objective": "regression", "verbosity": -1}
+
+    model = ReversedStacker(LightGBM(params), fold=KFold(n_splits=4))
+    model.fit(X, y)
+    assert model.n_jobs == 1
+
+    # Folds completing in any order are summed in fold order, as compile() does
+    fold_preds = [m.booster.predict(X_np) for m in model.models]  # type: ignore
+    expected = (fold_preds[0] + fold_preds[1] + fold_preds[2] + fold_preds[3]) / 4
+    pred = model.transform(X)["target"].to_numpy()
+    compiled = model.compile()({col: X[col].to_numpy() for col in X.columns})
+    np.testing.assert_array_equal(pred, expected)
+    np.testing.assert_array_equal(compiled["target"], expected)
+
+
 def test_binary_circles():
     X, y = make_circles(n_samples=1000, noise=0.1, factor=0.5, random_state=42)
     accuracy = binary_valid_accuracy(X, y)
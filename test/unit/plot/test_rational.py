@@ -5,7 +5,9 @@ from pathlib import Path
 
 import numpy as np
 import polars as pl
-from polars_pipeline.plot import KDE2dPlot, ScatterPlot
+from polars_pipeline import Pipeline
+from polars_pipeline.functional import Select
+from polars_pipeline.plot import KDE2dPlot, ScatterPlot, UMAPPlot
 
 
 class TestRationalPlots(unittest.TestCase):
@@ -47,3 +49,28 @@ class TestRationalPlots(unittest.TestCase):
             plot = KDE2dPlot(hue="cat1")
             plot.log_dir = Path(tmpdir)
             plot.fit(self.df)
+
+    def test_umap_embed_sampled_and_cached(self):
+        df = self.df.drop_nulls().select("cat1", "num1", "num2")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plot = UMAPPlot(
+                Select("num1", "num2"),
+                sample_size=200,
+                stratify="cat1",
+                cache_dir=tmpdir,
+                umap_kwargs={"n_neighbors": 10},
+            )
+            reducer, embedding = plot.embed(df)
+            self.assertEqual(embedding.shape, (len(df), 2))
+            self.assertLess(len(reducer.embedding_), len(df))
+            self.assertEqual(len(list(Path(tmpdir).glob("umap_*.pkl"))), 1)
+
+            _, cached = plot.embed(df)
+            np.testing.assert_array_equal(embedding, cached)
+
+    def test_umap_leaves_preprocess_unfitted(self):
+        df = self.df.drop_nulls().select("num1", "num2")
+        preprocess = Pipeline().pre.standard_scale(["num1", "num2"])
+        plot = UMAPPlot(preprocess, sample_size=200, umap_kwargs={"n_neighbors": 10})
+        plot.embed(df)
+        self.assertFalse(plot.preprocess.transformers[0].mean_values)
@@ -1,4 +1,5 @@
 import polars as pl
+import polars.selectors as cs
 from polars.testing import assert_frame_equal
 from polars_pipeline.preprocessing import LabelEncoder
 
@@ -59,3 +60,49 @@ def test_unknown():
     encoder.fit(input)
     output = encoder.transform(input_unknown)
     assert_frame_equal(output, expected)
+
+
+def test_selector():
+    input = pl.DataFrame(
+        {
+            "a": pl.Series(["a", "b", "a"], dtype=pl.Utf8),
+            "b": pl.Series([1, 2, 3], dtype=pl.Int32),
+            "c": pl.Series(["x", "x", "y"], dtype=pl.Utf8),
+        }
+    )
+    expected = pl.DataFrame(
+        {
+            "b": pl.Series([1, 2, 3], dtype=pl.Int32),
+            "a": pl.Series([0, 1, 0], dtype=pl.Int32),
+            "c": pl.Series([0, 0, 1], dtype=pl.Int32),
+        }
+    )
+    encoder = LabelEncoder(cs.string(), maintain_order=True)
+    output = encoder.fit_transform(input)
+    assert_frame_equal(output, expected)
+
+
+def test_partial_fit():
+    input = pl.DataFrame(
+        {"a": pl.Series(["a", "b", None, "c", "b", "d", None, "a"], dtype=pl.Utf8)}
+    )
+    expected = LabelEncoder("a", maintain_order=True).fit_transform(input)
+
+    encoder = LabelEncoder("a", maintain_order=True)
+    encoder.partial_fit(input.slice(0, 3))
+    encoder.partial_fit(input.slice(3))
+    assert_frame_equal(encoder.transform(input), expected)
+
+
+def test_merge():
+    input = pl.DataFrame(
+        {"a": pl.Series(["a", "b", None, "c", "b", "d", None, "a"], dtype=pl.Utf8)}
+    )
+    expected = LabelEncoder("a", maintain_order=True).fit_transform(input)
+
+    first = LabelEncoder("a", maintain_order=True)
+    first.partial_fit(input.slice(0, 4))
+    second = LabelEncoder("a", maintain_order=True)
+    second.partial_fit(input.slice(4))
+    encoder = first.merge(second)
+    assert_frame_equal(encoder.transform(input), expected)
@@ -56,3 +56,27 @@ def test_null():
     scaler = MinMaxScaler("a")
     output = scaler.fit_transform(input)
     assert_frame_equal(output, expected)
+
+
+def test_partial_fit():
+    input = pl.DataFrame(
+        {"a": pl.Series([10.0, 0.0, None, 500.0, -500.0, 3.0], dtype=pl.Float64)}
+    )
+    expected = MinMaxScaler("a").fit_transform(input)
+
+    scaler = MinMaxScaler("a")
+    scaler.partial_fit(input.slice(0, 2))
+    scaler.partial_fit(input.slice(2, 1))
+    scaler.partial_fit(input.slice(3))
+    assert_frame_equal(scaler.transform(input), expected)
+
+
+def test_merge():
+    input = pl.DataFrame({"a": pl.Series([10.0, 0.0, 500.0, -500.0, 3.0, 7.0])})
+    expected = MinMaxScaler("a").fit_transform(input)
+
+    workers = [MinMaxScaler("a") for _ in range(3)]
+    for i, worker in enumerate(workers):
+        worker.partial_fit(input.slice(i * 2, 2))
+    scaler = workers[0].merge(workers[1]).merge(workers[2])
+    assert_frame_equal(scaler.transform(input), expected)
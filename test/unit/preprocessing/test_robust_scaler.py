@@ -1,3 +1,4 @@
+import numpy as np
 import polars as pl
 import pytest
 from polars.testing import assert_frame_equal
@@ -56,3 +57,64 @@ def test_null():
     scaler = RobustScaler("a")
     output = scaler.fit_transform(input)
     assert_frame_equal(output, expected)
+
+
+def test_partial_fit():
+    input = pl.DataFrame({"a": np.random.default_rng(0).normal(size=20000)})
+    scaler = RobustScaler("a")
+    for batch in input.iter_slices(3000):
+        scaler.partial_fit(batch)
+
+    exact = RobustScaler("a")
+    exact.fit(input)
+    assert scaler.median_values["a"] == pytest.approx(
+        exact.median_values["a"], abs=0.05
+    )
+    assert scaler.iqr_values["a"] == pytest.approx(exact.iqr_values["a"], rel=0.05)
+
+
+def test_merge():
+    input = pl.DataFrame({"a": [10.0, 0.0, 500.0, -500.0, 3.0, 7.0]})
+    full = RobustScaler("a")
+    full.partial_fit(input)
+
+    workers = [RobustScaler("a") for _ in range(3)]
+    for i, worker in enumerate(workers):
+        worker.partial_fit(input.slice(i * 2, 2))
+    scaler = workers[0].merge(workers[1]).merge(workers[2])
+    assert_frame_equal(scaler.transform(input), full.transform(input))
+
+
+def test_partial_fit_after_exact_fit():
+    input = pl.DataFrame({"a": [10.0, 0.0, 500.0, -500.0]})
+    scaler = RobustScaler("a")
+    scaler.fit(input)
+    with pytest.raises(ValueError):
+        scaler.partial_fit(input)
+
+
+def test_approx_lazy():
+    rng = np.random.default_rng(0)
+    input = pl.DataFrame(
+        {"a": rng.normal(size=50000), "b": rng.exponential(size=50000)}
+    )
+    exact = RobustScaler(["a", "b"])
+    exact.fit(input)
+
+    scaler = RobustScaler(["a", "b"], approx=True, rank_error=0.005, batch_size=7000)
+    scaler.fit(input.lazy())
+    for col in ["a", "b"]:
+        assert scaler.median_values[col] == pytest.approx(
+            exact.median_values[col], abs=0.05
+        )
+        assert scaler.iqr_values[col] == pytest.approx(exact.iqr_values[col], rel=0.05)
+
+    output = scaler.transform(input.lazy()).collect()
+    assert output.columns == ["a", "b"]
+
+
+def test_approx_constant():
+    input = pl.DataFrame({"a": pl.Series([42] * 10, dtype=pl.Float64)})
+    scaler = RobustScaler("a", approx=True)
+    with pytest.raises(ZeroDivisionError):
+        scaler.fit(input)
@@ -0,0 +1,160 @@
+import threading
+
+import numpy as np
+import polars as pl
+import pytest
+from polars import DataFrame
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline, Transformer
+from polars_pipeline.exception import CheckpointWarning
+from polars_pipeline.model import LightGBM
+
+
+# Kept outside the stage, whose attributes identify its checkpoints
+CALLS: list = []
+
+
+class Counter(Transformer):
+    def fit(self, X: DataFrame, y: DataFrame | None = None):
+        CALLS.append(X.height)
+        self.offset = X.height
+        return self
+
+    def transform(self, X: DataFrame) -> DataFrame:
+        return X.with_columns(pl.col("x0") + self.offset)
+
+
+def make_data() -> DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "x0": rng.normal(size=300),
+            "x1": rng.normal(size=300),
+            "y": rng.normal(size=300),
+        }
+    )
+
+
+def make_pipeline(log_dir) -> Pipeline:
+    params = {"objective": "regression", "verbose": -1, "deterministic": True}
+    return (
+        Pipeline(log_dir=log_dir)
+        .pre.standard_scale(["x0", "x1"])
+        .checkpoint()
+        .pipe(Counter())
+        .checkpoint()
+        .model.predict(LightGBM(params), target="y")
+    )
+
+
+def test_checkpoint_resume(tmp_path):
+    X = make_data()
+    CALLS.clear()
+    expected = make_pipeline(tmp_path).fit_transform(X)
+    assert CALLS == [300]
+    assert len(list((tmp_path / "checkpoints").iterdir())) == 2
+
+    # A fresh pipeline of the same definition resumes after the last checkpoint
+    pipeline = make_pipeline(tmp_path)
+    out = pipeline.fit_transform(X)
+    assert CALLS == [300]
+    assert_frame_equal(out, expected)
+    assert pipeline.transformers[2].offset == 300
+    assert_frame_equal(pipeline.transform(X), expected)
+
+    # Another input does not match the checkpoints
+    make_pipeline(tmp_path).fit_transform(X.head(200))
+    assert CALLS == [300, 200]
+
+
+def test_checkpoint_prefix(tmp_path):
+    X = make_data()
+    CALLS.clear()
+    make_pipeline(tmp_path).fit_transform(X)
+
+    # A pipeline sharing the prefix reuses it and only fits the new stages
+    pipeline = (
+        Pipeline(log_dir=tmp_path)
+        .pre.standard_scale(["x0", "x1"])
+        .checkpoint()
+        .pipe(Counter())
+        .checkpoint()
+        .pre.min_max_scale("x1")
+    )
+    out = pipeline.fit_transform(X)
+    assert CALLS == [300]
+    assert pipeline.transformers[0].mean_values["x0"] == X["x0"].mean()
+    assert out["x1"].min() == 0.0
+
+
+def test_checkpoint_invalid(tmp_path):
+    X = make_data()
+    CALLS.clear()
+    make_pipeline(tmp_path).fit_transform(X)
+
+    # A damaged latest checkpoint falls back to the one before it
+    latest = max(
+        (tmp_path / "checkpoints").iterdir(),
+        key=lambda path: (path / "state.pkl").stat().st_mtime_ns,
+    )
+    (latest / "state.pkl").write_bytes(b"truncated")
+    make_pipeline(tmp_path).fit_transform(X)
+    assert CALLS == [300, 300]
+
+    # As does a damaged frame
+    (latest / "frame.arrow").write_bytes(b"truncated")
+    make_pipeline(tmp_path).fit_transform(X)
+    assert CALLS == [300, 300, 300]
+
+
+def test_checkpoint_directory(tmp_path):
+    X = make_data()
+    pipeline = Pipeline().pre.standard_scale("x0").checkpoint(tmp_path)
+    pipeline.fit_transform(X)
+    (path,) = tmp_path.iterdir()
+    assert {p.name for p in path.iterdir()} == {"frame.arrow", "state.pkl"}
+
+    # Without a directory or log_dir, a checkpoint passes the frame through
+    assert_frame_equal(Pipeline().checkpoint().fit_transform(X), X)
+
+
+def test_checkpoint_path_source(tmp_path):
+    X = make_data()
+    path = tmp_path / "data.parquet"
+    X.write_parquet(path)
+    CALLS.clear()
+    make_pipeline(tmp_path).fit_transform(path)
+    make_pipeline(tmp_path).fit_transform(path)
+    assert CALLS == [300]
+
+    # The scanned file is identified by its size and modification time
+    X.head(200).write_parquet(path)
+    make_pipeline(tmp_path).fit_transform(path)
+    assert CALLS == [300, 200]
+
+
+def test_checkpoint_unfingerprintable(tmp_path):
+    X = make_data()
+    path = tmp_path / "data.parquet"
+    X.write_parquet(path)
+
+    # The contents of a file scanned by a LazyFrame cannot be identified
+    with pytest.warns(CheckpointWarning):
+        make_pipeline(tmp_path).fit_transform(pl.scan_parquet(path))
+    assert not (tmp_path / "checkpoints").exists()
+
+    stage = Counter()
+    stage.lock = threading.Lock()
+    pipeline = Pipeline(log_dir=tmp_path).pipe(stage).checkpoint()
+    with pytest.warns(CheckpointWarning):
+        pipeline.fit_transform(X)
+    assert not (tmp_path / "checkpoints").exists()
+
+
+def test_checkpoint_skips_fingerprint(tmp_path, monkeypatch):
+    def fail(*args):
+        raise AssertionError("input fingerprinted")
+
+    # Without a Checkpoint stage, the input is never hashed
+    monkeypatch.setattr("polars_pipeline.checkpoint.input_fingerprint", fail)
+    Pipeline(log_dir=tmp_path).pipe(Counter()).fit_transform(make_data())
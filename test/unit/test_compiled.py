@@ -0,0 +1,114 @@
+import numpy as np
+import polars as pl
+from polars_pipeline import Pipeline
+from polars_pipeline.compiled import to_batch
+from polars_pipeline.model import LightGBM, Stacker
+from polars_pipeline.preprocessing import LabelEncoder
+from sklearn.model_selection import KFold
+
+
+def make_data(n: int = 500) -> pl.DataFrame:
+    rng = np.random.default_rng(42)
+    return pl.DataFrame(
+        {
+            "a": rng.normal(size=n),
+            "b": rng.integers(0, 10, size=n),
+            "c": rng.choice(["x", "y", "z"], size=n),
+            "target": rng.normal(size=n),
+        }
+    )
+
+
+def make_pipeline() -> Pipeline:
+    return (
+        Pipeline()
+        .pre.standard_scale("a")
+        .pre.min_max_scale("b")
+        .pre.label_encode("c")
+        .sum_horizontal(["a", "b"], name="s")
+        .model.predict(
+            Stacker(
+                LightGBM({"objective": "regression", "verbosity": -1}),
+                fold=KFold(n_splits=3),
+            ),
+            target="target",
+        )
+    )
+
+
+def test_compiled_matches_transform():
+    X = make_data()
+    pipeline = make_pipeline()
+    pipeline.fit(X)
+    compiled = pipeline.compile()
+
+    X_test = X.head(8)
+    expected = pipeline.transform(X_test)
+    actual = compiled(X_test.drop("target").to_dicts())
+    assert list(actual) == expected.columns
+    np.testing.assert_allclose(actual["target"], expected["target"].to_numpy())
+
+    record = X_test.drop("target").row(0, named=True)
+    single = compiled(record)
+    np.testing.assert_allclose(single["target"], expected["target"].to_numpy()[:1])
+
+
+def test_compiled_fallback_stage():
+    X = make_data(20)
+    pipeline = Pipeline().with_columns(pl.col("a") * 2).pre.label_encode("c")
+    pipeline.fit(X)
+    compiled = pipeline.compile()
+
+    records = X.head(3).to_dicts()
+    expected = pipeline.transform(X.head(3))
+    actual = compiled(records)
+    assert list(actual) == expected.columns
+    np.testing.assert_allclose(actual["a"], expected["a"].to_numpy())
+    np.testing.assert_array_equal(actual["c"], expected["c"].to_numpy())
+
+
+def test_compiled_label_encoder_unknown():
+    encoder = LabelEncoder("c", maintain_order=True)
+    encoder.fit(pl.DataFrame({"c": ["x", "y", None]}))
+    fn = encoder.compile()
+
+    assert fn(to_batch({"c": ["y", "x"]}))["c"].tolist() == [1, 0]
+    result = fn(to_batch([{"c": "w"}, {"c": None}]))["c"]
+    assert result.dtype == np.float64
+    assert np.isnan(result[0]) and result[1] == 2
+
+
+def test_compiled_nulls():
+    X = pl.DataFrame(
+        {
+            "a": [None, 1.0, 3.0, None],
+            "b": [3.0, 2.0, None, None],
+            "c": ["x", "w", None, "y"],
+        }
+    )
+    pipeline = (
+        Pipeline()
+        .pre.label_encode("c", maintain_order=True)
+        .pre.min_max_scale("c")
+        .max_horizontal(["a", "b"])
+        .min_horizontal(["a", "b"])
+    )
+    pipeline.fit(pl.DataFrame({"a": [1.0, 2.0], "b": [1.0, 2.0], "c": ["x", "y"]}))
+
+    expected = pipeline.transform(X)
+    actual = pipeline.compile()(X.to_dicts())
+    for col in expected.columns:
+        values = [None if v != v else v for v in actual[col].tolist()]
+        assert values == expected[col].to_list(), col
+
+
+def test_compiled_benchmark():
+    X = make_data()
+    pipeline = make_pipeline()
+    pipeline.fit(X)
+    compiled = pipeline.compile()
+
+    record = X.drop("target").row(0, named=True)
+    stats = compiled.benchmark(record, n=200)
+    assert set(stats) == {"p50_ms", "p99_ms", "max_ms"}
+    assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
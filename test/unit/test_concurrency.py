@@ -0,0 +1,68 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline, Transformer
+from polars_pipeline.model import LightGBM, Stacker
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+
+def iter_stages(transformer: Transformer):
+    yield transformer
+    if isinstance(model := getattr(transformer, "model", None), Transformer):
+        yield from iter_stages(model)
+    for child in getattr(transformer, "transformers", []):
+        yield from iter_stages(child)
+    for child in getattr(transformer, "models", []):
+        yield from iter_stages(child)
+
+
+def make_data(n: int = 300) -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "a": rng.normal(size=n),
+            "b": rng.normal(size=n),
+            "target": rng.normal(size=n),
+        }
+    )
+
+
+def test_concurrent_transform_is_stable():
+    X = make_data()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = (
+            Pipeline(log_dir=tmpdir)
+            .branch(
+                Pipeline().select("a", "target").pre.standard_scale("a"),
+                Pipeline().select("b").pre.min_max_scale("b"),
+            )
+            .model.predict(
+                Stacker(
+                    LightGBM({"objective": "regression", "verbosity": -1}),
+                    fold=KFold(n_splits=3),
+                    metrics_fn=lambda y, pred: {
+                        "mse": mean_squared_error(y, pred),
+                    },
+                ),
+                target="target",
+            )
+        )
+        pipeline.fit(X)
+        (run_dir,) = Path(tmpdir).glob("*_*")
+        assert (run_dir / "1_Predictor" / "target.json").exists()
+
+        expected = pipeline.transform(X)
+        with ThreadPoolExecutor(8) as executor:
+            outputs = list(executor.map(lambda _: pipeline.transform(X), range(32)))
+
+    for output in outputs:
+        assert_frame_equal(output, expected)
+
+    # Only the root carries a configured directory; stages get theirs per call
+    stages = list(iter_stages(pipeline))
+    assert [s for s in stages if getattr(s, "_log_dir", None)] == [pipeline]
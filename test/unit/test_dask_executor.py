@@ -0,0 +1,97 @@
+import numpy as np
+import polars as pl
+import pytest
+from dask import compute, delayed
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline
+from polars_pipeline.dask_executor import DaskExecutor, tree_reduce
+from polars_pipeline.model import LightGBM
+from polars_pipeline.preprocessing import LabelEncoder, StandardScaler
+
+
+@pytest.fixture(scope="module")
+def data() -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "cat": rng.choice(["a", "b", "c", "d"], size=1000),
+            "x0": rng.normal(size=1000),
+            "x1": rng.normal(size=1000),
+            "y": rng.normal(size=1000),
+        }
+    ).with_columns(pl.col("cat").cast(pl.Categorical))
+
+
+def make_pipeline() -> Pipeline:
+    params = {"objective": "regression", "verbose": -1, "deterministic": True}
+    return (
+        Pipeline()
+        .with_columns(x2=pl.col("x0") * pl.col("x1"))
+        .pre.standard_scale(["x0", "x1", "x2"])
+        .pre.min_max_scale("y")
+        .pre.label_encode("cat", maintain_order=True)
+        # Merged sketches give slightly different quantiles, so the approximate
+        # scaler output is not fed to the model
+        .pipe(Pipeline().pre.robust_scale("x2", approx=True).drop("x2"))
+        .model.predict(LightGBM(params), target="y")
+    )
+
+
+@pytest.mark.parametrize("scheduler", ["threads", "sync", "processes"])
+def test_dask_fit_transform(data, scheduler):
+    expected = make_pipeline()
+    expected_out = expected.fit_transform(data)
+
+    pipeline = make_pipeline()
+    executor = DaskExecutor(pipeline, scheduler=scheduler, partition_size=150)
+    out = executor.fit_transform(data)
+
+    scaler = pipeline.transformers[1]
+    assert isinstance(scaler, StandardScaler)
+    for col in ["x0", "x1", "x2"]:
+        assert scaler.mean_values[col] == pytest.approx(
+            expected.transformers[1].mean_values[col]
+        )
+        assert scaler.std_values[col] == pytest.approx(
+            expected.transformers[1].std_values[col]
+        )
+
+    encoder = pipeline.transformers[3]
+    assert isinstance(encoder, LabelEncoder)
+    assert_frame_equal(
+        encoder.mappings["cat"], expected.transformers[3].mappings["cat"]
+    )
+
+    robust = pipeline.transformers[4].transformers[0]
+    assert robust.median_values["x2"] == pytest.approx(
+        expected.transformers[4].transformers[0].median_values["x2"], abs=0.05
+    )
+
+    assert_frame_equal(out, expected_out)
+    assert_frame_equal(executor.transform(data), pipeline.transform(data))
+
+
+def test_dask_sources(data, tmp_path):
+    pipeline = make_pipeline()
+    pipeline.fit(data)
+    executor = DaskExecutor(pipeline, partition_size=300)
+
+    data.write_parquet(tmp_path / "data.parquet")
+    for i, part in enumerate(data.iter_slices(400)):
+        part.write_parquet(tmp_path / f"part-{i}.pq")
+
+    expected = pipeline.transform(data)
+    assert_frame_equal(executor.transform(data.lazy()), expected)
+    assert_frame_equal(executor.transform(tmp_path / "data.parquet"), expected)
+    assert_frame_equal(executor.transform(str(tmp_path / "*.pq")), expected)
+
+
+def test_tree_reduce_order():
+    # Pairwise merges in partition order keep the first-seen order of categories
+    states = []
+    for c in "cabdcae":
+        encoder = LabelEncoder("cat", maintain_order=True)
+        encoder.partial_fit(pl.DataFrame({"cat": [c]}))
+        states.append(delayed(encoder))
+    (merged,) = compute(tree_reduce(states), scheduler="sync")
+    assert merged.mappings["cat"]["cat"].to_list() == ["c", "a", "b", "d", "e"]
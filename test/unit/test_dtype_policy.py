@@ -0,0 +1,129 @@
+import pickle
+
+import numpy as np
+import polars as pl
+import pytest
+from polars_pipeline import Pipeline
+from polars_pipeline.dtype_policy import DtypePolicy
+from polars_pipeline.model import LightGBM
+
+
+def make_data() -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "id": np.arange(500, dtype=np.int64),
+            "cat": rng.choice(["a", "b", "c"], size=500),
+            "count": rng.integers(0, 100, size=500),
+            "x0": rng.normal(size=500),
+            "x1": rng.normal(size=500),
+            "y": rng.normal(size=500),
+        }
+    ).with_columns(pl.col("cat").cast(pl.Categorical))
+
+
+def make_pipeline(dtype_policy: DtypePolicy | None, seen: list) -> Pipeline:
+    def predict_fn(booster, X):
+        seen.append(X.dtype)
+        return booster.predict(X)
+
+    params = {"objective": "regression", "verbose": -1, "deterministic": True}
+    return (
+        Pipeline(dtype_policy=dtype_policy)
+        .pre.standard_scale(["x0", "x1"])
+        .pre.label_encode("cat")
+        .drop("id")
+        .model.predict(LightGBM(params, predict_fn=predict_fn), target="y")
+    )
+
+
+def test_dtype_policy():
+    X = make_data()
+    policy = DtypePolicy(int_bounds={"count": (0, 100), "id": (0, 500)}, exclude=["id"])
+    seen: list = []
+    pipeline = make_pipeline(policy, seen)
+    out = pipeline.fit_transform(X)
+
+    report = policy.report()
+    assert report["bytes_saved"] > 0
+    assert report["bytes_after"] < report["bytes_before"]
+    assert 0 < report["max_abs_error"] < 1e-6
+    assert report["stages"]["input"]["calls"] == 1
+    assert seen == [np.float32]
+
+    schema = policy.apply(X).schema
+    assert schema["x0"] == pl.Float32
+    assert schema["count"] == pl.Int8
+    assert schema["id"] == pl.Int64
+    assert schema["cat"] == pl.Categorical
+    assert out.schema["y"] == pl.Float32
+    assert pipeline.validate(X)["y"] == pl.Float32
+
+    # Predictions match the full-precision pipeline up to float32 rounding
+    expected = make_pipeline(None, []).fit_transform(X)
+    error = np.abs(out["y"].to_numpy() - expected["y"].to_numpy())
+    assert error.max() < 0.05
+
+
+def test_dtype_policy_lazy():
+    X = make_data()
+    policy = DtypePolicy(int_bounds={"count": (0, 100)})
+    pipeline = Pipeline(dtype_policy=policy).select("x0", "count")
+    # Integer types come from the declared bounds, so they apply before fitting
+    out = pipeline.transform(X.lazy())
+    assert out.collect_schema() == pl.Schema({"x0": pl.Float32, "count": pl.Int8})
+    assert policy.report()["stages"] == {}
+
+
+def test_dtype_policy_int_bounds():
+    X = pl.DataFrame({"count": [1, 2, 3], "x0": [0.5, 1.5, 2.5]})
+    pipeline = Pipeline(
+        dtype_policy=DtypePolicy(int_bounds={"count": (0, 1000)})
+    ).with_columns((pl.col("count") * 2).alias("double"))
+    pipeline.fit(X)
+
+    # Values unseen when fitting but within the bounds keep the declared type
+    out = pipeline.transform(X.with_columns(pl.Series("count", [1, 200, 3])))
+    assert out["count"].to_list() == [1, 200, 3]
+    assert out.schema["count"] == pl.Int16
+    assert out.schema["double"] == pl.Int16
+    assert pipeline.validate(X) == out.schema
+
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        pipeline.transform(pl.DataFrame({"count": [100_000], "x0": [0.5]}))
+    with pytest.raises(ValueError):
+        DtypePolicy(int_bounds={"count": (1, 0)})
+
+
+def test_dtype_policy_model_input():
+    X = make_data().with_columns(pl.col("count").cast(pl.Int32))
+    seen: list = []
+    pipeline = make_pipeline(DtypePolicy(exclude=["id", "count"]), seen)
+    pipeline.fit_transform(X)
+    # The excluded Int32 column does not widen the model input to float64
+    assert seen == [np.float32]
+
+
+def test_dtype_policy_compiled():
+    X = make_data()
+    seen: list = []
+    pipeline = make_pipeline(DtypePolicy(exclude=["id"]), seen)
+    pipeline.fit(X)
+    compiled = pipeline.compile()
+
+    X_test = X.head(8)
+    expected = pipeline.transform(X_test)
+    seen.clear()
+    actual = compiled(X_test.drop("y").to_dicts())
+    # The compiled model reads the same float32 matrix as transform
+    assert seen == [np.float32]
+    np.testing.assert_allclose(actual["y"], expected["y"].to_numpy(), rtol=1e-6)
+
+
+def test_dtype_policy_pickle():
+    policy = DtypePolicy(float_dtype=pl.Float32)
+    policy.apply(make_data())
+    restored = pickle.loads(pickle.dumps(policy))
+    assert restored.report() == policy.report()
+    restored.apply(make_data())
+    assert restored.report()["stages"]["input"]["calls"] == 2
@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "umap",
+    "datashader",
+    "bokeh",
+    "holoviews",
+    "seaborn",
+    "matplotlib",
+    "lightgbm",
+    "sklearn",
+]
+
+SCRIPT = f"""
+import json
+import sys
+import time
+
+import polars
+
+start = time.perf_counter()
+import polars_pipeline
+from polars_pipeline import Pipeline
+
+Pipeline().pre.standard_scale("a").select("a")
+elapsed = time.perf_counter() - start
+
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def run_import() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_not_imported():
+    result = run_import()
+    assert result["loaded"] == [], f"Heavy modules imported: {result['loaded']}"
+
+
+def test_import_time():
+    # Baseline is well under 0.1s on top of polars; the bound leaves headroom for
+    # slow CI machines while still catching an eager plotting/model import.
+    result = run_import()
+    assert result["elapsed"] < 1.0, f"Import is too slow: {result['elapsed']:.3f}s"
+
+
+def test_stages_still_importable():
+    from polars_pipeline.model import LightGBM
+    from polars_pipeline.plot import BoxPlot
+
+    assert LightGBM.__name__ == "LightGBM"
+    assert BoxPlot.__name__ == "BoxPlot"
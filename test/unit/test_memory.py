@@ -0,0 +1,118 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline
+from polars_pipeline.checkpoint import load_checkpoint, save_checkpoint
+from polars_pipeline.exception import MemoryBudgetExceededError, MemoryBudgetWarning
+from polars_pipeline.functional import Dummy
+from polars_pipeline.memory import MemoryBudget, current_rss
+from polars_pipeline.telemetry import load_telemetry
+
+
+def make_data() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "cat": [f"c{i % 2000}" for i in range(10_000)],
+            "x0": [float(i) for i in range(10_000)],
+            "x1": [float(-i) for i in range(10_000)],
+        }
+    )
+
+
+def make_pipeline(memory_budget: MemoryBudget) -> Pipeline:
+    return (
+        Pipeline(memory_budget=memory_budget)
+        .with_columns(x2=pl.col("x0") * 2)
+        .dummy("cat")
+    )
+
+
+def test_dummy_estimate():
+    X = make_data()
+    estimate = Dummy("cat").estimate_memory(X)
+    assert estimate == X.estimated_size() + X.height * 2000
+    assert estimate >= X.to_dummies("cat").estimated_size()
+
+
+def test_memory_budget_actions(tmp_path):
+    if current_rss() is None:
+        pytest.skip("resident memory is not available")
+
+    def budget(**kwargs) -> MemoryBudget:
+        # About 10MB above the current memory: the 20MB of dummies exceed it, the
+        # other stage does not
+        return MemoryBudget(current_rss() + 10_000_000, **kwargs)
+
+    X = make_data()
+    expected = make_pipeline(MemoryBudget(2**62)).transform(X)
+
+    with pytest.raises(MemoryBudgetExceededError) as e:
+        make_pipeline(budget()).transform(X)
+    assert (e.value.index, e.value.name) == (1, "Dummy")
+
+    with pytest.warns(MemoryBudgetWarning):
+        out = make_pipeline(budget(action="warn")).transform(X)
+    assert_frame_equal(out, expected)
+
+    out = make_pipeline(budget(action="spill", spill_dir=tmp_path)).transform(X)
+    assert_frame_equal(out, expected)
+    assert list(tmp_path.iterdir()) == []
+
+
+def anonymous_rss() -> int | None:
+    # Resident memory not backed by a file, which a spilled frame should not add to
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def test_spill_is_file_backed(tmp_path):
+    if anonymous_rss() is None:
+        pytest.skip("anonymous resident memory is not available")
+
+    # About 80MB of floats
+    X = pl.select(
+        (pl.int_range(1_000_000) * i).cast(pl.Float64).alias(f"x{i}") for i in range(10)
+    )
+    expected = X.sum()
+    before = anonymous_rss()
+    spilled = MemoryBudget(0, action="spill", spill_dir=tmp_path).spill(X)
+    assert anonymous_rss() - before < X.estimated_size() // 8
+
+    del X
+    assert_frame_equal(spilled.sum(), expected)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_memory_telemetry(tmp_path):
+    X = make_data()
+    pipeline = Pipeline(log_dir=tmp_path).with_columns(x2=pl.col("x0") * 2)
+    pipeline.fit(X)
+
+    telemetry = load_telemetry(tmp_path).collect()
+    assert telemetry["bytes_in"].to_list() == [X.estimated_size()]
+    assert telemetry["bytes_out"][0] > X.estimated_size()
+    assert telemetry["peak_rss"][0] > 0
+
+
+def test_checkpoint_is_file_backed(tmp_path):
+    if anonymous_rss() is None:
+        pytest.skip("anonymous resident memory is not available")
+
+    X = pl.select(
+        (pl.int_range(1_000_000) * i).cast(pl.Float64).alias(f"x{i}") for i in range(10)
+    )
+    expected = X.sum()
+    before = anonymous_rss()
+    saved = save_checkpoint(tmp_path, X, [])
+    loaded, _ = load_checkpoint(tmp_path)
+    assert anonymous_rss() - before < X.estimated_size() // 8
+
+    del X
+    assert_frame_equal(saved.sum(), expected)
+    assert_frame_equal(loaded.sum(), expected)
@@ -3,6 +3,12 @@ import unittest
 import polars as pl
 from polars.testing import assert_frame_equal
 from polars_pipeline import Pipeline
+from polars_pipeline.exception import (
+    ColumnsMismatchError,
+    InvalidDtypeError,
+    SchemaValidationError,
+)
+from polars_pipeline.model import LightGBM
 
 
 class TestPipeline(unittest.TestCase):
@@ -44,3 +50,77 @@ class TestPipeline(unittest.TestCase):
         assert_frame_equal(
             out, self.df.with_columns(pl.col("c").gt(0.1).cast(pl.Int32))
         )
+
+    def test_validate_matches_output(self):
+        pipeline = (
+            Pipeline()
+            .with_columns(pl.col("a").alias("a2"))
+            .pre.standard_scale(["a", "c"])
+            .pre.label_encode("g")
+            .sum_horizontal(["a", "c"], name="ac")
+            .drop("b")
+            .sort_columns(by="name")
+        )
+        schema = pipeline.validate(self.df)
+        out = pipeline.fit_transform(self.df)
+        self.assertEqual(schema, out.schema)
+
+    def test_validate_missing_column(self):
+        pipeline = Pipeline().select("a", "b").pre.standard_scale("c")
+        with self.assertRaises(SchemaValidationError) as cm:
+            pipeline.validate(self.df.lazy())
+        self.assertEqual(cm.exception.index, 1)
+        self.assertIsInstance(cm.exception.error, pl.exceptions.ColumnNotFoundError)
+
+    def test_validate_dtype(self):
+        pipeline = Pipeline().pre.min_max_scale("g")
+        with self.assertRaises(SchemaValidationError) as cm:
+            pipeline.validate(self.df)
+        self.assertIsInstance(cm.exception.error, InvalidDtypeError)
+
+    def test_validate_fitted_model_columns(self):
+        df = self.df.select("a", "c").with_columns(
+            target=pl.Series([0.0, 1.0, 0.0, 1.0, 0.0])
+        )
+        pipeline = Pipeline().model.predict(
+            LightGBM({"objective": "regression", "verbosity": -1}), target="target"
+        )
+        self.assertEqual(pipeline.validate(df), pl.Schema({"target": pl.Float64}))
+        pipeline.fit(df)
+
+        with self.assertRaises(SchemaValidationError) as cm:
+            pipeline.validate(df.rename({"c": "z"}))
+        self.assertIsInstance(cm.exception.error, ColumnsMismatchError)
+
+    def test_branch_horizontal(self):
+        pipeline = (
+            Pipeline()
+            .with_columns(pl.col("a").cast(pl.Float64).alias("a2"))
+            .branch(
+                Pipeline().select("a2").pre.min_max_scale("a2"),
+                Pipeline().select("c").pre.standard_scale("c"),
+                Pipeline().select("g").pre.label_encode("g", maintain_order=True),
+            )
+        )
+        out = pipeline.fit_transform(self.df)
+        self.assertEqual(out.columns, ["a2", "c", "g"])
+        self.assertEqual(out["a2"].to_list(), [0.0, 0.25, 0.5, 0.75, 1.0])
+        self.assertEqual(out["g"].to_list(), [0, 1, 2, 3, 4])
+
+        lazy_out = pipeline.transform(self.df.lazy()).collect()
+        assert_frame_equal(lazy_out, out)
+        self.assertEqual(pipeline.validate(self.df), out.schema)
+
+    def test_branch_join(self):
+        pipeline = Pipeline().branch(
+            Pipeline().select("a", "c"),
+            Pipeline().select("a", pl.col("e").alias("e2")),
+            how="join",
+            on="a",
+        )
+        out = pipeline.transform(self.df)
+        assert_frame_equal(
+            out,
+            self.df.select("a", "c", pl.col("e").alias("e2")),
+            check_row_order=False,
+        )
@@ -0,0 +1,147 @@
+import numpy as np
+import polars as pl
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline, Transformer
+
+
+def make_data(n_columns: int = 50) -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {f"x{i}": rng.normal(size=100) for i in range(n_columns)}
+    data["cat"] = rng.choice(["a", "b"], size=100)
+    data["unused_cat"] = rng.choice(["c", "d"], size=100)
+    return pl.DataFrame(data).with_columns(
+        pl.col("cat", "unused_cat").cast(pl.Categorical)
+    )
+
+
+def make_pipeline(prune_columns: bool = True) -> Pipeline:
+    return (
+        Pipeline(prune_columns=prune_columns)
+        .pre.standard_scale(["x0", "x1", "x2"])
+        .pre.label_encode()
+        .with_columns(
+            (pl.col("x0") * 2).alias("double"),
+            (pl.col("x3") + pl.col("x4")).alias("unused"),
+        )
+        .sum_horizontal(["x1", "x2"], name="total")
+        .mean_horizontal(["x5", "x6"], name="unused_mean")
+        .drop("x1")
+        .select("double", "total", "cat", "x2")
+    )
+
+
+def test_plan_input_columns():
+    X = make_data()
+    pipeline = make_pipeline()
+    pipeline.fit(X)
+
+    columns, transformers = pipeline.plan(X.schema)
+    assert columns == ["x0", "x1", "x2", "cat"]
+    assert transformers[0].columns == ["x0", "x1", "x2"]
+    assert list(transformers[1].mappings) == ["cat"]
+    assert transformers[4].__class__.__name__ == "WithColumns"
+    assert list(pipeline.transformers[1].mappings) == ["cat", "unused_cat"]
+
+
+def test_pruned_transform_matches():
+    X = make_data()
+    pruned = make_pipeline()
+    full = make_pipeline(prune_columns=False)
+    pruned.fit(X)
+    full.fit(X)
+
+    assert_frame_equal(pruned.transform(X), full.transform(X))
+    assert_frame_equal(pruned.transform(X.lazy()).collect(), full.transform(X))
+
+
+def test_opaque_stage_reads_everything():
+    X = make_data(5)
+    pipeline = Pipeline().pre.label_encode().dummy("cat").select("x0")
+    pipeline.fit(X)
+    assert pipeline.plan(X.schema) is None
+    assert pipeline.transform(X).columns == ["x0"]
+
+    nested = Pipeline().pipe(Pipeline().select("x0", "x1")).select("x1")
+    assert nested.plan(X.schema)[0] == ["x1"]
+
+
+def test_overwritten_column_read_upstream():
+    X = pl.DataFrame({"x": [10, 20], "a": [1, 2]})
+    pipeline = (
+        Pipeline()
+        .with_columns(pl.col("a").alias("b"), pl.col("x").alias("a"))
+        .select("b")
+    )
+    assert pipeline.plan(X.schema)[0] == ["a"]
+    assert pipeline.transform(X)["b"].to_list() == [1, 2]
+
+
+def test_plan_follows_stage_state():
+    X = pl.DataFrame({"cat": ["a", "b"], "x0": [1.0, 2.0]})
+    pipeline = Pipeline().pre.label_encode("cat").select("cat", "x0")
+    pipeline.fit(X.head(1))
+    pipeline.transform(X)
+
+    # A stage refitted on its own is pruned in its new state
+    pipeline.transformers[0].partial_fit(X.tail(1))
+    expected = pipeline.transformers[0].transform(X).select("cat", "x0")
+    assert_frame_equal(pipeline.transform(X), expected)
+
+
+def test_plan_does_not_run_user_transform():
+    calls = []
+
+    class Recorder(Transformer):
+        def transform(self, X):
+            calls.append(X)
+            return X
+
+    X = make_data(5)
+    pipeline = Pipeline().pipe(Recorder()).select("x0")
+    pipeline.fit(X)
+    calls.clear()
+
+    # The stage defines no output_schema, so nothing is pruned around it
+    assert pipeline.plan(X.schema) is None
+    assert pipeline.transform(X).columns == ["x0"]
+    assert len(calls) == 1 and calls[0].width == X.width
+
+
+def test_strict_drop_reads_dropped_columns():
+    X = make_data(5)
+    pipeline = Pipeline().drop("x1").select("x0")
+    columns, transformers = pipeline.plan(X.schema)
+    assert columns == ["x0", "x1"]
+    assert transformers[0].strict
+    assert pipeline.transform(X).columns == ["x0"]
+
+    lenient = Pipeline().drop("missing", strict=False).select("x0")
+    assert lenient.plan(X.schema)[0] == ["x0"]
+
+
+def test_plan_cached_per_schema(monkeypatch):
+    X = make_data()
+    pipeline = make_pipeline()
+    pipeline.fit(X)
+    other = X.drop("x10")
+    pipeline.transform(other)
+
+    calls = []
+    column_plan = pipeline.column_plan
+    monkeypatch.setattr(
+        pipeline,
+        "column_plan",
+        lambda schema: calls.append(schema) or column_plan(schema),
+    )
+    pipeline.transform(X)
+    pipeline.transform(other)
+    assert calls == []
+
+    # Stages whose outputs are all needed are not copied
+    columns, transformers = pipeline.cached_plan(other.schema)
+    assert transformers[-1] is pipeline.transformers[-1]
+    assert transformers[4] is not pipeline.transformers[4]
+
+    monkeypatch.setattr("polars_pipeline.pipeline.pipeline.PLAN_CACHE_SIZE", 2)
+    pipeline.transform(X.drop("x11"))
+    assert len(pipeline.plans) == 1
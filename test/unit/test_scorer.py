@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import polars as pl
+import pytest
+from polars_pipeline import Pipeline
+from polars_pipeline.scorer import AsyncScorer
+
+
+def make_pipeline() -> Pipeline:
+    X = pl.DataFrame({"id": range(100), "x": [float(i) for i in range(100)]})
+    pipeline = Pipeline().pre.standard_scale("x").with_columns(y=pl.col("x") * 2)
+    pipeline.fit(X)
+    return pipeline
+
+
+async def load(scorer: AsyncScorer, n_clients: int, n_requests: int):
+    async def client(c: int):
+        results = []
+        for r in range(n_requests):
+            ids = [c * 1000 + r * 10 + k for k in range(1 + (c + r) % 3)]
+            X = pl.DataFrame({"id": ids, "x": [float(i % 100) for i in ids]})
+            results.append((X, await scorer.score(X)))
+        return results
+
+    return await asyncio.gather(*(client(c) for c in range(n_clients)))
+
+
+def test_scorer_returns_own_rows():
+    pipeline = make_pipeline()
+
+    async def main():
+        async with AsyncScorer(pipeline, max_batch_size=32, max_wait=0.01) as scorer:
+            results = await load(scorer, n_clients=20, n_requests=10)
+            return results, scorer.stats()
+
+    results, stats = asyncio.run(main())
+    for client_results in results:
+        for X, y in client_results:
+            assert y["id"].to_list() == X["id"].to_list()
+            assert y.equals(pipeline.transform(X))
+
+    assert stats["requests"] == 200
+    assert stats["batches"] < 200
+    assert stats["mean_batch_size"] > 1
+    assert stats["queue_size"] == 0
+
+
+def test_scorer_backpressure():
+    class Slow(Pipeline):
+        def transform(self, X):
+            time.sleep(0.01)
+            return X
+
+    async def main():
+        scorer = AsyncScorer(Slow(), max_batch_size=1, max_queue_size=2)
+        await scorer.start()
+        tasks = [
+            asyncio.create_task(scorer.score(pl.DataFrame({"a": [i]})))
+            for i in range(10)
+        ]
+        await asyncio.sleep(0)
+        queue_size = scorer.queue_size()
+        results = await asyncio.gather(*tasks)
+        await scorer.close()
+        return queue_size, results
+
+    queue_size, results = asyncio.run(main())
+    assert queue_size <= 2
+    assert [r["a"].item() for r in results] == list(range(10))
+
+
+def test_scorer_propagates_errors():
+    pipeline = Pipeline().select("missing")
+
+    async def main():
+        async with AsyncScorer(pipeline) as scorer:
+            with pytest.raises(pl.exceptions.ColumnNotFoundError):
+                await scorer.score(pl.DataFrame({"a": [1]}))
+            return scorer.stats()
+
+    assert asyncio.run(main())["errors"] == 1
+
+
+def test_scorer_isolates_mismatched_request():
+    pipeline = make_pipeline()
+    good = pl.DataFrame({"id": [1, 2], "x": [1.0, 2.0]})
+    bad = pl.DataFrame({"id": [3], "x": ["3"]})
+
+    async def main():
+        async with AsyncScorer(pipeline, max_batch_size=32, max_wait=0.05) as scorer:
+            requests = [scorer.score(good), scorer.score(bad), scorer.score(good)]
+            results = await asyncio.gather(*requests, return_exceptions=True)
+            return results, scorer.stats()
+
+    (first, error, last), stats = asyncio.run(main())
+    # Only the request with a string column fails, not the whole micro-batch
+    assert first.equals(pipeline.transform(good))
+    assert last.equals(first)
+    assert isinstance(error, Exception)
+    assert stats["errors"] == 1
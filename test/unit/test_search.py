@@ -0,0 +1,82 @@
+import polars as pl
+import pytest
+from polars_pipeline import Pipeline
+from polars_pipeline.model import LightGBM
+from polars_pipeline.pipeline.search import MedianPruner
+from sklearn.datasets import make_regression
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+
+def rmse(y_true: pl.DataFrame, y_pred: pl.DataFrame) -> dict:
+    return {"rmse": mean_squared_error(y_true, y_pred) ** 0.5}
+
+
+def make_data():
+    X_np, y_np = make_regression(n_samples=300, n_features=5, random_state=42)
+    X = pl.from_numpy(X_np, schema=[f"x{i}" for i in range(5)])
+    y = pl.DataFrame({"target": y_np})
+    return X, y
+
+
+def make_candidate(num_leaves: int) -> Pipeline:
+    return (
+        Pipeline()
+        .pre.standard_scale(["x0", "x1"])
+        .pre.min_max_scale(["x2"])
+        .model.stack(
+            LightGBM(
+                {"objective": "regression", "num_leaves": num_leaves, "verbosity": -1}
+            ),
+            fold=KFold(n_splits=3),
+            metrics_fn=rmse,
+        )
+    )
+
+
+def test_search_fits_shared_prefix_once():
+    X, y = make_data()
+    candidates = [make_candidate(n) for n in [2, 7, 31]]
+    trials = Pipeline.search(candidates, X, y, metric="rmse", n_jobs=2)
+
+    assert [trial.state for trial in trials] == ["complete"] * 3
+    assert all(len(trial.fold_scores) == 3 for trial in trials)
+    assert trials[0].score == pytest.approx(sum(trials[0].fold_scores) / 3)
+    assert trials[0].pipeline.transformers[0] is trials[2].pipeline.transformers[0]
+    assert trials[0].pipeline.transformers[2] is not trials[1].pipeline.transformers[2]
+    assert not candidates[0].transformers[0].mean_values
+
+    best = min(trials, key=lambda trial: trial.score)
+    assert best.pipeline.transform(X).shape == (300, 1)
+
+
+def test_search_shares_stacker():
+    X, y = make_data()
+    # The candidates only differ after the Stacker, so it is in the shared prefix
+    candidates = [
+        make_candidate(7).with_columns(pl.col("target") * scale) for scale in [1, 2]
+    ]
+    trials = Pipeline.search(candidates, X, y, metric="rmse")
+
+    assert [trial.state for trial in trials] == ["complete"] * 2
+    assert trials[0].pipeline.transformers[2] is trials[1].pipeline.transformers[2]
+    assert trials[0].fold_scores == trials[1].fold_scores
+    assert len(trials[0].fold_scores) == 3
+    assert trials[0].pipeline.transformers[2].fold_callback is None
+
+
+def test_search_prunes_bad_trials():
+    X, y = make_data()
+    candidates = [make_candidate(31)] * 2 + [make_candidate(2)]
+    pruner = MedianPruner(n_startup_trials=2)
+    trials = Pipeline.search(candidates, X, y, metric="rmse", n_jobs=1, pruner=pruner)
+
+    assert [trial.state for trial in trials] == ["complete", "complete", "pruned"]
+    assert trials[2].score is None
+    assert len(trials[2].fold_scores) < 3
+
+
+def test_search_requires_metrics():
+    X, y = make_data()
+    with pytest.raises(ValueError):
+        Pipeline.search([Pipeline().select("x0")], X, y, metric="rmse")
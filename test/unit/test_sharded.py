@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline
+from polars_pipeline.model import LightGBM
+from polars_pipeline.sharded import ShardedExecutor
+
+
+@pytest.fixture(scope="module")
+def data() -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "id": range(1000),
+            "x0": rng.normal(size=1000),
+            "x1": rng.normal(size=1000),
+            "y": rng.normal(size=1000),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def pipeline(data) -> Pipeline:
+    pipeline = (
+        Pipeline()
+        .pre.standard_scale(["x0", "x1"])
+        .branch(
+            Pipeline().select("id"),
+            Pipeline()
+            .select("x0", "x1", "y")
+            .model.predict(
+                LightGBM({"objective": "regression", "verbose": -1}), target="y"
+            ),
+        )
+    )
+    pipeline.fit(data)
+    return pipeline
+
+
+@pytest.fixture(scope="module")
+def executor(pipeline):
+    with ShardedExecutor(pipeline, n_workers=2, shard_size=128) as executor:
+        yield executor
+
+
+def shared_memory_blocks():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def test_sharded_rows(data, pipeline, executor):
+    before = shared_memory_blocks()
+    out = executor.transform(data)
+    lazy_out = executor.transform(data.lazy())
+
+    expected = pipeline.transform(data)
+    assert_frame_equal(out, expected)
+    assert_frame_equal(lazy_out, expected)
+    assert shared_memory_blocks() <= before
+
+
+def test_sharded_files(data, pipeline, executor, tmp_path):
+    for i, part in enumerate(data.iter_slices(300)):
+        part.write_parquet(tmp_path / f"part-{i}.parquet")
+
+    frames = list(executor.iter_transform(str(tmp_path / "*.parquet")))
+    assert len(frames) == 4
+    assert_frame_equal(pl.concat(frames), pipeline.transform(data))
+
+    with pytest.raises(FileNotFoundError):
+        executor.transform(str(tmp_path / "*.csv"))
+
+
+def test_sharded_error(data, executor):
+    before = shared_memory_blocks()
+    with pytest.raises(pl.exceptions.ColumnNotFoundError):
+        executor.transform(data.drop("x1"))
+    assert shared_memory_blocks() <= before
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from polars_pipeline.sketch import QuantileSketch
+
+
+def rank_error(sorted_values: np.ndarray, value: float, q: float) -> float:
+    return abs(np.searchsorted(sorted_values, value) / len(sorted_values) - q)
+
+
+def test_exact_when_small():
+    sketch = QuantileSketch()
+    sketch.update([10.0, 0.0, 500.0, -500.0, np.nan])
+    assert sketch.count == 4
+    assert sketch.quantiles([0.25, 0.5, 0.75]) == pytest.approx(
+        np.quantile([10.0, 0.0, 500.0, -500.0], [0.25, 0.5, 0.75])
+    )
+
+
+def test_rank_error():
+    values = np.random.default_rng(0).normal(size=200_000)
+    sketch = QuantileSketch(k=200)
+    for batch in np.array_split(values, 7):
+        sketch.update(batch)
+
+    sorted_values = np.sort(values)
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        assert rank_error(sorted_values, sketch.quantile(q), q) < 0.02
+    assert sum(len(c) for c in sketch.compactors) < 1000
+
+
+def test_merge():
+    values = np.random.default_rng(0).exponential(size=100_000)
+    sketches = [QuantileSketch(seed=i) for i in range(4)]
+    for sketch, batch in zip(sketches, np.array_split(values, 4)):
+        sketch.update(batch)
+
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+
+    assert merged.count == len(values)
+    sorted_values = np.sort(values)
+    for q in [0.25, 0.5, 0.75]:
+        assert rank_error(sorted_values, merged.quantile(q), q) < 0.02
+
+
+def test_empty():
+    assert np.isnan(QuantileSketch().quantile(0.5))
@@ -0,0 +1,97 @@
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from polars_pipeline import Pipeline
+
+
+@pytest.fixture
+def data() -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "group": rng.choice(["a", "b", "c"], size=200),
+            "x0": rng.normal(size=200),
+            "x1": rng.normal(size=200),
+            "unused": rng.normal(size=200),
+        }
+    )
+
+
+def make_pipeline() -> Pipeline:
+    return (
+        Pipeline()
+        .filter(pl.col("x0") > 0)
+        .pre.standard_scale(["x0", "x1"])
+        .with_columns((pl.col("x0") + pl.col("x1")).alias("total"))
+        .select("group", "total")
+    )
+
+
+@pytest.mark.parametrize("suffix", ["parquet", "arrow", "csv"])
+def test_path_source(data, tmp_path, suffix):
+    path = tmp_path / f"data.{suffix}"
+    if suffix == "parquet":
+        data.write_parquet(path)
+    elif suffix == "arrow":
+        data.write_ipc(path)
+    else:
+        data.write_csv(path)
+
+    expected = make_pipeline().fit_transform(data)
+    pipeline = make_pipeline()
+    # The scaler cannot be fitted lazily, so the scan is collected before it, but
+    # a path input still gives a LazyFrame
+    assert_frame_equal(pipeline.fit_transform(path).collect(), expected)
+    assert_frame_equal(pipeline.transform(str(path)).collect(), expected)
+
+
+def test_glob_source_pushdown(data, tmp_path):
+    for i, part in enumerate(data.iter_slices(50)):
+        part.write_parquet(tmp_path / f"part-{i}.parquet")
+    source = str(tmp_path / "*.parquet")
+
+    pipeline = make_pipeline()
+    pipeline.fit(data)
+    out = pipeline.transform(source)
+    assert_frame_equal(out.collect(), pipeline.transform(data))
+
+    plan = out.explain()
+    assert "PROJECT 3/4 COLUMNS" in plan
+    assert 'SELECTION: col("x0") > 0.0' in plan
+
+
+def test_filter_constraints(data):
+    out = Pipeline().filter(group="a").select("group").transform(data)
+    assert out["group"].unique().to_list() == ["a"]
+
+
+def test_sink(data, tmp_path):
+    pipeline = make_pipeline()
+    pipeline.fit(data)
+    expected = pipeline.transform(data)
+
+    pipeline.sink(data, tmp_path / "out.parquet")
+    assert_frame_equal(pl.read_parquet(tmp_path / "out.parquet"), expected)
+
+    pipeline.sink(data.lazy(), tmp_path / "partitioned", partition_by="group")
+    assert sorted(p.name for p in (tmp_path / "partitioned").iterdir()) == [
+        "group=a",
+        "group=b",
+        "group=c",
+    ]
+    assert_frame_equal(
+        pl.read_parquet(tmp_path / "partitioned").select(expected.columns),
+        expected,
+        check_row_order=False,
+    )
+
+    # A partitioned output directory can be read back as a source
+    out = Pipeline().filter(group="b").transform(tmp_path / "partitioned")
+    assert out.collect().height == expected.filter(group="b").height
+
+    pipeline.sink(data, tmp_path / "out.bin", output_format="ipc")
+    assert_frame_equal(pl.read_ipc(tmp_path / "out.bin"), expected)
+
+    with pytest.raises(ValueError):
+        pipeline.sink(data, tmp_path / "out.txt")
@@ -0,0 +1,76 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+from polars_pipeline import Pipeline
+from polars_pipeline.model import LightGBM, Stacker
+from polars_pipeline.telemetry import TELEMETRY_DIR, load_telemetry
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+
+def rmse(y_true: pl.DataFrame, y_pred: pl.DataFrame) -> dict:
+    return {"rmse": mean_squared_error(y_true, y_pred) ** 0.5}
+
+
+def test_telemetry_across_runs():
+    rng = np.random.default_rng(0)
+    X = pl.DataFrame(
+        {
+            "a": rng.normal(size=200),
+            "b": rng.normal(size=200),
+            "target": rng.normal(size=200),
+        }
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = (
+            Pipeline(log_dir=tmpdir, log_mode="fit")
+            .pre.standard_scale("a")
+            .model.predict(
+                Stacker(
+                    LightGBM({"objective": "regression", "verbosity": -1}),
+                    fold=KFold(n_splits=3),
+                    metrics_fn=rmse,
+                ),
+                target="target",
+            )
+        )
+        pipeline.fit(X)
+        pipeline.transform(X, log=True)
+        # Calls that do not log record no telemetry either
+        pipeline.transform(X)
+
+        telemetry = load_telemetry(tmpdir).collect()
+
+    assert telemetry.height == 4
+    assert telemetry["run_id"].n_unique() == 2
+    assert sorted(telemetry["phase"].unique()) == ["fit_transform", "transform"]
+    assert telemetry["stage_name"].to_list().count("Predictor") == 2
+    assert telemetry["rows_in"].to_list() == [200] * 4
+    assert (telemetry["duration_s"] >= 0).all()
+
+    fit_predictor = telemetry.filter(
+        pl.col("phase") == "fit_transform", pl.col("stage_name") == "Predictor"
+    )
+    metrics = fit_predictor["metrics"].item().to_list()
+    assert [m["name"] for m in metrics] == ["rmse"]
+
+
+def test_telemetry_without_logging():
+    X = pl.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = Pipeline(log_dir=tmpdir, log_mode="off").pipe(
+            Pipeline().pre.standard_scale("a")
+        )
+        pipeline.fit_transform(X)
+        pipeline.transform(X)
+        Pipeline(log_dir=tmpdir, telemetry=False).select("a").transform(X)
+        assert not (Path(tmpdir) / TELEMETRY_DIR).exists()
+
+        pipeline.transform(X, log=True)
+        telemetry = load_telemetry(tmpdir).collect()
+
+    # Only the outermost pipeline records its stages
+    assert telemetry["phase"].to_list() == ["transform"]
+    assert telemetry["stage_name"].to_list() == ["Pipeline"]
@@ -0,0 +1,79 @@
+import threading
+
+import numpy as np
+import polars as pl
+import pytest
+import polars.selectors as cs
+from polars.testing import assert_frame_equal
+from polars_pipeline.utils import (
+    categorical_columns,
+    fingerprint,
+    numerical_columns,
+    select_columns,
+    take_rows,
+)
+
+
+def failing_frame() -> pl.LazyFrame:
+    def fail(s: pl.Series) -> pl.Series:
+        raise AssertionError("data was read while resolving columns")
+
+    return pl.LazyFrame(
+        {
+            "a": [1.0, 2.0],
+            "b": pl.Series(["x", "y"], dtype=pl.Categorical),
+            "c": [True, False],
+            "d": [1, 2],
+            "e": ["foo", "bar"],
+        }
+    ).with_columns(pl.col("a").map_batches(fail, return_dtype=pl.Float64))
+
+
+def test_numerical_columns_schema_only():
+    assert numerical_columns(failing_frame()) == ["a"]
+
+
+def test_categorical_columns_schema_only():
+    assert categorical_columns(failing_frame()) == ["b", "c"]
+
+
+def test_select_columns_selectors():
+    frame = failing_frame()
+    assert select_columns(frame, cs.numeric()) == ["a", "d"]
+    assert select_columns(frame, cs.string(), "a") == ["e", "a"]
+    assert select_columns(frame.collect_schema(), cs.by_name("d")) == ["d"]
+
+
+def test_select_columns_cached_result_is_not_shared():
+    frame = failing_frame()
+    columns = select_columns(frame, cs.numeric())
+    columns.append("z")
+    assert select_columns(frame, cs.numeric()) == ["a", "d"]
+
+
+def test_take_rows():
+    frame = pl.DataFrame({"a": np.arange(100), "b": np.arange(100) * 0.5})
+
+    # Consecutive runs are sliced, keeping one chunk per run
+    index = np.concatenate([np.arange(0, 20), np.arange(40, 100)])
+    out = take_rows(frame, index)
+    assert out.n_chunks() == 2
+    assert_frame_equal(out, frame.select(pl.all().gather(index)))
+
+    index = np.random.default_rng(0).permutation(100)
+    assert_frame_equal(take_rows(frame, index), frame.select(pl.all().gather(index)))
+    assert take_rows(frame, np.array([], dtype=np.int64)).shape == (0, 2)
+
+
+def test_fingerprint_values():
+    def scaled(k):
+        return lambda x: x * k
+
+    assert fingerprint(scaled(1)) == fingerprint(scaled(1))
+    assert fingerprint(scaled(1)) != fingerprint(scaled(2))
+    assert fingerprint(np.arange(3)) != fingerprint(np.arange(1, 4))
+    assert fingerprint(pl.col("a") * 2) != fingerprint(pl.col("a") * 3)
+
+    # Objects that cannot be described by value have no fingerprint
+    with pytest.raises(TypeError):
+        fingerprint({"lock": threading.Lock()})
@@ -0,0 +1,156 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+from polars_pipeline import Pipeline, Transformer
+from polars_pipeline.writer import ArtifactWriter, atomic_write, write_scope
+
+
+class Recorder(Transformer):
+    def __init__(self):
+        self.seen = []
+
+    def transform(self, X):
+        self.seen.append(self.log_dir)
+        return X
+
+
+def run(log_mode: str, **kwargs):
+    recorder = Recorder()
+    X = pl.DataFrame({"a": [1, 2, 3]})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = Pipeline(log_dir=tmpdir, log_mode=log_mode, **kwargs).pipe(recorder)
+        pipeline.fit(X)
+        pipeline.transform(X)
+        pipeline.transform(X, log=True)
+        pipeline.fit(X, log=False)
+    return [log_dir is not None for log_dir in recorder.seen]
+
+
+def test_log_modes():
+    assert Pipeline().log_mode == "always"
+    assert run("fit") == [True, False, True, False]
+    assert run("always") == [True, True, True, False]
+    assert run("off") == [False, False, True, False]
+    assert run("sampled", log_sample_rate=0.0) == [True, False, True, False]
+    assert run("sampled", log_sample_rate=1.0) == [True, True, True, False]
+
+    with pytest.raises(ValueError):
+        Pipeline(log_mode="never")
+
+
+def test_nested_pipeline_follows_parent():
+    recorder = Recorder()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = Pipeline(log_dir=tmpdir).pipe(Pipeline().pipe(recorder))
+        pipeline.transform(pl.DataFrame({"a": [1]}))
+    assert recorder.seen[0].parent.name == "0_Pipeline"
+
+
+def test_nested_pipeline_off():
+    recorder = Recorder()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = Pipeline(log_dir=tmpdir, log_mode="always").pipe(
+            Pipeline(log_mode="off").pipe(recorder)
+        )
+        pipeline.transform(pl.DataFrame({"a": [1]}))
+        pipeline.transform(pl.DataFrame({"a": [1]}), log=False)
+    assert recorder.seen == [None, None]
+
+
+def test_writer_flush():
+    writer = ArtifactWriter()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "a" / "b.json"
+        writer.write_json(path, {"x": [1, 2]})
+        writer.flush()
+        assert path.read_text().startswith("{")
+
+        def fail():
+            raise OSError("disk full")
+
+        writer.submit(fail)
+        with pytest.raises(OSError):
+            writer.flush()
+        writer.flush()
+
+
+def test_pipeline_flushes_figures():
+    import matplotlib.pyplot as plt
+    from polars_pipeline.plot.utils import log_figure
+
+    class LinePlot(Transformer):
+        def transform(self, X):
+            if log_dir := self.log_dir:
+                for col in X.columns:
+                    fig, ax = plt.subplots()
+                    ax.plot(X[col].to_numpy())
+                    log_figure(fig, f"Line of {col}", log_dir)
+            return X
+
+    X = pl.DataFrame({"a": np.random.randn(100), "b": np.random.randn(100)})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline = Pipeline(log_dir=tmpdir).pipe(LinePlot())
+        pipeline.transform(X, log=True)
+        files = sorted(p.name for p in Path(tmpdir).rglob("*.png"))
+        assert plt.get_fignums() == []
+    assert files == ["Line_of_a.png", "Line_of_b.png"]
+
+
+def test_atomic_write_leaves_no_partial_file(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "a.json"
+        atomic_write(path, b"old")
+
+        def interrupted(src, dst):
+            raise OSError("interrupted")
+
+        monkeypatch.setattr("polars_pipeline.writer.os.replace", interrupted)
+        with pytest.raises(OSError):
+            atomic_write(path, b"new")
+        assert [p.name for p in Path(tmpdir).iterdir()] == ["a.json"]
+        assert path.read_bytes() == b"old"
+
+
+def test_writer_backpressure():
+    writer = ArtifactWriter(n_workers=1, max_pending=2)
+    release = threading.Event()
+    writer.submit(release.wait)
+    writer.submit(release.wait)
+
+    submitted = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (writer.submit(lambda: None), submitted.set())
+    )
+    thread.start()
+    time.sleep(0.05)
+    assert not submitted.is_set()
+
+    release.set()
+    thread.join()
+    writer.flush()
+    assert submitted.is_set()
+
+
+def test_writer_scopes():
+    writer = ArtifactWriter()
+    release = threading.Event()
+
+    def fail():
+        raise OSError("disk full")
+
+    with write_scope():
+        writer.submit(fail)
+        writer.submit(release.wait)
+        with write_scope():
+            # Neither waits for nor raises the writes of the other scope
+            writer.submit(lambda: None)
+            writer.flush()
+        release.set()
+        with pytest.raises(OSError):
+            writer.flush()
+        writer.flush()